@@ -1,14 +1,18 @@
 """Provide an authentication layer for Home Assistant."""
 import asyncio
 from collections import OrderedDict
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import jwt
 
 from homeassistant import data_entry_flow
-from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
+from homeassistant.auth.const import (
+    ACCESS_TOKEN_CACHE_SIZE,
+    ACCESS_TOKEN_CACHE_TTL,
+    ACCESS_TOKEN_EXPIRATION,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.util import dt as dt_util
 
@@ -146,6 +150,9 @@ class AuthManager:
         self._providers = providers
         self._mfa_modules = mfa_modules
         self.login_flow = AuthManagerFlowManager(hass, self)
+        # Access tokens that passed validation, mapped to their refresh token
+        # and the time until which the result may be reused.
+        self._access_token_cache: Dict[str, Tuple[models.RefreshToken, datetime]] = {}
 
     @property
     def auth_providers(self) -> List[AuthProvider]:
@@ -277,6 +284,9 @@ class AuthManager:
             await asyncio.wait(tasks)
 
         await self._store.async_remove_user(user)
+        self._async_invalidate_access_tokens(
+            lambda refresh_token: refresh_token.user.id == user.id
+        )
 
         self.hass.bus.async_fire(EVENT_USER_REMOVED, {"user_id": user.id})
 
@@ -429,6 +439,9 @@ class AuthManager:
     ) -> None:
         """Delete a refresh token."""
         await self._store.async_remove_refresh_token(refresh_token)
+        self._async_invalidate_access_tokens(
+            lambda cached_token: cached_token.id == refresh_token.id
+        )
 
     @callback
     def async_create_access_token(
@@ -452,6 +465,17 @@ class AuthManager:
         self, token: str
     ) -> Optional[models.RefreshToken]:
         """Return refresh token if an access token is valid."""
+        now = dt_util.utcnow()
+        cached = self._access_token_cache.get(token)
+
+        if cached is not None:
+            refresh_token, valid_until = cached
+            if now < valid_until:
+                if not refresh_token.user.is_active:
+                    return None
+                return refresh_token
+            self._access_token_cache.pop(token)
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
@@ -469,15 +493,35 @@ class AuthManager:
             issuer = refresh_token.id
 
         try:
-            jwt.decode(token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"])
+            claims = jwt.decode(
+                token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"]
+            )
         except jwt.InvalidTokenError:
             return None
 
         if refresh_token is None or not refresh_token.user.is_active:
             return None
 
+        valid_until = now + ACCESS_TOKEN_CACHE_TTL
+        if "exp" in claims:
+            valid_until = min(valid_until, dt_util.utc_from_timestamp(claims["exp"]))
+
+        if len(self._access_token_cache) >= ACCESS_TOKEN_CACHE_SIZE:
+            # Evict the oldest entry, dicts keep insertion order
+            del self._access_token_cache[next(iter(self._access_token_cache))]
+        self._access_token_cache[token] = (refresh_token, valid_until)
+
         return refresh_token
 
+    @callback
+    def _async_invalidate_access_tokens(
+        self, matcher: Callable[[models.RefreshToken], bool]
+    ) -> None:
+        """Forget validated access tokens of matching refresh tokens."""
+        for token, (refresh_token, _) in list(self._access_token_cache.items()):
+            if matcher(refresh_token):
+                del self._access_token_cache[token]
+
     @callback
     def _async_get_auth_provider(
         self, credentials: models.Credentials
@@ -2,12 +2,14 @@
 import asyncio
 from collections import OrderedDict
 from datetime import timedelta
+import hashlib
 import hmac
 from logging import getLogger
 from typing import Any, Dict, List, Optional
 
 from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.util import dt as dt_util
 
 from . import models
@@ -37,6 +39,9 @@ class AuthStore:
         self._users: Optional[Dict[str, models.User]] = None
         self._groups: Optional[Dict[str, models.Group]] = None
         self._perm_lookup: Optional[PermissionLookup] = None
+        # Indexes of all refresh tokens by id and by token hash
+        self._refresh_tokens: Dict[str, models.RefreshToken] = {}
+        self._refresh_tokens_by_hash: Dict[str, models.RefreshToken] = {}
         self._store = hass.helpers.storage.Store(
             STORAGE_VERSION, STORAGE_KEY, private=True
         )
@@ -141,6 +146,8 @@ class AuthStore:
             assert self._users is not None
 
         self._users.pop(user.id)
+        for refresh_token in user.refresh_tokens.values():
+            self._async_unindex_refresh_token(refresh_token)
         self._async_schedule_save()
 
     async def async_update_user(
@@ -223,6 +230,7 @@ class AuthStore:
 
         refresh_token = models.RefreshToken(**kwargs)
         user.refresh_tokens[refresh_token.id] = refresh_token
+        self._async_index_refresh_token(refresh_token)
 
         self._async_schedule_save()
         return refresh_token
@@ -235,10 +243,13 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            if user.refresh_tokens.pop(refresh_token.id, None):
-                self._async_schedule_save()
-                break
+        stored_token = self._refresh_tokens.get(refresh_token.id)
+        if stored_token is None:
+            return
+
+        stored_token.user.refresh_tokens.pop(stored_token.id, None)
+        self._async_unindex_refresh_token(stored_token)
+        self._async_schedule_save()
 
     async def async_get_refresh_token(
         self, token_id: str
@@ -248,12 +259,7 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            refresh_token = user.refresh_tokens.get(token_id)
-            if refresh_token is not None:
-                return refresh_token
-
-        return None
+        return self._refresh_tokens.get(token_id)
 
     async def async_get_refresh_token_by_token(
         self, token: str
@@ -263,14 +269,14 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        found = None
+        refresh_token = self._refresh_tokens_by_hash.get(_token_hash(token))
 
-        for user in self._users.values():
-            for refresh_token in user.refresh_tokens.values():
-                if hmac.compare_digest(refresh_token.token, token):
-                    found = refresh_token
+        # The hash only narrows the lookup down, the token itself is still
+        # compared in constant time.
+        if refresh_token is None or not hmac.compare_digest(refresh_token.token, token):
+            return None
 
-        return found
+        return refresh_token
 
     @callback
     def async_log_refresh_token_usage(
@@ -281,6 +287,23 @@ class AuthStore:
         refresh_token.last_used_ip = remote_ip
         self._async_schedule_save()
 
+    @callback
+    def _async_index_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Add a refresh token to the lookup indexes."""
+        self._refresh_tokens[refresh_token.id] = refresh_token
+        # Like the scan over all users did, the first token loaded wins
+        self._refresh_tokens_by_hash.setdefault(
+            _token_hash(refresh_token.token), refresh_token
+        )
+
+    @callback
+    def _async_unindex_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Remove a refresh token from the lookup indexes."""
+        self._refresh_tokens.pop(refresh_token.id, None)
+        token_hash = _token_hash(refresh_token.token)
+        if self._refresh_tokens_by_hash.get(token_hash) is refresh_token:
+            del self._refresh_tokens_by_hash[token_hash]
+
     async def _async_load(self) -> None:
         """Load the users."""
         async with self._lock:
@@ -301,7 +324,10 @@ class AuthStore:
         if self._users is not None:
             return
 
-        self._perm_lookup = perm_lookup = PermissionLookup(ent_reg, dev_reg)
+        self._perm_lookup = perm_lookup = PermissionLookup(
+            ent_reg, dev_reg, self.hass.states
+        )
+        self._async_track_registry_changes(perm_lookup)
 
         if data is None:
             self._set_defaults()
@@ -471,10 +497,51 @@ class AuthStore:
                 last_used_ip=rt_dict.get("last_used_ip"),
             )
             users[rt_dict["user_id"]].refresh_tokens[token.id] = token
+            self._async_index_refresh_token(token)
 
         self._groups = groups
         self._users = users
 
+    @callback
+    def _async_track_registry_changes(self, perm_lookup: PermissionLookup) -> None:
+        """Invalidate cached entity permissions when entities change.
+
+        That is when the registries change and when entities are added to or
+        removed from the state machine.
+        """
+        entity_registry = self.hass.helpers.entity_registry
+
+        @callback
+        def entity_registry_updated(event: Event) -> None:
+            """Handle an entity registry change."""
+            perm_lookup.mark_entity_changed(event.data["entity_id"])
+
+            if "old_entity_id" in event.data:
+                perm_lookup.mark_entity_changed(event.data["old_entity_id"])
+
+        @callback
+        def device_registry_updated(event: Event) -> None:
+            """Handle a device registry change."""
+            for entry in entity_registry.async_entries_for_device(
+                perm_lookup.entity_registry, event.data["device_id"]
+            ):
+                perm_lookup.mark_entity_changed(entry.entity_id)
+
+        @callback
+        def state_changed(event: Event) -> None:
+            """Handle an entity being added or removed."""
+            if event.data["old_state"] is None or event.data["new_state"] is None:
+                perm_lookup.mark_entity_changed(event.data["entity_id"])
+
+        self.hass.bus.async_listen(
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED, entity_registry_updated
+        )
+        self.hass.bus.async_listen(
+            self.hass.helpers.device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+            device_registry_updated,
+        )
+        self.hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+
     @callback
     def _async_schedule_save(self) -> None:
         """Save users."""
@@ -568,6 +635,11 @@ class AuthStore:
         self._groups = groups
 
 
+def _token_hash(token: str) -> str:
+    """Return the hash used to index a refresh token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def _system_admin_group() -> models.Group:
     """Create system admin group."""
     return models.Group(
@@ -3,6 +3,8 @@ from datetime import timedelta
 
 ACCESS_TOKEN_EXPIRATION = timedelta(minutes=30)
 MFA_SESSION_EXPIRATION = timedelta(minutes=5)
+ACCESS_TOKEN_CACHE_SIZE = 1024
+ACCESS_TOKEN_CACHE_TTL = timedelta(minutes=1)
 
 GROUP_ID_ADMIN = "system-admin"
 GROUP_ID_USER = "system-users"
@@ -1,6 +1,6 @@
 """Permissions for Home Assistant."""
 import logging
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
 import voluptuous as vol
 
@@ -38,6 +38,14 @@ class AbstractPermissions:
 
         return entity_func(entity_id, key)
 
+    def allowed_entity_ids(self, key: str) -> Set[str]:
+        """Return the ids of the current entities we have a certain access to.
+
+        Only for permissions that do not access all entities. The set is
+        kept up to date and must not be modified.
+        """
+        raise NotImplementedError
+
 
 class PolicyPermissions(AbstractPermissions):
     """Handle permissions."""
@@ -46,6 +54,8 @@ class PolicyPermissions(AbstractPermissions):
         """Initialize the permission class."""
         self._policy = policy
         self._perm_lookup = perm_lookup
+        # Key -> (lookup revision, allowed entity ids)
+        self._allowed_entity_ids: Dict[str, Tuple[int, Set[str]]] = {}
 
     def access_all_entities(self, key: str) -> bool:
         """Check if we have a certain access to all entities."""
@@ -55,6 +65,38 @@ class PolicyPermissions(AbstractPermissions):
         """Return a function that can test entity access."""
         return compile_entities(self._policy.get(CAT_ENTITIES), self._perm_lookup)
 
+    def allowed_entity_ids(self, key: str) -> Set[str]:
+        """Return the ids of the current entities we have a certain access to.
+
+        The set is built once from the state machine, then only the entities
+        that changed since are checked again. Removed entities are kept if
+        they were allowed, so the event of their removal passes.
+        """
+        perm_lookup = self._perm_lookup
+        cached = self._allowed_entity_ids.get(key)
+
+        if cached is None:
+            assert perm_lookup.state_machine is not None
+            allowed = {
+                entity_id
+                for entity_id in perm_lookup.state_machine.async_entity_ids()
+                if self.check_entity(entity_id, key)
+            }
+        else:
+            revision, allowed = cached
+
+            if revision == perm_lookup.revision:
+                return allowed
+
+            for entity_id in perm_lookup.changed_since(revision):
+                if self.check_entity(entity_id, key):
+                    allowed.add(entity_id)
+                else:
+                    allowed.discard(entity_id)
+
+        self._allowed_entity_ids[key] = (perm_lookup.revision, allowed)
+        return allowed
+
     def __eq__(self, other: Any) -> bool:
         """Equals check."""
         return isinstance(other, PolicyPermissions) and other._policy == self._policy
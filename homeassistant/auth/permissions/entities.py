@@ -1,6 +1,6 @@
 """Entity permissions."""
 from collections import OrderedDict
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 import voluptuous as vol
 
@@ -25,6 +25,9 @@ ENTITY_AREAS = "area_ids"
 ENTITY_DEVICE_IDS = "device_ids"
 ENTITY_ENTITY_IDS = "entity_ids"
 
+# Maximum number of results cached per permission key
+MAX_CACHED_ENTITIES = 10000
+
 ENTITY_VALUES_SCHEMA = vol.Any(True, vol.Schema({str: SINGLE_ENTITY_SCHEMA}))
 
 ENTITY_POLICY_SCHEMA = vol.Any(
@@ -95,4 +98,52 @@ def compile_entities(
     subcategories[ENTITY_DOMAINS] = _lookup_domain
     subcategories[SUBCAT_ALL] = lookup_all
 
-    return compile_policy(policy, subcategories, perm_lookup)
+    func = compile_policy(policy, subcategories, perm_lookup)
+
+    if not isinstance(policy, dict):
+        return func
+
+    uses_registries = any(
+        isinstance(policy.get(subcategory), dict)
+        for subcategory in (ENTITY_DEVICE_IDS, ENTITY_AREAS)
+    )
+
+    return _cache_entity_func(func, perm_lookup if uses_registries else None)
+
+
+def _cache_entity_func(
+    func: Callable[[str, str], bool], perm_lookup: Optional[PermissionLookup]
+) -> Callable[[str, str], bool]:
+    """Cache the results of a compiled entity policy.
+
+    Pass a permission lookup if the policy looks at the registries. Cached
+    results are then recomputed once the registry entries of the entity change.
+    """
+    # Key -> entity_id -> (allowed, registry revision)
+    results: Dict[str, Dict[str, Tuple[bool, int]]] = {}
+
+    def apply_cached_policy(entity_id: str, key: str) -> bool:
+        """Apply the policy, reusing earlier results."""
+        key_results = results.get(key)
+
+        if key_results is None:
+            key_results = results[key] = {}
+
+        cached = key_results.get(entity_id)
+
+        if cached is not None and (
+            perm_lookup is None or perm_lookup.is_current(entity_id, cached[1])
+        ):
+            return cached[0]
+
+        if len(key_results) >= MAX_CACHED_ENTITIES:
+            key_results.clear()
+
+        allowed = func(entity_id, key)
+        key_results[entity_id] = (
+            allowed,
+            0 if perm_lookup is None else perm_lookup.revision,
+        )
+        return allowed
+
+    return apply_cached_policy
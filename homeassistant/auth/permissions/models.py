@@ -1,5 +1,6 @@
 """Models for permissions."""
-from typing import TYPE_CHECKING
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional
 
 import attr
 
@@ -7,6 +8,7 @@ if TYPE_CHECKING:
     # pylint: disable=unused-import
     from homeassistant.helpers import entity_registry as ent_reg  # noqa: F401
     from homeassistant.helpers import device_registry as dev_reg  # noqa: F401
+    from homeassistant.core import StateMachine  # noqa: F401
 
 
 @attr.s(slots=True)
@@ -15,3 +17,35 @@ class PermissionLookup:
 
     entity_registry = attr.ib(type="ent_reg.EntityRegistry")
     device_registry = attr.ib(type="dev_reg.DeviceRegistry")
+    # Source of the current entity ids
+    state_machine = attr.ib(type=Optional["StateMachine"], default=None)
+    # Increased on every registry change that can affect entity permissions,
+    # and when an entity is added or removed
+    revision = attr.ib(type=int, default=0)
+    # Entity id -> revision of the last change affecting the entity,
+    # ordered from the oldest to the latest change
+    entity_revisions = attr.ib(type="OrderedDict[str, int]", factory=OrderedDict)
+
+    def mark_entity_changed(self, entity_id: str) -> None:
+        """Mark an entity or its registry entries as changed."""
+        self.revision += 1
+        self.entity_revisions[entity_id] = self.revision
+        self.entity_revisions.move_to_end(entity_id)
+
+    def is_current(self, entity_id: str, revision: int) -> bool:
+        """Return if a lookup done at revision is still valid for an entity."""
+        return self.entity_revisions.get(entity_id, 0) <= revision
+
+    def changed_since(self, revision: int) -> List[str]:
+        """Return the entity ids that changed after revision.
+
+        Only the changes after revision are visited, latest first.
+        """
+        changed = []
+
+        for entity_id in reversed(self.entity_revisions):
+            if self.entity_revisions[entity_id] <= revision:
+                break
+            changed.append(entity_id)
+
+        return changed
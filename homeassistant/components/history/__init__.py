@@ -1,16 +1,21 @@
 """Provide pre-made queries on top of the recorder component."""
 from collections import defaultdict
 from datetime import timedelta
-from itertools import groupby
+from itertools import chain, groupby
 import logging
 import time
 
 from sqlalchemy import and_, func
+from sqlalchemy.orm import joinedload
 import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.models import (
+    StateAttributes,
+    States,
+    process_timestamp,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     ATTR_HIDDEN,
@@ -18,10 +23,16 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST,
 )
+from homeassistant.core import callback, split_entity_id
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .cache import HistoryCache
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
@@ -29,11 +40,28 @@ _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
+CONF_CACHE_MAX_STATES = "cache_max_states"
+
+DATA_CACHE = "history_cache"
+
+DEFAULT_CACHE_MAX_STATES = 100000
+
+CACHE_WINDOW = timedelta(days=1)
+
+# Requests for longer periods are streamed to the client
+STREAM_MIN_PERIOD = timedelta(days=1)
+STREAM_BATCH_SIZE = 500
+CACHE_EVICT_INTERVAL = timedelta(minutes=5)
 
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: recorder.FILTER_SCHEMA.extend(
-            {vol.Optional(CONF_ORDER, default=False): cv.boolean}
+            {
+                vol.Optional(CONF_ORDER, default=False): cv.boolean,
+                vol.Optional(
+                    CONF_CACHE_MAX_STATES, default=DEFAULT_CACHE_MAX_STATES
+                ): cv.positive_int,
+            }
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -42,6 +70,21 @@ CONFIG_SCHEMA = vol.Schema(
 SIGNIFICANT_DOMAINS = ("thermostat", "climate", "water_heater")
 IGNORE_DOMAINS = ("zone", "scene")
 
+# Columns read for the states of a minimal response, the attributes are only
+# read for the full states and for scripts
+MINIMAL_COLUMNS = (
+    States.state_id,
+    States.entity_id,
+    States.domain,
+    States.state,
+    States.last_changed,
+    States.attributes_id,
+)
+# Maximum number of full states read with a single query
+MINIMAL_FULL_STATES_BATCH = 500
+# Attributes that can hide a state, the others are not decoded
+MINIMAL_HIDDEN_LIKE = f'%"{ATTR_HIDDEN}"%'
+
 
 def get_significant_states(
     hass,
@@ -50,6 +93,7 @@ def get_significant_states(
     entity_ids=None,
     filters=None,
     include_start_time_state=True,
+    minimal_response=False,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -57,31 +101,31 @@ def get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With minimal_response only the first and last state of each entity are
+    full states, the ones in between are read without their attributes.
     """
     timer_start = time.perf_counter()
 
+    if minimal_response:
+        result = _get_significant_states_minimal(
+            hass, start_time, end_time, entity_ids, filters, include_start_time_state
+        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("get_significant_states took %fs", elapsed)
+        return result
+
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
-            (
-                States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
+        query = (
+            _significant_states_query(
+                session, start_time, end_time, entity_ids, filters
             )
-            & (States.last_updated > start_time)
+            .options(joinedload(States.state_attributes))
+            .order_by(States.last_updated)
         )
 
-        if filters:
-            query = filters.apply(query, entity_ids)
-
-        if end_time is not None:
-            query = query.filter(States.last_updated < end_time)
-
-        query = query.order_by(States.last_updated)
-
-        states = (
-            state
-            for state in execute(query)
-            if (_is_significant(state) and not state.attributes.get(ATTR_HIDDEN, False))
-        )
+        states = _filter_significant(execute(query))
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
@@ -92,13 +136,334 @@ def get_significant_states(
     )
 
 
+def _get_significant_states_minimal(
+    hass, start_time, end_time, entity_ids, filters, include_start_time_state
+):
+    """Return the significant states with only the edges as full states."""
+    start_states = {}
+    if include_start_time_state:
+        for state in get_states(hass, start_time, entity_ids, filters=filters):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    rows = defaultdict(list)
+    full_states = {}
+
+    with session_scope(hass=hass) as session:
+        query = _significant_states_query(
+            session, start_time, end_time, entity_ids, filters, MINIMAL_COLUMNS
+        ).order_by(States.last_updated)
+        script_state_ids = []
+        for row in query:
+            if row.domain == "script":
+                script_state_ids.append(row.state_id)
+            rows[row.entity_id].append(row)
+
+        if script_state_ids:
+            significant = _minimal_significant_scripts(session, script_state_ids)
+            for ent_rows in rows.values():
+                if ent_rows[0].domain == "script":
+                    ent_rows[:] = [
+                        row for row in ent_rows if row.state_id in significant
+                    ]
+
+        hidden = _minimal_hidden_state_ids(
+            session, list(chain.from_iterable(rows.values()))
+        )
+        if hidden:
+            for ent_rows in rows.values():
+                ent_rows[:] = [row for row in ent_rows if row.state_id not in hidden]
+
+        # A first or last state that fails to load is dropped and the state
+        # next to it becomes the full state.
+        while True:
+            full_state_ids = [
+                state_id
+                for state_id in _minimal_edge_state_ids(rows, start_states)
+                if state_id not in full_states
+            ]
+            if not full_state_ids:
+                break
+            for idx in range(0, len(full_state_ids), MINIMAL_FULL_STATES_BATCH):
+                batch = full_state_ids[idx : idx + MINIMAL_FULL_STATES_BATCH]
+                full_states.update(dict.fromkeys(batch))
+                for db_state in (
+                    session.query(States)
+                    .options(joinedload(States.state_attributes))
+                    .filter(States.state_id.in_(batch))
+                ):
+                    full_states[db_state.state_id] = db_state.to_native()
+            for ent_id, ent_rows in rows.items():
+                _drop_unloaded_edges(
+                    ent_rows, full_states, include_first=ent_id not in start_states
+                )
+
+    # Same order of entities as states_to_json
+    result = {}
+    for ent_id in dict.fromkeys(chain(entity_ids or (), start_states, rows)):
+        states = [start_states[ent_id]] if ent_id in start_states else []
+        for row in rows.get(ent_id, ()):
+            state = full_states.get(row.state_id)
+            if state is None:
+                state = {
+                    "state": row.state,
+                    "last_changed": process_timestamp(row.last_changed),
+                }
+            states.append(state)
+        if states:
+            result[ent_id] = states
+
+    return result
+
+
+def _minimal_significant_scripts(session, state_ids):
+    """Return the ids of the script states that _filter_significant keeps."""
+    significant = set()
+    for idx in range(0, len(state_ids), MINIMAL_FULL_STATES_BATCH):
+        batch = state_ids[idx : idx + MINIMAL_FULL_STATES_BATCH]
+        query = (
+            session.query(
+                States.state_id,
+                func.coalesce(States.attributes, StateAttributes.shared_attrs),
+            )
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .filter(States.state_id.in_(batch))
+        )
+        for state_id, shared_attrs in query:
+            try:
+                attributes = json_loads(shared_attrs) if shared_attrs else {}
+            except ValueError:
+                # Same as the states that fail to convert in to_native
+                continue
+            if attributes.get("can_cancel") and not attributes.get(ATTR_HIDDEN):
+                significant.add(state_id)
+    return significant
+
+
+def _minimal_hidden_state_ids(session, rows):
+    """Return the ids of the states that _filter_significant drops as hidden.
+
+    Only the attributes that mention hidden are read and decoded, shared
+    attributes once for all the states that use them.
+    """
+    hidden_attributes_ids = set()
+    attributes_ids = list(
+        {row.attributes_id for row in rows if row.attributes_id is not None}
+    )
+    for idx in range(0, len(attributes_ids), MINIMAL_FULL_STATES_BATCH):
+        batch = attributes_ids[idx : idx + MINIMAL_FULL_STATES_BATCH]
+        query = session.query(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).filter(
+            StateAttributes.attributes_id.in_(batch)
+            & StateAttributes.shared_attrs.like(MINIMAL_HIDDEN_LIKE)
+        )
+        for attributes_id, shared_attrs in query:
+            if _is_hidden(shared_attrs):
+                hidden_attributes_ids.add(attributes_id)
+
+    hidden = {
+        row.state_id for row in rows if row.attributes_id in hidden_attributes_ids
+    }
+
+    # States written before schema version 8 keep their attributes inline
+    state_ids = [row.state_id for row in rows if row.attributes_id is None]
+    for idx in range(0, len(state_ids), MINIMAL_FULL_STATES_BATCH):
+        batch = state_ids[idx : idx + MINIMAL_FULL_STATES_BATCH]
+        query = session.query(States.state_id, States.attributes).filter(
+            States.state_id.in_(batch) & States.attributes.like(MINIMAL_HIDDEN_LIKE)
+        )
+        for state_id, attributes in query:
+            if _is_hidden(attributes):
+                hidden.add(state_id)
+
+    return hidden
+
+
+def _is_hidden(attributes_json):
+    """Return if the attributes JSON of a state hide it."""
+    try:
+        attributes = json_loads(attributes_json)
+    except ValueError:
+        # Same as the states that fail to convert in to_native
+        return False
+    return bool(attributes.get(ATTR_HIDDEN, False))
+
+
+def _minimal_edge_state_ids(rows, start_states):
+    """Yield the ids of the states that are returned as full states."""
+    for ent_id, ent_rows in rows.items():
+        if not ent_rows:
+            continue
+        if ent_id not in start_states:
+            yield ent_rows[0].state_id
+        yield ent_rows[-1].state_id
+
+
+def _drop_unloaded_edges(ent_rows, full_states, include_first):
+    """Drop the first and last rows that failed to load as full states."""
+
+    def _is_dropped(row):
+        return row.state_id in full_states and full_states[row.state_id] is None
+
+    while ent_rows and _is_dropped(ent_rows[-1]):
+        ent_rows.pop()
+    if include_first:
+        while ent_rows and _is_dropped(ent_rows[0]):
+            ent_rows.pop(0)
+
+
+def _minimal_entity_states(states):
+    """Strip the attributes of all but the first and last state."""
+    if len(states) < 3:
+        return states
+    return (
+        states[:1]
+        + [
+            {"state": state.state, "last_changed": state.last_changed}
+            for state in states[1:-1]
+        ]
+        + states[-1:]
+    )
+
+
+def _minimal_states_per_entity(result):
+    """Strip the attributes of the states per entity of a cached result."""
+    return {ent_id: _minimal_entity_states(states) for ent_id, states in result.items()}
+
+
+def stream_significant_states(
+    hass,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+):
+    """Yield the significant states of get_significant_states per entity.
+
+    Each entity gets a generator of its states, rows are fetched from the
+    database in batches while they are consumed. No session is open while
+    the states are consumed. Entities come in the order of their entity id.
+    """
+    start_states = {}
+    if include_start_time_state:
+        for state in get_states(hass, start_time, entity_ids, filters=filters):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    states = _filter_significant(
+        _iter_significant_states(hass, start_time, end_time, entity_ids, filters)
+    )
+
+    # Entities that only have a start time state are merged in by id
+    start_only = sorted(start_states, reverse=True)
+    for entity_id, group in groupby(states, lambda state: state.entity_id):
+        while start_only and start_only[-1] <= entity_id:
+            start_id = start_only.pop()
+            if start_id != entity_id:
+                yield _iter_entity_states(start_states[start_id], ())
+        yield _iter_entity_states(start_states.get(entity_id), group)
+
+    for start_id in reversed(start_only):
+        yield _iter_entity_states(start_states[start_id], ())
+
+
+def _iter_significant_states(hass, start_time, end_time, entity_ids, filters):
+    """Yield the significant states by entity id, reading a batch per session."""
+    last_key = None
+    while True:
+        with session_scope(hass=hass) as session:
+            query = (
+                _significant_states_query(
+                    session, start_time, end_time, entity_ids, filters
+                )
+                .options(joinedload(States.state_attributes))
+                .order_by(States.entity_id, States.last_updated, States.state_id)
+            )
+            if last_key is not None:
+                entity_id, last_updated, state_id = last_key
+                query = query.filter(
+                    (States.entity_id > entity_id)
+                    | (
+                        (States.entity_id == entity_id)
+                        & (
+                            (States.last_updated > last_updated)
+                            | (
+                                (States.last_updated == last_updated)
+                                & (States.state_id > state_id)
+                            )
+                        )
+                    )
+                )
+            rows = query.limit(STREAM_BATCH_SIZE).all()
+            states = [row.to_native() for row in rows]
+            if rows:
+                last_row = rows[-1]
+                last_key = (
+                    last_row.entity_id,
+                    last_row.last_updated,
+                    last_row.state_id,
+                )
+
+        yield from (state for state in states if state is not None)
+
+        if len(rows) < STREAM_BATCH_SIZE:
+            return
+
+
+def _iter_entity_states(start_state, states):
+    """Yield the states of an entity, starting with its start time state."""
+    if start_state is not None:
+        yield start_state
+    yield from states
+
+
+def _significant_states_query(
+    session, start_time, end_time, entity_ids, filters, columns=(States,)
+):
+    """Return the query for the significant states during a period."""
+    query = session.query(*columns).filter(
+        (
+            States.domain.in_(SIGNIFICANT_DOMAINS)
+            | (States.last_changed == States.last_updated)
+        )
+        & (States.last_updated > start_time)
+    )
+
+    if filters:
+        query = filters.apply(query, entity_ids)
+
+    if end_time is not None:
+        query = query.filter(States.last_updated < end_time)
+
+    return query
+
+
+def _filter_significant(states):
+    """Drop the states that are filtered out after the query."""
+    return (
+        state
+        for state in states
+        if _is_significant(state) and not state.attributes.get(ATTR_HIDDEN, False)
+    )
+
+
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
-            (States.last_changed == States.last_updated)
-            & (States.last_updated > start_time)
+        query = (
+            session.query(States)
+            .options(joinedload(States.state_attributes))
+            .filter(
+                (States.last_changed == States.last_updated)
+                & (States.last_updated > start_time)
+            )
         )
 
         if end_time is not None:
@@ -120,8 +485,10 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
-            (States.last_changed == States.last_updated)
+        query = (
+            session.query(States)
+            .options(joinedload(States.state_attributes))
+            .filter(States.last_changed == States.last_updated)
         )
 
         if entity_id is not None:
@@ -149,7 +516,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
             return []
 
     with session_scope(hass=hass) as session:
-        query = session.query(States)
+        query = session.query(States).options(joinedload(States.state_attributes))
 
         if entity_ids and len(entity_ids) == 1:
             # Use an entirely different (and extremely fast) query if we only
@@ -274,7 +641,11 @@ async def async_setup(hass, config):
         filters.included_domains = include.get(CONF_DOMAINS, [])
     use_include_order = conf.get(CONF_ORDER)
 
-    hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    cache = _async_setup_cache(
+        hass, conf.get(CONF_CACHE_MAX_STATES, DEFAULT_CACHE_MAX_STATES)
+    )
+
+    hass.http.register_view(HistoryPeriodView(filters, use_include_order, cache))
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
     )
@@ -282,6 +653,38 @@ async def async_setup(hass, config):
     return True
 
 
+@callback
+def _async_setup_cache(hass, max_states):
+    """Keep the recent history that the recorder writes in memory."""
+    instance = hass.data.get(recorder.DATA_INSTANCE)
+    if instance is None or not max_states or EVENT_STATE_CHANGED in instance.exclude_t:
+        return None
+
+    cache = hass.data[DATA_CACHE] = HistoryCache(
+        CACHE_WINDOW, max_states, _is_significant_change, IGNORE_DOMAINS
+    )
+    cache.async_start(
+        dt_util.utcnow(),
+        (
+            state
+            for state in hass.states.async_all()
+            if instance.entity_filter(state.entity_id)
+        ),
+    )
+
+    @callback
+    def async_state_changed(event):
+        """Add a state change to the cache."""
+        entity_id = event.data["entity_id"]
+        if instance.entity_filter(entity_id):
+            cache.async_add(entity_id, event.data.get("new_state"), event.time_fired)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, async_state_changed)
+    async_track_time_interval(hass, cache.async_evict_expired, CACHE_EVICT_INTERVAL)
+
+    return cache
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -289,10 +692,11 @@ class HistoryPeriodView(HomeAssistantView):
     name = "api:history:view-period"
     extra_urls = ["/api/history/period/{datetime}"]
 
-    def __init__(self, filters, use_include_order):
+    def __init__(self, filters, use_include_order, cache=None):
         """Initialize the history period view."""
         self.filters = filters
         self.use_include_order = use_include_order
+        self.cache = cache
 
     async def get(self, request, datetime=None):
         """Return history over a period of time."""
@@ -327,18 +731,54 @@ class HistoryPeriodView(HomeAssistantView):
         if entity_ids:
             entity_ids = entity_ids.lower().split(",")
         include_start_time_state = "skip_initial_state" not in request.query
+        minimal_response = "minimal_response" in request.query
 
         hass = request.app["hass"]
 
-        result = await hass.async_add_job(
-            get_significant_states,
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            self.filters,
-            include_start_time_state,
-        )
+        result = None
+        if self.cache is not None:
+            result = await self.cache.async_significant_states(
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters.entity_included,
+                include_start_time_state,
+            )
+            _LOGGER.debug("History cache hit rate %.2f", self.cache.hit_rate)
+            if result is not None and minimal_response:
+                result = await hass.async_add_executor_job(
+                    _minimal_states_per_entity, result
+                )
+
+        if (
+            result is None
+            and not self.use_include_order
+            and not minimal_response
+            and end_time - start_time > STREAM_MIN_PERIOD
+        ):
+            return await self.json_stream(
+                request,
+                stream_significant_states(
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    self.filters,
+                    include_start_time_state,
+                ),
+            )
+
+        if result is None:
+            result = await hass.async_add_job(
+                get_significant_states,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                minimal_response,
+            )
         result = list(result.values())
         if _LOGGER.isEnabledFor(logging.DEBUG):
             elapsed = time.perf_counter() - timer_start
@@ -423,6 +863,35 @@ class Filters:
             query = query.filter(~States.entity_id.in_(self.excluded_entities))
         return query
 
+    def entity_included(self, entity_id):
+        """Return if an entity passes the filters, the same way apply does."""
+        domain = split_entity_id(entity_id)[0]
+        if domain in IGNORE_DOMAINS or entity_id in self.excluded_entities:
+            return False
+
+        if self.excluded_domains and not self.included_domains:
+            return domain not in self.excluded_domains and (
+                not self.included_entities or entity_id in self.included_entities
+            )
+        if self.included_domains and not self.excluded_domains:
+            return (
+                domain in self.included_domains or entity_id in self.included_entities
+            )
+        if self.excluded_domains and self.included_domains:
+            return domain not in self.excluded_domains and (
+                domain in self.included_domains or entity_id in self.included_entities
+            )
+        if self.included_entities:
+            return entity_id in self.included_entities
+        return True
+
+
+def _is_significant_change(state):
+    """Test if a recorded state shows up in get_significant_states."""
+    return (
+        state.domain in SIGNIFICANT_DOMAINS or state.last_changed == state.last_updated
+    ) and _is_significant(state)
+
 
 def _is_significant(state):
     """Test if state is significant for history charts.
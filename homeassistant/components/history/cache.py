@@ -0,0 +1,259 @@
+"""In memory cache of recent state history."""
+from array import array
+import asyncio
+from bisect import bisect_left, bisect_right
+import heapq
+from itertools import chain, islice
+import logging
+
+from homeassistant.const import ATTR_HIDDEN
+from homeassistant.core import State, callback
+
+# mypy: allow-untyped-defs, no-check-untyped-defs
+
+_LOGGER = logging.getLogger(__name__)
+
+# Share of the cache that is dropped at once when it runs full
+EVICT_FRACTION = 0.1
+
+# Number of states a lookup scans before it lets the event loop run
+LOOKUP_BATCH_SIZE = 5000
+
+
+class _EntityHistory:
+    """Column oriented history of a single entity, ordered by last_updated."""
+
+    __slots__ = ("times", "significant", "states")
+
+    def __init__(self):
+        """Initialize an empty history."""
+        self.times = array("d")
+        self.significant = bytearray()
+        self.states = []
+
+    def add(self, timestamp, significant, state):
+        """Insert a state, keeping the columns ordered by time."""
+        if not self.times or timestamp >= self.times[-1]:
+            self.times.append(timestamp)
+            self.significant.append(significant)
+            self.states.append(state)
+            return
+
+        idx = bisect_right(self.times, timestamp)
+        self.times.insert(idx, timestamp)
+        self.significant.insert(idx, significant)
+        self.states.insert(idx, state)
+
+    def trim(self, cutoff):
+        """Drop states older than cutoff and return how many were dropped.
+
+        The newest state before the cutoff is kept, it is the state of the
+        entity at the cutoff.
+        """
+        idx = bisect_left(self.times, cutoff) - 1
+        if idx <= 0:
+            return 0
+        del self.times[:idx]
+        del self.significant[:idx]
+        del self.states[:idx]
+        return idx
+
+
+class HistoryCache:
+    """Bounded cache of the states recorded over the last window.
+
+    Requests are only answered from memory when they start after the point
+    from which the cache is complete, everything else is a miss and should
+    be served from the database.
+
+    Entities that are down to a single state, the state they are in since
+    before the window, are cold. They only keep that state, which the state
+    machine holds anyway, and do not count against max_states.
+    """
+
+    def __init__(self, window, max_states, is_significant, ignore_domains=()):
+        """Initialize the cache."""
+        self.window = window
+        self.max_states = max_states
+        self._is_significant = is_significant
+        self._ignore_domains = ignore_domains
+        self._entities = {}
+        # Cold entities as (timestamp, significant, state)
+        self._cold = {}
+        self._size = 0
+        self._valid_from = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        """Return the number of cached states, without the cold entities."""
+        return self._size
+
+    @property
+    def hit_rate(self):
+        """Return the share of lookups that were served from memory."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @callback
+    def async_start(self, now, states):
+        """Seed the cache with the current states and start tracking."""
+        self._valid_from = now.timestamp()
+        for state in states:
+            self._cold[state.entity_id] = (state.last_updated.timestamp(), False, state)
+
+    @callback
+    def async_add(self, entity_id, state, time_fired):
+        """Add a state change, state is None when the entity got removed."""
+        if state is None:
+            state = State(entity_id, "", {}, time_fired, time_fired)
+        self._add(entity_id, state, self._is_significant(state))
+
+        if self._size > self.max_states:
+            self._evict()
+
+    def _add(self, entity_id, state, significant):
+        history = self._entities.get(entity_id)
+        if history is None:
+            history = self._entities[entity_id] = _EntityHistory()
+            cold = self._cold.pop(entity_id, None)
+            if cold is not None:
+                history.add(*cold)
+                self._size += 1
+        history.add(
+            state.last_updated.timestamp(),
+            significant and not state.attributes.get(ATTR_HIDDEN, False),
+            state,
+        )
+        self._size += 1
+
+    @callback
+    def async_evict_expired(self, now):
+        """Drop the states that fell out of the window."""
+        self._trim((now - self.window).timestamp())
+
+    def _evict(self):
+        """Make room by moving cold entities out and dropping the oldest states."""
+        for entity_id, history in list(self._entities.items()):
+            if len(history.states) == 1:
+                del self._entities[entity_id]
+                self._cold[entity_id] = (
+                    history.times[0],
+                    history.significant[0],
+                    history.states[0],
+                )
+                self._size -= 1
+
+        excess = self._size - int(self.max_states * (1 - EVICT_FRACTION))
+        if excess <= 0:
+            return
+
+        # Every entity keeps the state it had at the cutoff, a state can only
+        # be dropped when the next state of its entity is before the cutoff.
+        next_times = heapq.nsmallest(
+            excess + 1,
+            chain.from_iterable(
+                islice(history.times, 1, None) for history in self._entities.values()
+            ),
+        )
+        if next_times:
+            self._trim(next_times[-1])
+
+    def _trim(self, cutoff):
+        if self._valid_from is None:
+            return
+        self._valid_from = max(self._valid_from, cutoff)
+        for history in self._entities.values():
+            self._size -= history.trim(cutoff)
+
+    async def async_significant_states(
+        self, start_time, end_time, entity_ids, include_entity, include_start_time_state
+    ):
+        """Return the significant states per entity or None on a miss.
+
+        This mirrors get_significant_states. Explicitly requested entity_ids
+        keep their order, otherwise include_entity decides which of the cached
+        entities are part of the result. The event loop gets to run every
+        LOOKUP_BATCH_SIZE scanned states.
+        """
+        start = start_time.timestamp()
+        if self._valid_from is None or start < self._valid_from:
+            self.misses += 1
+            return None
+
+        end = end_time.timestamp() if end_time is not None else float("inf")
+        result = {}
+
+        if entity_ids is not None:
+            selected = []
+            for entity_id in entity_ids:
+                columns = self._columns(entity_id)
+                if columns is not None:
+                    selected.append((entity_id, columns))
+        else:
+            selected = [
+                (entity_id, self._columns(entity_id))
+                for entity_id in chain(self._entities, self._cold)
+                if include_entity(entity_id)
+            ]
+
+        # Like get_states, which only skips these domains for the start time
+        # states when it looks up more than one entity
+        if entity_ids is not None and len(entity_ids) == 1:
+            ignore_domains = ()
+        else:
+            ignore_domains = self._ignore_domains
+
+        scanned = 0
+        for entity_id, (times, significant, entity_states) in selected:
+            start_idx = bisect_left(times, start)
+            states = []
+
+            if include_start_time_state and start_idx:
+                state = entity_states[start_idx - 1]
+                if (
+                    not state.attributes.get(ATTR_HIDDEN, False)
+                    and state.domain not in ignore_domains
+                ):
+                    states.append(
+                        State(
+                            state.entity_id,
+                            state.state,
+                            state.attributes,
+                            start_time,
+                            start_time,
+                            state.context,
+                        )
+                    )
+
+            first_idx = bisect_right(times, start)
+            end_idx = bisect_left(times, end)
+            for idx in range(first_idx, end_idx):
+                if significant[idx]:
+                    states.append(entity_states[idx])
+
+            if states:
+                result[entity_id] = states
+
+            scanned += end_idx - first_idx + 1
+            if scanned >= LOOKUP_BATCH_SIZE:
+                scanned = 0
+                await asyncio.sleep(0)
+
+        # States before the start could have been evicted in the meantime
+        if start < self._valid_from:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def _columns(self, entity_id):
+        """Return the times, significance flags and states of an entity."""
+        history = self._entities.get(entity_id)
+        if history is not None:
+            return history.times, history.significant, history.states
+        cold = self._cold.get(entity_id)
+        if cold is not None:
+            return tuple((value,) for value in cold)
+        return None
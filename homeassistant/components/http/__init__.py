@@ -26,7 +26,7 @@ from .ban import setup_bans
 from .const import KEY_AUTHENTICATED, KEY_HASS, KEY_HASS_USER, KEY_REAL_IP  # noqa: F401
 from .cors import setup_cors
 from .real_ip import setup_real_ip
-from .static import CACHE_HEADERS, CachingStaticResource
+from .static import CACHE_HEADERS, CachingStaticResource, StaticFileCache
 from .view import HomeAssistantView  # noqa: F401
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -243,6 +243,7 @@ class HomeAssistantHTTP:
         self._handler = None
         self.runner = None
         self.site = None
+        self.static_file_cache = StaticFileCache()
 
     def register_view(self, view):
         """Register a view with the WSGI server.
@@ -285,10 +286,12 @@ class HomeAssistantHTTP:
         """Register a folder or file to serve as a static path."""
         if os.path.isdir(path):
             if cache_headers:
-                resource = CachingStaticResource
+                resource = CachingStaticResource(
+                    url_path, path, file_cache=self.static_file_cache
+                )
             else:
-                resource = web.StaticResource
-            self.app.router.register_resource(resource(url_path, path))
+                resource = web.StaticResource(url_path, path)
+            self.app.router.register_resource(resource)
             return
 
         if cache_headers:
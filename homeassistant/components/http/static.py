@@ -1,19 +1,221 @@
 """Static file handling for HTTP component."""
+import asyncio
+from collections import OrderedDict
+import gzip
+import hashlib
+import mimetypes
+import os
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
+from typing import Dict, Optional
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse
+from aiohttp.web import FileResponse, Response
 from aiohttp.web_exceptions import HTTPForbidden, HTTPNotFound
 from aiohttp.web_urldispatcher import StaticResource
+import attr
 
 # mypy: allow-untyped-defs
 
 CACHE_TIME = 31 * 86400  # = 1 month
 CACHE_HEADERS = {hdrs.CACHE_CONTROL: f"public, max-age={CACHE_TIME}"}
 
+# Memory budget of the static file cache, files larger than the per file
+# limit are always streamed from disk.
+MAX_CACHE_SIZE = 32 * 1024 * 1024
+MAX_CACHED_FILE_SIZE = 2 * 1024 * 1024
+
+# Files smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 256
+
+
+@attr.s(slots=True, frozen=True)
+class CachedFile:
+    """A static file held in memory."""
+
+    mtime_ns = attr.ib(type=int)
+    size = attr.ib(type=int)
+    content_type = attr.ib(type=str)
+    etag = attr.ib(type=str)
+    body = attr.ib(type=bytes)
+    gzip_body = attr.ib(type=Optional[bytes])
+
+    @property
+    def memory_size(self) -> int:
+        """Return the number of bytes the entry keeps in memory."""
+        return len(self.body) + len(self.gzip_body or b"")
+
+
+def _load_file(filepath: Path, stat: os.stat_result) -> CachedFile:
+    """Read a file and prepare it for serving from memory."""
+    body = filepath.read_bytes()
+    content_type = mimetypes.guess_type(str(filepath))[0] or "application/octet-stream"
+
+    gzip_body: Optional[bytes] = None
+    gz_path = filepath.with_name(filepath.name + ".gz")
+
+    if gz_path.is_file() and gz_path.stat().st_mtime_ns >= stat.st_mtime_ns:
+        # The frontend ships precompressed files next to the originals
+        gzip_body = gz_path.read_bytes()
+    elif len(body) >= MIN_COMPRESS_SIZE:
+        gzip_body = gzip.compress(body)
+
+    if gzip_body is not None and len(gzip_body) >= len(body):
+        gzip_body = None
+
+    return CachedFile(
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        content_type=content_type,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        body=body,
+        gzip_body=gzip_body,
+    )
+
+
+class StaticFileCache:
+    """Keep recently served static files in memory.
+
+    Entries are evicted least recently used first once the memory budget is
+    exceeded, and reloaded when the file on disk changes. Requests for a file
+    that is being loaded wait for that load.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHE_SIZE) -> None:
+        """Initialize the static file cache."""
+        self.max_size = max_size
+        self.size = 0
+        self._files: "OrderedDict[Path, CachedFile]" = OrderedDict()
+        self._loading: Dict[Path, "asyncio.Task[CachedFile]"] = {}
+
+    async def async_get(
+        self, filepath: Path, stat: os.stat_result
+    ) -> Optional[CachedFile]:
+        """Return the cached file, or None if it should be served from disk.
+
+        stat is the stat result the caller already took of the file.
+        """
+        cached = self._files.get(filepath)
+
+        if (
+            cached is not None
+            and cached.mtime_ns == stat.st_mtime_ns
+            and cached.size == stat.st_size
+        ):
+            self._files.move_to_end(filepath)
+            return cached
+
+        if cached is not None:
+            self._remove(filepath)
+
+        if stat.st_size > MAX_CACHED_FILE_SIZE:
+            return None
+
+        loading = self._loading.get(filepath)
+        if loading is None:
+            loading = self._loading[filepath] = asyncio.get_running_loop().create_task(
+                self._async_load(filepath, stat)
+            )
+        # A cancelled request does not cancel the load for the others
+        return await asyncio.shield(loading)
+
+    async def _async_load(self, filepath: Path, stat: os.stat_result) -> CachedFile:
+        """Load a file into the cache."""
+        try:
+            cached = await asyncio.get_running_loop().run_in_executor(
+                None, _load_file, filepath, stat
+            )
+        finally:
+            del self._loading[filepath]
+
+        if cached.memory_size > self.max_size:
+            return cached
+
+        if filepath in self._files:
+            self._remove(filepath)
+
+        self._files[filepath] = cached
+        self.size += cached.memory_size
+
+        while self.size > self.max_size:
+            self._remove(next(iter(self._files)))
+
+        return cached
+
+    def _remove(self, filepath: Path) -> None:
+        """Drop a file from the cache."""
+        self.size -= self._files.pop(filepath).memory_size
+
+
+def cached_file_response(request, cached: CachedFile) -> Response:
+    """Return a response for a file served from memory."""
+    headers = {
+        **CACHE_HEADERS,
+        hdrs.ETAG: cached.etag,
+        hdrs.VARY: hdrs.ACCEPT_ENCODING,
+    }
+
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+    if if_none_match is not None and _etag_matches(cached.etag, if_none_match):
+        return Response(status=304, headers=headers)
+
+    body = cached.body
+    if cached.gzip_body is not None and _accepts_gzip(
+        request.headers.get(hdrs.ACCEPT_ENCODING, "")
+    ):
+        body = cached.gzip_body
+        headers[hdrs.CONTENT_ENCODING] = "gzip"
+
+    return Response(body=body, content_type=cached.content_type, headers=headers)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return if an Accept-Encoding header accepts gzip.
+
+    A coding with q=0 is not acceptable, "*" stands for the codings that are
+    not listed.
+    """
+    qvalues: Dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        qvalue = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[name.strip().lower()] = qvalue
+
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Return if an If-None-Match header matches an entity tag."""
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
 
 class CachingStaticResource(StaticResource):
-    """Static Resource handler that will add cache headers."""
+    """Static Resource handler that will add cache headers.
+
+    Files are served from a StaticFileCache if one is passed in.
+    """
+
+    def __init__(self, *args, file_cache: Optional[StaticFileCache] = None, **kwargs):
+        """Initialize the static resource."""
+        super().__init__(*args, **kwargs)
+        self._file_cache = file_cache
 
     async def _handle(self, request):
         rel_url = request.match_info["filename"]
@@ -35,10 +237,24 @@ class CachingStaticResource(StaticResource):
             request.app.logger.exception(error)
             raise HTTPNotFound() from error
 
+        try:
+            stat = filepath.stat()
+        except OSError as error:
+            raise HTTPNotFound() from error
+
         # on opening a dir, load its contents if allowed
-        if filepath.is_dir():
+        if S_ISDIR(stat.st_mode):
             return await super()._handle(request)
-        if filepath.is_file():
+        if S_ISREG(stat.st_mode):
+            # Range requests are answered from disk
+            if self._file_cache is not None and hdrs.RANGE not in request.headers:
+                try:
+                    cached = await self._file_cache.async_get(filepath, stat)
+                except FileNotFoundError as error:
+                    raise HTTPNotFound() from error
+                if cached is not None:
+                    return cached_file_response(request, cached)
+
             return FileResponse(
                 filepath,
                 chunk_size=self._chunk_size,
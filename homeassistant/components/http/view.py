@@ -1,7 +1,7 @@
 """Support for views."""
 import asyncio
-import json
 import logging
+from types import GeneratorType
 from typing import List, Optional
 
 from aiohttp import web
@@ -15,12 +15,14 @@ import voluptuous as vol
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON
 from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 from .const import KEY_AUTHENTICATED, KEY_HASS, KEY_REAL_IP
 
 _LOGGER = logging.getLogger(__name__)
 
+# Size in characters of the chunks a streamed JSON response is written in
+STREAM_CHUNK_SIZE = 64 * 1024
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
@@ -47,8 +49,8 @@ class HomeAssistantView:
     def json(result, status_code=200, headers=None):
         """Return a JSON response."""
         try:
-            msg = json.dumps(
-                result, sort_keys=True, cls=JSONEncoder, allow_nan=False
+            msg = json_dumps(
+                result, sort_keys=True, allow_nan=False, compact=True
             ).encode("UTF-8")
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
@@ -62,6 +64,68 @@ class HomeAssistantView:
         response.enable_compression()
         return response
 
+    @staticmethod
+    async def json_stream(request, items, chunk_size=STREAM_CHUNK_SIZE):
+        """Return a JSON list response that is written while it is encoded.
+
+        Each chunk is encoded in the executor, so the items can be fetched
+        lazily from the database. No executor thread waits while a chunk is
+        sent, the items must not keep a database session open in between.
+        Items that are generators are streamed as nested lists. Only about
+        chunk_size of encoded JSON is held in memory.
+        """
+        hass = request.app[KEY_HASS]
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+        await response.prepare(request)
+
+        fragments = _json_list_fragments(items)
+
+        def close():
+            """Release the items, running their cleanup."""
+            fragments.close()
+            if isinstance(items, GeneratorType):
+                items.close()
+
+        def next_chunk():
+            """Encode the next chunk, empty when the list is complete.
+
+            The items are released in the same job once the list is complete
+            or encoding fails.
+            """
+            try:
+                chunk = "".join(_take_fragments(fragments, chunk_size))
+            except Exception:
+                close()
+                raise
+            if not chunk:
+                close()
+            return chunk.encode("UTF-8")
+
+        try:
+            while True:
+                chunk = await hass.async_add_executor_job(next_chunk)
+                if not chunk:
+                    break
+                try:
+                    await response.write(chunk)
+                except (asyncio.CancelledError, ConnectionError):
+                    await hass.async_add_executor_job(close)
+                    raise
+        except (asyncio.CancelledError, ConnectionError):
+            raise
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error streaming JSON response for %s", request.path)
+            # The status line is sent, closing the connection tells the client
+            # the list is incomplete.
+            if request.transport is not None:
+                request.transport.abort()
+            return response
+
+        await response.write_eof()
+        return response
+
     def json_message(self, message, status_code=200, message_code=None, headers=None):
         """Return a JSON message response."""
         data = {"message": message}
@@ -93,6 +157,29 @@ class HomeAssistantView:
             app["allow_cors"](route)
 
 
+def _take_fragments(fragments, size):
+    """Yield fragments until their total length reaches size."""
+    total = 0
+    for fragment in fragments:
+        yield fragment
+        total += len(fragment)
+        if total >= size:
+            return
+
+
+def _json_list_fragments(items):
+    """Yield the JSON encoding of a list piece by piece."""
+    yield "["
+    for idx, item in enumerate(items):
+        if idx:
+            yield ","
+        if isinstance(item, GeneratorType):
+            yield from _json_list_fragments(item)
+        else:
+            yield json_dumps(item, sort_keys=True, allow_nan=False, compact=True)
+    yield "]"
+
+
 def request_handler_factory(view, handler):
     """Wrap the handler classes."""
     assert asyncio.iscoroutinefunction(handler) or is_callback(
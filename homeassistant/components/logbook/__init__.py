@@ -1,10 +1,9 @@
 """Event parser and human readable log generator."""
+from collections import namedtuple
 from datetime import timedelta
 from itertools import groupby
 import logging
-import time
 
-from sqlalchemy.exc import SQLAlchemyError
 import voluptuous as vol
 
 from homeassistant.components import sun
@@ -15,12 +14,12 @@ from homeassistant.components.homekit.const import (
     EVENT_HOMEKIT_CHANGED,
 )
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import Events, States
-from homeassistant.components.recorder.util import (
-    QUERY_RETRY_WAIT,
-    RETRIES,
-    session_scope,
+from homeassistant.components.recorder.models import (
+    Events,
+    States,
+    process_timestamp,
 )
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     ATTR_DOMAIN,
     ATTR_ENTITY_ID,
@@ -40,11 +39,18 @@ from homeassistant.const import (
     STATE_OFF,
     STATE_ON,
 )
-from homeassistant.core import DOMAIN as HA_DOMAIN, State, callback, split_entity_id
+from homeassistant.core import (
+    DOMAIN as HA_DOMAIN,
+    Context,
+    State,
+    callback,
+    split_entity_id,
+)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -58,6 +64,9 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+# Events are read from the database in batches of this size
+EVENTS_BATCH_SIZE = 500
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -185,6 +194,11 @@ class LogbookView(HomeAssistantView):
         end_day = start_day + timedelta(days=period)
         hass = request.app["hass"]
 
+        if period > 1:
+            return await self.json_stream(
+                request, _iter_events(hass, self.config, start_day, end_day, entity_id)
+            )
+
         def json_events():
             """Fetch events and generate JSON."""
             return self.json(
@@ -220,10 +234,8 @@ def humanify(hass, events):
         # Process events
         for event in events_batch:
             if event.event_type == EVENT_STATE_CHANGED:
-                entity_id = event.data.get("entity_id")
-
-                if entity_id.startswith(domain_prefixes):
-                    last_sensor_event[entity_id] = event
+                if event.entity_id.startswith(domain_prefixes):
+                    last_sensor_event[event.entity_id] = event
 
             elif event.event_type == EVENT_HOMEASSISTANT_STOP:
                 if event.time_fired.minute in start_stop_events:
@@ -250,23 +262,31 @@ def humanify(hass, events):
                 yield data
 
             if event.event_type == EVENT_STATE_CHANGED:
-                to_state = State.from_dict(event.data.get("new_state"))
-
-                domain = to_state.domain
+                domain = event.domain
 
                 # Skip all but the last sensor state
                 if (
                     domain in CONTINUOUS_DOMAINS
-                    and event != last_sensor_event[to_state.entity_id]
+                    and event != last_sensor_event[event.entity_id]
                 ):
                     continue
 
+                to_state = State.from_dict(event.data.get("new_state"))
+
                 # Don't show continuous sensor value changes in the logbook
                 if domain in CONTINUOUS_DOMAINS and to_state.attributes.get(
                     "unit_of_measurement"
                 ):
                     continue
 
+                # Also filter auto groups.
+                if domain == "group" and to_state.attributes.get("auto", False):
+                    continue
+
+                # exclude entities which are customized hidden
+                if to_state.attributes.get(ATTR_HIDDEN, False):
+                    continue
+
                 yield {
                     "when": event.time_fired,
                     "name": to_state.name,
@@ -365,33 +385,8 @@ def humanify(hass, events):
                 }
 
 
-def _get_related_entity_ids(session, entity_filter):
-    timer_start = time.perf_counter()
-
-    query = session.query(States).with_entities(States.entity_id).distinct()
-
-    for tryno in range(0, RETRIES):
-        try:
-            result = [row.entity_id for row in query if entity_filter(row.entity_id)]
-
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                elapsed = time.perf_counter() - timer_start
-                _LOGGER.debug(
-                    "fetching %d distinct domain/entity_id pairs took %fs",
-                    len(result),
-                    elapsed,
-                )
-
-            return result
-        except SQLAlchemyError as err:
-            _LOGGER.error("Error executing query: %s", err)
-
-            if tryno == RETRIES - 1:
-                raise
-            time.sleep(QUERY_RETRY_WAIT)
-
-
-def _generate_filter_from_config(config):
+def _filter_lists_from_config(config):
+    """Return the included/excluded domains and entities of the config."""
     excluded_entities = []
     excluded_domains = []
     included_entities = []
@@ -406,82 +401,165 @@ def _generate_filter_from_config(config):
         included_entities = include.get(CONF_ENTITIES, [])
         included_domains = include.get(CONF_DOMAINS, [])
 
-    return generate_filter(
-        included_domains, included_entities, excluded_domains, excluded_entities
-    )
+    return included_domains, included_entities, excluded_domains, excluded_entities
+
+
+def _generate_filter_from_config(config):
+    return generate_filter(*_filter_lists_from_config(config))
+
+
+def _generate_states_filter_from_config(config):
+    """Return the filter of _generate_filter_from_config as SQL clause.
+
+    Follows the cases of generate_filter, returns None if all entities pass.
+    """
+    (
+        included_domains,
+        included_entities,
+        excluded_domains,
+        excluded_entities,
+    ) = _filter_lists_from_config(config)
+    have_exclude = bool(excluded_entities or excluded_domains)
+    have_include = bool(included_entities or included_domains)
+
+    if not have_include and not have_exclude:
+        return None
+
+    if have_include and not have_exclude:
+        return States.entity_id.in_(included_entities) | States.domain.in_(
+            included_domains
+        )
+
+    if not have_include and have_exclude:
+        return ~States.entity_id.in_(excluded_entities) & ~States.domain.in_(
+            excluded_domains
+        )
+
+    if included_domains:
+        return (
+            States.domain.in_(included_domains)
+            & ~States.entity_id.in_(excluded_entities)
+        ) | (
+            ~States.domain.in_(included_domains)
+            & States.entity_id.in_(included_entities)
+        )
+
+    if excluded_domains:
+        return (
+            States.domain.in_(excluded_domains)
+            & States.entity_id.in_(included_entities)
+        ) | (
+            ~States.domain.in_(excluded_domains)
+            & ~States.entity_id.in_(excluded_entities)
+        )
+
+    return States.entity_id.in_(included_entities)
 
 
 def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
+    return list(_iter_events(hass, config, start_day, end_day, entity_id))
+
+
+def _iter_events(hass, config, start_day, end_day, entity_id=None):
+    """Yield the events for a period of time while reading them."""
     entities_filter = _generate_filter_from_config(config)
 
-    def yield_events(query):
+    def yield_events(rows):
         """Yield Events that are not filtered away."""
-        for row in query.yield_per(500):
-            event = row.to_native()
-            if _keep_event(hass, event, entities_filter):
+        # Entity id -> state of its previous row, None once it got removed
+        last_states = {}
+        for row in rows:
+            event = LazyEventPartialState(row)
+            if _keep_event(hass, event, entities_filter, last_states):
                 yield event
 
-    with session_scope(hass=hass) as session:
-        if entity_id is not None:
-            entity_ids = [entity_id.lower()]
-        else:
-            entity_ids = _get_related_entity_ids(session, entities_filter)
-
-        query = (
-            session.query(Events)
-            .order_by(Events.time_fired)
+    # Only state changes are filtered in SQL, the entity_id of other events
+    # is only known after loading their data.
+    states_filter = States.last_updated == States.last_changed
+    if entity_id is not None:
+        states_filter &= States.entity_id == entity_id.lower()
+    else:
+        entity_ids_filter = _generate_states_filter_from_config(config)
+        if entity_ids_filter is not None:
+            states_filter &= entity_ids_filter
+
+    def events_query(session):
+        """Return the query for the events in time order."""
+        return (
+            session.query(*LAZY_EVENT_COLUMNS)
+            .select_from(Events)
+            .order_by(Events.time_fired, Events.event_id)
             .outerjoin(States, (Events.event_id == States.event_id))
             .filter(
                 Events.event_type.in_(ALL_EVENT_TYPES + list(hass.data.get(DOMAIN, {})))
             )
             .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
-            .filter(
-                (
-                    (States.last_updated == States.last_changed)
-                    & States.entity_id.in_(entity_ids)
-                )
-                | (States.state_id.is_(None))
-            )
+            .filter(states_filter | (States.state_id.is_(None)))
         )
 
-        return list(humanify(hass, yield_events(query)))
+    yield from humanify(hass, yield_events(_iter_event_rows(hass, events_query)))
+
+
+def _iter_event_rows(hass, events_query):
+    """Yield the rows of the events query, reading a batch per session.
+
+    No session is open while the rows are consumed, which takes as long as
+    the client needs to read a streamed response.
+    """
+    last_row = None
+    while True:
+        with session_scope(hass=hass) as session:
+            query = events_query(session)
+            if last_row is not None:
+                query = query.filter(
+                    (Events.time_fired > last_row.time_fired)
+                    | (
+                        (Events.time_fired == last_row.time_fired)
+                        & (Events.event_id > last_row.event_id)
+                    )
+                )
+            rows = query.limit(EVENTS_BATCH_SIZE).all()
+
+        yield from rows
 
+        if len(rows) < EVENTS_BATCH_SIZE:
+            return
+        last_row = rows[-1]
 
-def _keep_event(hass, event, entities_filter):
+
+def _keep_event(hass, event, entities_filter, last_states=None):
     domain, entity_id = None, None
 
     if event.event_type == EVENT_STATE_CHANGED:
-        entity_id = event.data.get("entity_id")
+        entity_id, domain = event.entity_id, event.domain
 
-        if entity_id is None:
+        # Checked before the event data gets decoded
+        if entity_id is None or not entities_filter(entity_id):
             return False
 
+        if last_states is None:
+            last_states = {}
+        old_state, new_state = event.state_change(last_states)
+
         # Do not report on new entities
-        old_state = event.data.get("old_state")
         if old_state is None:
             return False
 
         # Do not report on entity removal
-        new_state = event.data.get("new_state")
         if new_state is None:
             return False
 
         # Do not report on only attribute changes
-        if new_state.get("state") == old_state.get("state"):
+        if new_state == old_state:
             return False
 
-        domain = split_entity_id(entity_id)[0]
-        attributes = new_state.get("attributes", {})
+        # Auto groups and hidden entities are filtered by humanify, their
+        # attributes are only decoded for the events that are shown.
 
-        # Also filter auto groups.
-        if domain == "group" and attributes.get("auto", False):
-            return False
-
-        # exclude entities which are customized hidden
-        hidden = attributes.get(ATTR_HIDDEN, False)
-        if hidden:
-            return False
+    elif event.event_type == EVENT_HOMEASSISTANT_STOP and last_states:
+        # The first states after a restart are new entities
+        last_states.clear()
 
     elif event.event_type == EVENT_LOGBOOK_ENTRY:
         domain = event.data.get(ATTR_DOMAIN)
@@ -507,6 +585,108 @@ def _keep_event(hass, event, entities_filter):
     return not entity_id or entities_filter(entity_id)
 
 
+# Columns the logbook reads from an event and its state row
+LAZY_EVENT_COLUMNS = (
+    Events.event_id,
+    Events.event_type,
+    Events.event_data,
+    Events.time_fired,
+    Events.context_id,
+    Events.context_user_id,
+    States.entity_id,
+    States.domain,
+    States.state,
+)
+
+_LazyEventRow = namedtuple(
+    "_LazyEventRow", [column.key for column in LAZY_EVENT_COLUMNS]
+)
+
+
+class LazyEventPartialState:
+    """An event read from the database that decodes its JSON on demand.
+
+    State changes carry the entity id, domain and state of their state row,
+    so they can be filtered and grouped by entity without decoding the event
+    data. The event data is decoded at most once.
+    """
+
+    __slots__ = ["_row", "_data", "_time_fired", "event_type", "entity_id", "domain"]
+
+    def __init__(self, row, data=None):
+        """Initialize the lazy event."""
+        self._row = row
+        self._data = data
+        self._time_fired = None
+        self.event_type = row.event_type
+        self.entity_id = row.entity_id
+        self.domain = row.domain
+
+    @classmethod
+    def from_event(cls, event):
+        """Create a lazy event for an event that is not read from the database."""
+        entity_id = domain = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            entity_id = event.data.get(ATTR_ENTITY_ID)
+            domain = split_entity_id(entity_id)[0] if entity_id else None
+
+        row = _LazyEventRow(
+            event_id=None,
+            event_type=event.event_type,
+            event_data=None,
+            time_fired=event.time_fired,
+            context_id=event.context.id,
+            context_user_id=event.context.user_id,
+            entity_id=entity_id,
+            domain=domain,
+            state=None,
+        )
+        return cls(row, event.data)
+
+    @property
+    def data(self):
+        """Return the event data."""
+        if self._data is None:
+            self._data = json_loads(self._row.event_data)
+        return self._data
+
+    def state_change(self, last_states):
+        """Return the old and new state string, None for a missing state.
+
+        The rows are read in time order and only state rows whose state
+        changed are selected, so the previous row of the entity in
+        last_states has the old state. The event data is only decoded for
+        the first row of an entity.
+        """
+        entity_id = self.entity_id
+        if self._data is None and entity_id in last_states:
+            old_state = last_states[entity_id]
+            # An empty state is what the recorder writes for a removed entity
+            new_state = self._row.state or None
+        else:
+            old_state = self.data.get("old_state")
+            new_state = self.data.get("new_state")
+            if old_state is not None:
+                old_state = old_state.get("state")
+            if new_state is not None:
+                new_state = new_state.get("state")
+
+        last_states[entity_id] = new_state
+        return old_state, new_state
+
+    @property
+    def time_fired(self):
+        """Return the time the event was fired."""
+        if self._time_fired is None:
+            self._time_fired = process_timestamp(self._row.time_fired)
+        return self._time_fired
+
+    @property
+    def context(self):
+        """Return the context of the event."""
+        return Context(id=self._row.context_id, user_id=self._row.context_user_id)
+
+
 def _entry_message_from_state(domain, state):
     """Convert a state to a message for the logbook."""
     # We pass domain in so we don't have to split entity_id again
@@ -11,7 +11,7 @@ import socket
 import ssl
 import sys
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import attr
 import requests.certs
@@ -765,12 +765,15 @@ class MQTT:
         # should be able to optionally rely on MQTT.
         # pylint: disable=import-outside-toplevel
         import paho.mqtt.client as mqtt
+        from paho.mqtt.matcher import MQTTMatcher
 
         self.hass = hass
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
         self.subscriptions: List[Subscription] = []
+        # Topic trie holding the subscriptions of each subscribed topic
+        self._matcher = MQTTMatcher()
         self.birth_message = birth_message
         self.connected = False
         self._mqttc: mqtt.Client = None
@@ -867,6 +870,11 @@ class MQTT:
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
 
+        try:
+            self._matcher[topic].append(subscription)
+        except KeyError:
+            self._matcher[topic] = [subscription]
+
         await self._async_perform_subscription(topic, qos)
 
         @callback
@@ -876,10 +884,15 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            topic_subscriptions = self._matcher[topic]
+            topic_subscriptions.remove(subscription)
+
+            if topic_subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
+            del self._matcher[topic]
+
             # Only unsubscribe if currently connected.
             if self.connected:
                 self.hass.async_create_task(self._async_unsubscribe(topic))
@@ -955,23 +968,33 @@ class MQTT:
             msg.payload,
         )
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
+        subscriptions = [
+            subscription
+            for topic_subscriptions in self._matcher.iter_match(msg.topic)
+            for subscription in topic_subscriptions
+        ]
+        # Decode the payload once per encoding, not once per subscription
+        decoded: Dict[str, str] = {}
 
+        for subscription in subscriptions:
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload,
-                        msg.topic,
-                        subscription.encoding,
-                        subscription.callback,
-                    )
-                    continue
+                if subscription.encoding in decoded:
+                    payload = decoded[subscription.encoding]
+                else:
+                    try:
+                        payload = decoded[subscription.encoding] = msg.payload.decode(
+                            subscription.encoding
+                        )
+                    except (AttributeError, UnicodeDecodeError):
+                        _LOGGER.warning(
+                            "Can't decode payload %s on %s with encoding %s (for %s)",
+                            msg.payload,
+                            msg.topic,
+                            subscription.encoding,
+                            subscription.callback,
+                        )
+                        continue
 
             self.hass.async_run_job(
                 subscription.callback, Message(msg.topic, payload, msg.qos, msg.retain)
@@ -1018,20 +1041,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
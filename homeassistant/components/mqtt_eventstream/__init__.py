@@ -14,7 +14,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import EventOrigin, State, callback
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 DOMAIN = "mqtt_eventstream"
 CONF_PUBLISH_TOPIC = "publish_topic"
@@ -70,8 +70,13 @@ def async_setup(hass, config):
             ):
                 return
 
-        event_info = {"event_type": event.event_type, "event_data": event.data}
-        msg = json.dumps(event_info, cls=JSONEncoder)
+        try:
+            msg = (
+                f'{{"event_type":{json_dumps(event.event_type, compact=True)},'
+                f'"event_data":{event.data_as_json()}}}'
+            )
+        except ValueError:
+            msg = json_dumps({"event_type": event.event_type, "event_data": event.data})
         mqtt.async_publish(pub_topic, msg)
 
     # Only listen for local events if you are going to publish them.
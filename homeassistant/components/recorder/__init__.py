@@ -1,6 +1,6 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -8,16 +8,16 @@ import queue
 from sqlite3 import Connection
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import create_engine, exc
+from sqlalchemy import create_engine, exc, func
 from sqlalchemy.engine import Engine
 from sqlalchemy.event import listens_for
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     CONF_DOMAINS,
@@ -30,15 +30,16 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import DATA_INSTANCE
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -62,6 +63,11 @@ DEFAULT_DB_FILE = "home-assistant_v2.db"
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 
+DEFAULT_MAX_QUEUE_SIZE = 30000
+
+# Number of recently written attribute sets the recorder keeps the id of
+DEFAULT_ATTRIBUTES_CACHE_SIZE = 2048
+
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -69,6 +75,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_MAX_QUEUE_SIZE = "max_queue_size"
+CONF_ATTRIBUTES_CACHE_SIZE = "attributes_cache_size"
 
 FILTER_SCHEMA = vol.Schema(
     {
@@ -108,6 +116,12 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_DB_RETRY_WAIT, default=DEFAULT_DB_RETRY_WAIT
                 ): cv.positive_int,
+                vol.Optional(
+                    CONF_MAX_QUEUE_SIZE, default=DEFAULT_MAX_QUEUE_SIZE
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_ATTRIBUTES_CACHE_SIZE, default=DEFAULT_ATTRIBUTES_CACHE_SIZE
+                ): cv.positive_int,
             }
         )
     },
@@ -148,6 +162,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    max_queue_size = conf[CONF_MAX_QUEUE_SIZE]
+    attributes_cache_size = conf[CONF_ATTRIBUTES_CACHE_SIZE]
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -163,6 +179,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
+        max_queue_size=max_queue_size,
+        attributes_cache_size=attributes_cache_size,
         include=include,
         exclude=exclude,
     )
@@ -176,10 +194,29 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.services.async_register(
         DOMAIN, SERVICE_PURGE, async_handle_purge_service, schema=SERVICE_PURGE_SCHEMA
     )
+    websocket_api.async_register_command(hass, websocket_info)
 
     return await instance.async_db_ready
 
 
+@websocket_api.websocket_command({vol.Required("type"): "recorder/info"})
+@callback
+def websocket_info(hass, connection, msg):
+    """Return how far the recorder is behind."""
+    instance = hass.data[DATA_INSTANCE]
+    connection.send_result(
+        msg["id"],
+        {
+            "queue_depth": instance.queue.qsize(),
+            "max_queue_size": instance.max_queue_size,
+            "coalesced_states": len(instance.coalesced_states),
+            "dropped_events": instance.dropped_events,
+            "commit_latency": instance.commit_latency,
+            "purge_remaining": dict(instance.purge_remaining),
+        },
+    )
+
+
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
 
 
@@ -195,6 +232,8 @@ class Recorder(threading.Thread):
         uri: str,
         db_max_retries: int,
         db_retry_wait: int,
+        max_queue_size: int,
+        attributes_cache_size: int,
         include: Dict,
         exclude: Dict,
     ) -> None:
@@ -210,6 +249,15 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.max_queue_size = max_queue_size
+        self.attributes_cache_size = attributes_cache_size
+        # Latest state change per entity while the queue is full
+        self.coalesced_states: Dict[str, Any] = {}
+        self._stopping = False
+        self.dropped_events = 0
+        self.commit_latency: Optional[float] = None
+        # Rows left to delete per table while a purge runs
+        self.purge_remaining: Dict[str, int] = {}
         self.async_db_ready = asyncio.Future()
         self.engine: Any = None
         self.run_info: Any = None
@@ -223,6 +271,10 @@ class Recorder(threading.Thread):
         self.exclude_t = exclude.get(CONF_EVENT_TYPES, [])
 
         self._timechanges_seen = 0
+        # Events that are not written yet, and written but not committed
+        self._pending_events: List[Event] = []
+        self._uncommitted_events: List[Event] = []
+        self._attributes_ids: "OrderedDict[str, int]" = OrderedDict()
         self.event_session = None
         self.get_session = None
 
@@ -287,6 +339,9 @@ class Recorder(threading.Thread):
                 """Shut down the Recorder."""
                 if not hass_started.done():
                     hass_started.set_result(shutdown_task)
+                run_callback_threadsafe(
+                    self.hass.loop, self._async_flush_coalesced_states
+                ).result()
                 self.queue.put(None)
                 self.join()
 
@@ -341,6 +396,9 @@ class Recorder(threading.Thread):
         # with a commit every time the event time
         # has changed.  This reduces the disk io.
         while True:
+            if self.coalesced_states and self.queue.empty():
+                # No new event may come along to requeue them
+                self.hass.add_job(self._requeue_coalesced_states)
             event = self.queue.get()
 
             if event is None:
@@ -349,7 +407,11 @@ class Recorder(threading.Thread):
                 self.queue.task_done()
                 return
             if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
+                # Purged shared attributes must not be referenced by pending states
+                self._commit_event_session_or_retry()
+                # Let the events that queued up in the meantime go first
+                if not purge.purge_old_data(self, event.keep_days, event.repack):
+                    self.queue.put(event)
                 self.queue.task_done()
                 continue
             if event.event_type == EVENT_TIME_CHANGED:
@@ -370,28 +432,16 @@ class Recorder(threading.Thread):
                     self.queue.task_done()
                     continue
 
-            try:
-                dbevent = Events.from_event(event)
-                self.event_session.add(dbevent)
-                self.event_session.flush()
-            except (TypeError, ValueError):
-                _LOGGER.warning("Event is not JSON serializable: %s", event)
-
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
-                try:
-                    dbstate = States.from_event(event)
-                    dbstate.event_id = dbevent.event_id
-                    self.event_session.add(dbstate)
-                except (TypeError, ValueError):
-                    _LOGGER.warning(
-                        "State is not JSON serializable: %s",
-                        event.data.get("new_state"),
-                    )
+            self._pending_events.append(event)
 
             # If they do not have a commit interval
             # than we commit right away
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
+            # Otherwise write whatever queued up in one go once the queue
+            # runs dry, the commit follows on the commit interval.
+            elif self.queue.empty():
+                self._write_pending_events_or_rollback()
 
             self.queue.task_done()
 
@@ -415,12 +465,14 @@ class Recorder(threading.Thread):
 
             except exc.SQLAlchemyError:
                 _LOGGER.exception("Error saving events")
+                self._pending_events = []
                 return
 
         _LOGGER.error(
             "Error in database update. Could not save " "after %d tries. Giving up",
             tries,
         )
+        self._pending_events = []
         try:
             self.event_session.close()
         except exc.SQLAlchemyError:
@@ -430,17 +482,242 @@ class Recorder(threading.Thread):
 
     def _commit_event_session(self):
         try:
+            start = time.perf_counter()
+            self._write_pending_events()
             self.event_session.commit()
+            self.commit_latency = time.perf_counter() - start
+            self._uncommitted_events = []
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
-            self.event_session.rollback()
+            self._rollback_event_session()
             raise
 
+    def _rollback_event_session(self):
+        """Roll back the session, the events it held are written again."""
+        self.event_session.rollback()
+        self.clear_attributes_cache()
+        self._pending_events = self._uncommitted_events + self._pending_events
+        self._uncommitted_events = []
+
+    def _write_pending_events_or_rollback(self):
+        try:
+            self._write_pending_events()
+        except exc.OperationalError as err:
+            _LOGGER.error("Error in database connectivity: %s", err)
+            # The commit retries the events that were rolled back
+            self._rollback_event_session()
+            self._commit_event_session_or_retry()
+        except exc.SQLAlchemyError:
+            _LOGGER.exception("Error saving events")
+            self._rollback_event_session()
+            self._pending_events = []
+
+    def _write_pending_events(self):
+        """Write the events and states collected since the last write.
+
+        The events are inserted with one executemany, the states get the
+        event ids read back for the batch and are inserted with another.
+        """
+        if not self._pending_events:
+            return
+
+        dbevents = []
+        dbstates = []
+        for event in self._pending_events:
+            try:
+                dbevent = Events.from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                continue
+            dbevents.append(dbevent)
+
+            if event.event_type != EVENT_STATE_CHANGED:
+                continue
+            try:
+                dbstate = States.from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s", event.data.get("new_state"),
+                )
+                continue
+            # Stored in the state_attributes table instead
+            shared_attrs = dbstate.attributes
+            dbstate.attributes = None
+            dbstates.append((dbevent, dbstate, shared_attrs))
+
+        self._uncommitted_events.extend(self._pending_events)
+        self._pending_events = []
+
+        if dbstates:
+            self._share_attributes(
+                [(dbstate, shared_attrs) for _, dbstate, shared_attrs in dbstates]
+            )
+        if not dbevents:
+            return
+        self._insert_rows(dbevents, (Events.event_type, Events.context_id))
+
+        for dbevent, dbstate, _ in dbstates:
+            dbstate.event_id = dbevent.event_id
+        if dbstates:
+            self._insert_rows([dbstate for _, dbstate, _ in dbstates])
+
+    def _insert_rows(self, dbobjects, match_columns=None):
+        """Insert rows of one table with a single executemany.
+
+        With match_columns the primary keys of the new rows are set on the
+        objects. They are read back once for the batch from the rows with a
+        higher key than before the insert, matched in insert order on
+        match_columns. Rows something else inserted meanwhile are skipped.
+        """
+        model = type(dbobjects[0])
+        table = model.__table__
+        primary_key = getattr(model, table.primary_key.columns.keys()[0])
+        # Columns left out get their default for every row
+        keys = [
+            column.key
+            for column in table.columns
+            if not column.primary_key
+            and (
+                column.default is None or getattr(dbobjects[0], column.key) is not None
+            )
+        ]
+
+        if match_columns is not None:
+            last_id = self.event_session.query(func.max(primary_key)).scalar() or 0
+
+        self.event_session.execute(
+            table.insert(),
+            [{key: getattr(dbobject, key) for key in keys} for dbobject in dbobjects],
+        )
+
+        if match_columns is None:
+            return
+
+        pending = iter(dbobjects)
+        dbobject = next(pending)
+        query = (
+            self.event_session.query(primary_key, *match_columns)
+            .filter(primary_key > last_id)
+            .order_by(primary_key)
+        )
+        for row in query:
+            if any(
+                row[idx] != getattr(dbobject, column.key)
+                for idx, column in enumerate(match_columns, 1)
+            ):
+                continue
+            setattr(dbobject, primary_key.key, row[0])
+            dbobject = next(pending, None)
+            if dbobject is None:
+                return
+
+        raise exc.InvalidRequestError(f"Inserted rows not found in {table.name}")
+
+    def _share_attributes(self, dbstates):
+        """Point the states to the shared rows of their attributes JSON.
+
+        Attribute sets that were written recently are resolved from memory,
+        others are looked up by hash or inserted with one executemany.
+        """
+        attributes_ids = {}
+        new_attributes = {}
+
+        for _, shared_attrs in dbstates:
+            if shared_attrs in attributes_ids or shared_attrs in new_attributes:
+                continue
+
+            attributes_id = self._attributes_ids.get(shared_attrs)
+            if attributes_id is None:
+                attributes_id = self._find_attributes_id(shared_attrs)
+
+            if attributes_id is None:
+                new_attributes[shared_attrs] = StateAttributes.from_shared_attrs(
+                    shared_attrs
+                )
+            else:
+                attributes_ids[shared_attrs] = attributes_id
+
+        if new_attributes:
+            self._insert_rows(list(new_attributes.values()), (StateAttributes.hash,))
+            for shared_attrs, dbattributes in new_attributes.items():
+                attributes_ids[shared_attrs] = dbattributes.attributes_id
+
+        for dbstate, shared_attrs in dbstates:
+            dbstate.attributes_id = attributes_ids[shared_attrs]
+
+        for shared_attrs, attributes_id in attributes_ids.items():
+            self._attributes_ids[shared_attrs] = attributes_id
+            self._attributes_ids.move_to_end(shared_attrs)
+        while len(self._attributes_ids) > self.attributes_cache_size:
+            self._attributes_ids.popitem(last=False)
+
+    def _find_attributes_id(self, shared_attrs):
+        """Return the id of stored attributes, colliding hashes are compared."""
+        attributes_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        row = (
+            self.event_session.query(StateAttributes.attributes_id)
+            .filter(
+                (StateAttributes.hash == attributes_hash)
+                & (StateAttributes.shared_attrs == shared_attrs)
+            )
+            .first()
+        )
+        return row[0] if row else None
+
+    def clear_attributes_cache(self):
+        """Forget the attribute ids, they may no longer be in the database."""
+        self._attributes_ids.clear()
+
     @callback
     def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
+        """Listen for new events and put them in the process queue.
+
+        Once max_queue_size events are waiting, only the latest state change
+        of each entity is kept until there is room again and all other
+        events are dropped.
+        """
+        if not self.max_queue_size or self._stopping:
+            self.queue.put(event)
+            return
+
+        if self.coalesced_states:
+            self._requeue_coalesced_states()
+
+        full = self.queue.qsize() >= self.max_queue_size
+
+        if event.event_type == EVENT_STATE_CHANGED and (full or self.coalesced_states):
+            entity_id = event.data.get(ATTR_ENTITY_ID)
+            if entity_id in self.coalesced_states:
+                self.dropped_events += 1
+            elif not self.coalesced_states:
+                _LOGGER.warning(
+                    "The recorder queue is full, coalescing state changes and "
+                    "dropping other events until the database catches up"
+                )
+            self.coalesced_states[entity_id] = event
+            return
+
+        if full:
+            self.dropped_events += 1
+            return
+
         self.queue.put(event)
 
+    @callback
+    def _async_flush_coalesced_states(self):
+        """Queue all coalesced state changes to be written before stopping."""
+        self._stopping = True
+        while self.coalesced_states:
+            entity_id = next(iter(self.coalesced_states))
+            self.queue.put(self.coalesced_states.pop(entity_id))
+
+    @callback
+    def _requeue_coalesced_states(self):
+        """Move coalesced state changes to the queue while there is room."""
+        while self.coalesced_states and self.queue.qsize() < self.max_queue_size:
+            entity_id = next(iter(self.coalesced_states))
+            self.queue.put(self.coalesced_states.pop(entity_id))
+
     def block_till_done(self):
         """Block till all events processed."""
         self.queue.join()
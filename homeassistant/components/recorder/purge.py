@@ -2,36 +2,72 @@
 from datetime import timedelta
 import logging
 
+from sqlalchemy import exists
 from sqlalchemy.exc import SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, States
+from .models import Events, StateAttributes, States
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of rows deleted per table in one run of purge_old_data
+PURGE_BATCH_SIZE = 5000
+# Maximum number of attribute ids in a single delete, below the SQLite limit
+ATTRIBUTES_PURGE_CHUNK_SIZE = 500
+
 
 def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
+    """Purge events and states older than purge_days ago.
+
+    Rows are deleted in batches by primary key range, so the database is not
+    locked for long. Returns False while there are rows left, the caller
+    should call again after handling the events that queued up meanwhile.
+    The rows left to purge per table are kept in instance.purge_remaining.
+    """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
-    _LOGGER.debug("Purging events before %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            deleted_rows = (
-                session.query(States)
-                .filter((States.last_updated < purge_before))
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            if not instance.purge_remaining:
+                # Counted once, every batch subtracts the rows it deleted
+                instance.purge_remaining = {
+                    States.__tablename__: session.query(States.state_id)
+                    .filter(States.last_updated < purge_before)
+                    .count(),
+                    Events.__tablename__: session.query(Events.event_id)
+                    .filter(Events.time_fired < purge_before)
+                    .count(),
+                }
+                _LOGGER.debug(
+                    "Purging %s states and %s events before %s",
+                    instance.purge_remaining[States.__tablename__],
+                    instance.purge_remaining[Events.__tablename__],
+                    purge_before,
+                )
 
-            deleted_rows = (
-                session.query(Events)
-                .filter((Events.time_fired < purge_before))
-                .delete(synchronize_session=False)
+            # States reference their events, so they are purged first
+            purged_states = _purge_batch(
+                instance,
+                session,
+                States.state_id,
+                States.last_updated < purge_before,
+                States.attributes_id,
             )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            if purged_states:
+                _purge_unused_attributes(
+                    instance,
+                    session,
+                    {row.attributes_id for row in purged_states} - {None},
+                )
+                return False
+            if _purge_batch(
+                instance, session, Events.event_id, Events.time_fired < purge_before
+            ):
+                return False
+
+        instance.purge_remaining = {}
 
         # Execute sqlite vacuum command to free up space on disk
         if repack and instance.engine.driver in ("pysqlite", "postgresql"):
@@ -40,3 +76,57 @@ def purge_old_data(instance, purge_days, repack):
 
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s.", err)
+        instance.purge_remaining = {}
+
+    return True
+
+
+def _purge_batch(instance, session, primary_key, purge_filter, *columns):
+    """Delete the oldest batch of rows and return the rows that were purged.
+
+    The rows have the primary key and the extra columns.
+    """
+    batch = (
+        session.query(primary_key, *columns)
+        .filter(purge_filter)
+        .order_by(primary_key)
+        .limit(PURGE_BATCH_SIZE)
+        .all()
+    )
+    if not batch:
+        return batch
+
+    deleted_rows = (
+        session.query(primary_key.class_)
+        .filter(primary_key.between(batch[0][0], batch[-1][0]) & purge_filter)
+        .delete(synchronize_session=False)
+    )
+    table_name = primary_key.class_.__tablename__
+    # Rows that got old since the purge started are not in the count
+    remaining_rows = max(instance.purge_remaining.get(table_name, 0) - deleted_rows, 0)
+    instance.purge_remaining[table_name] = remaining_rows
+    _LOGGER.debug(
+        "Deleted %s %s, %s left to purge", deleted_rows, table_name, remaining_rows
+    )
+    return batch
+
+
+def _purge_unused_attributes(instance, session, attributes_ids):
+    """Delete the shared attributes of purged states that are no longer used."""
+    attributes_ids = sorted(attributes_ids)
+    deleted_rows = 0
+    for idx in range(0, len(attributes_ids), ATTRIBUTES_PURGE_CHUNK_SIZE):
+        chunk = attributes_ids[idx : idx + ATTRIBUTES_PURGE_CHUNK_SIZE]
+        deleted_rows += (
+            session.query(StateAttributes)
+            .filter(
+                StateAttributes.attributes_id.in_(chunk)
+                & ~exists().where(States.attributes_id == StateAttributes.attributes_id)
+            )
+            .delete(synchronize_session=False)
+        )
+    _LOGGER.debug("Deleted %s shared attributes", deleted_rows)
+
+    if deleted_rows:
+        # The recorder must not point new states to deleted attributes
+        instance.clear_attributes_cache()
@@ -1,11 +1,12 @@
 """The template component."""
 
 from itertools import chain
-import logging
 
-from homeassistant.const import MATCH_ALL
-
-_LOGGER = logging.getLogger(__name__)
+from homeassistant.core import callback
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_template_renders,
+)
 
 
 def initialise_templates(hass, templates, attribute_templates=None):
@@ -18,42 +19,39 @@ def initialise_templates(hass, templates, attribute_templates=None):
         template.hass = hass
 
 
-def extract_entities(
-    device_name, device_type, manual_entity_ids, templates, attribute_templates=None
-):
-    """Extract entity ids from templates and attribute templates."""
-    if attribute_templates is None:
-        attribute_templates = dict()
-    entity_ids = set()
-    if manual_entity_ids is None:
-        invalid_templates = []
-        for template_name, template in chain(
-            templates.items(), attribute_templates.items()
-        ):
-            if template is None:
-                continue
-
-            template_entity_ids = template.extract_entities()
-
-            if template_entity_ids != MATCH_ALL:
-                entity_ids |= set(template_entity_ids)
-            else:
-                invalid_templates.append(template_name.replace("_template", ""))
-
-        if invalid_templates:
-            entity_ids = MATCH_ALL
-            _LOGGER.warning(
-                "Template %s '%s' has no entity ids configured to track nor"
-                " were we able to extract the entities to track from the %s "
-                "template(s). This entity will only be able to be updated "
-                "manually.",
-                device_type,
-                device_name,
-                ", ".join(invalid_templates),
-            )
-        else:
-            entity_ids = list(entity_ids)
-    else:
-        entity_ids = manual_entity_ids
-
-    return entity_ids
+@callback
+def async_templates_to_track(templates):
+    """Return the templates that can render differently after a state change.
+
+    Templates that read no state and depend on nothing else, like the time,
+    always render the same and are left out.
+    """
+    tracked = []
+    for template in templates:
+        if template is None:
+            continue
+        render_info = template.async_render_to_info()
+        if render_info.cacheable and not render_info.entities:
+            continue
+        tracked.append(template)
+    return tracked
+
+
+@callback
+def async_track_template_entities(hass, entity_ids, templates, action):
+    """Run action when an entity the templates depend on changes.
+
+    Configured entity ids are tracked as they are. Without them the entities
+    and domains the templates read while rendering are tracked.
+    """
+    if entity_ids is not None:
+        return async_track_state_change(hass, entity_ids, action)
+
+    @callback
+    def template_render_listener(entity, old_state, new_state, render_infos):
+        """Run action for a change of what the templates read."""
+        hass.async_run_job(action, entity, old_state, new_state)
+
+    return async_track_template_renders(
+        hass, async_templates_to_track(templates), template_render_listener
+    )
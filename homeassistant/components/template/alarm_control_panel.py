@@ -19,7 +19,6 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_VALUE_TEMPLATE,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
     STATE_ALARM_ARMED_AWAY,
     STATE_ALARM_ARMED_HOME,
     STATE_ALARM_ARMED_NIGHT,
@@ -32,9 +31,10 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers.script import Script
 
+from . import async_track_template_entities
+
 _LOGGER = logging.getLogger(__name__)
 _VALID_STATES = [
     STATE_ALARM_ARMED_AWAY,
@@ -87,18 +87,9 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         arm_night_action = device_config.get(CONF_ARM_NIGHT_ACTION)
         code_arm_required = device_config[CONF_CODE_ARM_REQUIRED]
 
-        template_entity_ids = set()
-
-        if state_template is not None:
-            temp_ids = state_template.extract_entities()
-            if str(temp_ids) != MATCH_ALL:
-                template_entity_ids |= set(temp_ids)
-        else:
+        if state_template is None:
             _LOGGER.warning("No value template - will use optimistic state")
 
-        if not template_entity_ids:
-            template_entity_ids = MATCH_ALL
-
         alarm_control_panels.append(
             AlarmControlPanelTemplate(
                 hass,
@@ -110,7 +101,6 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
                 arm_home_action,
                 arm_night_action,
                 code_arm_required,
-                template_entity_ids,
             )
         )
 
@@ -131,7 +121,6 @@ class AlarmControlPanelTemplate(AlarmControlPanel):
         arm_home_action,
         arm_night_action,
         code_arm_required,
-        template_entity_ids,
     ):
         """Initialize the panel."""
         self.hass = hass
@@ -155,7 +144,6 @@ class AlarmControlPanelTemplate(AlarmControlPanel):
             self._arm_night_script = Script(hass, arm_night_action)
 
         self._state = None
-        self._entities = template_entity_ids
 
         if self._template is not None:
             self._template.hass = self.hass
@@ -211,10 +199,9 @@ class AlarmControlPanelTemplate(AlarmControlPanel):
         @callback
         def template_alarm_control_panel_startup(event):
             """Update template on startup."""
-            if self._template is not None:
-                async_track_state_change(
-                    self.hass, self._entities, template_alarm_state_listener
-                )
+            async_track_template_entities(
+                self.hass, None, (self._template,), template_alarm_state_listener
+            )
 
             self.async_schedule_update_ha_state(True)
 
@@ -24,9 +24,9 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_same_state, async_track_state_change
+from homeassistant.helpers.event import async_track_same_state
 
-from . import extract_entities, initialise_templates
+from . import async_track_template_entities, initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -79,13 +79,8 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "binary sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        # Without entity ids the sensor follows what its templates read
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             BinarySensorTemplate(
@@ -155,11 +150,18 @@ class BinarySensorTemplate(BinarySensorDevice):
         @callback
         def template_bsensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_bsensor_state_listener
-                )
+            async_track_template_entities(
+                self.hass,
+                self._entities,
+                (
+                    self._template,
+                    self._icon_template,
+                    self._entity_picture_template,
+                    self._availability_template,
+                    *self._attribute_templates.values(),
+                ),
+                template_bsensor_state_listener,
+            )
 
             self.async_check_state()
 
@@ -295,7 +297,7 @@ class BinarySensorTemplate(BinarySensorDevice):
             self.hass,
             period,
             set_state,
-            entity_ids=self._entities,
+            entity_ids=MATCH_ALL if self._entities is None else self._entities,
             async_check_same_func=lambda *args: self._async_render() == state,
         )
 
@@ -35,10 +35,9 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers.script import Script
 
-from . import extract_entities, initialise_templates
+from . import async_track_template_entities, initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -131,9 +130,8 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates)
-        entity_ids = extract_entities(
-            device, "cover", device_config.get(CONF_ENTITY_ID), templates
-        )
+        # Without entity ids the cover follows what its templates read
+        entity_ids = device_config.get(CONF_ENTITY_ID)
 
         covers.append(
             CoverTemplate(
@@ -233,8 +231,18 @@ class CoverTemplate(CoverDevice):
         @callback
         def template_cover_startup(event):
             """Update template on startup."""
-            async_track_state_change(
-                self.hass, self._entities, template_cover_state_listener
+            async_track_template_entities(
+                self.hass,
+                self._entities,
+                (
+                    self._template,
+                    self._position_template,
+                    self._tilt_template,
+                    self._icon_template,
+                    self._availability_template,
+                    self._entity_picture_template,
+                ),
+                template_cover_state_listener,
             )
 
             self.async_schedule_update_ha_state(True)
@@ -33,7 +33,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
 from homeassistant.helpers.script import Script
 
-from . import extract_entities, initialise_templates
+from . import async_track_template_entities, initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -108,7 +108,6 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates)
-        entity_ids = extract_entities(device, "fan", None, templates)
 
         fans.append(
             TemplateFan(
@@ -126,7 +125,6 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
                 set_oscillating_action,
                 set_direction_action,
                 speed_list,
-                entity_ids,
             )
         )
 
@@ -152,7 +150,6 @@ class TemplateFan(FanEntity):
         set_oscillating_action,
         set_direction_action,
         speed_list,
-        entity_ids,
     ):
         """Initialize the fan."""
         self.hass = hass
@@ -196,7 +193,6 @@ class TemplateFan(FanEntity):
         if self._direction_template:
             self._supported_features |= SUPPORT_DIRECTION
 
-        self._entities = entity_ids
         # List of valid speeds
         self._speed_list = speed_list
 
@@ -320,8 +316,17 @@ class TemplateFan(FanEntity):
         @callback
         def template_fan_startup(event):
             """Update template on startup."""
-            self.hass.helpers.event.async_track_state_change(
-                self._entities, template_fan_state_listener
+            async_track_template_entities(
+                self.hass,
+                None,
+                (
+                    self._template,
+                    self._speed_template,
+                    self._oscillating_template,
+                    self._direction_template,
+                    self._availability_template,
+                ),
+                template_fan_state_listener,
             )
 
             self.async_schedule_update_ha_state(True)
@@ -29,10 +29,9 @@ from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers.script import Script
 
-from . import extract_entities, initialise_templates
+from . import async_track_template_entities, initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -106,9 +105,8 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates)
-        entity_ids = extract_entities(
-            device, "light", device_config.get(CONF_ENTITY_ID), templates
-        )
+        # Without entity ids the light follows what its templates read
+        entity_ids = device_config.get(CONF_ENTITY_ID)
 
         lights.append(
             LightTemplate(
@@ -258,16 +256,20 @@ class LightTemplate(Light):
         @callback
         def template_light_startup(event):
             """Update template on startup."""
-            if (
-                self._template is not None
-                or self._level_template is not None
-                or self._temperature_template is not None
-                or self._color_template is not None
-                or self._availability_template is not None
-            ):
-                async_track_state_change(
-                    self.hass, self._entities, template_light_state_listener
-                )
+            async_track_template_entities(
+                self.hass,
+                self._entities,
+                (
+                    self._template,
+                    self._icon_template,
+                    self._entity_picture_template,
+                    self._availability_template,
+                    self._level_template,
+                    self._temperature_template,
+                    self._color_template,
+                ),
+                template_light_state_listener,
+            )
 
             self.async_schedule_update_ha_state(True)
 
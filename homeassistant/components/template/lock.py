@@ -9,17 +9,15 @@ from homeassistant.const import (
     CONF_OPTIMISTIC,
     CONF_VALUE_TEMPLATE,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
     STATE_LOCKED,
     STATE_ON,
 )
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers.script import Script
 
-from . import extract_entities, initialise_templates
+from . import async_track_template_entities, initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -54,7 +52,6 @@ async def async_setup_platform(hass, config, async_add_devices, discovery_info=N
     }
 
     initialise_templates(hass, templates)
-    entity_ids = extract_entities(device, "lock", None, templates)
 
     async_add_devices(
         [
@@ -63,7 +60,6 @@ async def async_setup_platform(hass, config, async_add_devices, discovery_info=N
                 device,
                 value_template,
                 availability_template,
-                entity_ids,
                 config.get(CONF_LOCK),
                 config.get(CONF_UNLOCK),
                 config.get(CONF_OPTIMISTIC),
@@ -81,7 +77,6 @@ class TemplateLock(LockDevice):
         name,
         value_template,
         availability_template,
-        entity_ids,
         command_lock,
         command_unlock,
         optimistic,
@@ -92,7 +87,6 @@ class TemplateLock(LockDevice):
         self._name = name
         self._state_template = value_template
         self._availability_template = availability_template
-        self._state_entities = entity_ids
         self._command_lock = Script(hass, command_lock)
         self._command_unlock = Script(hass, command_unlock)
         self._optimistic = optimistic
@@ -109,11 +103,12 @@ class TemplateLock(LockDevice):
         @callback
         def template_lock_startup(event):
             """Update template on startup."""
-            if self._state_entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self._hass, self._state_entities, template_lock_state_listener
-                )
+            async_track_template_entities(
+                self._hass,
+                None,
+                (self._state_template, self._availability_template),
+                template_lock_state_listener,
+            )
             self.async_schedule_update_ha_state(True)
 
         self._hass.bus.async_listen_once(
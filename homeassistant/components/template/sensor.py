@@ -20,15 +20,17 @@ from homeassistant.const import (
     CONF_SENSORS,
     CONF_VALUE_TEMPLATE,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
 )
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_template_renders,
+)
 
-from . import extract_entities, initialise_templates
+from . import async_templates_to_track, initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 CONF_ATTRIBUTE_TEMPLATES = "attribute_templates"
@@ -81,13 +83,8 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        # Without entity ids the sensor follows what its templates read
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             SensorTemplate(
@@ -149,6 +146,8 @@ class SensorTemplate(Entity):
         self._available = True
         self._attribute_templates = attribute_templates
         self._attributes = {}
+        # Template -> render done when tracking the last change
+        self._render_infos = {}
 
     async def async_added_to_hass(self):
         """Register callbacks."""
@@ -161,11 +160,33 @@ class SensorTemplate(Entity):
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
+            if self._entities is not None:
                 async_track_state_change(
                     self.hass, self._entities, template_sensor_state_listener
                 )
+            else:
+                templates = async_templates_to_track(
+                    (
+                        self._template,
+                        self._icon_template,
+                        self._entity_picture_template,
+                        self._friendly_name_template,
+                        self._availability_template,
+                        *self._attribute_templates.values(),
+                    )
+                )
+
+                @callback
+                def template_sensor_render_listener(
+                    entity, old_state, new_state, render_infos
+                ):
+                    """Handle a change of what the templates read."""
+                    self._render_infos = dict(zip(templates, render_infos))
+                    self.async_schedule_update_ha_state(True)
+
+                async_track_template_renders(
+                    self.hass, templates, template_sensor_render_listener
+                )
 
             self.async_schedule_update_ha_state(True)
 
@@ -220,8 +241,17 @@ class SensorTemplate(Entity):
 
     async def async_update(self):
         """Update the state from the template."""
+        render_infos, self._render_infos = self._render_infos, {}
+
+        def render(template):
+            """Return the tracked render of the template or render it now."""
+            render_info = render_infos.get(template)
+            if render_info is None:
+                return template.async_render()
+            return render_info.result
+
         try:
-            self._state = self._template.async_render()
+            self._state = render(self._template)
             self._available = True
         except TemplateError as ex:
             self._available = False
@@ -239,7 +269,7 @@ class SensorTemplate(Entity):
         attrs = {}
         for key, value in self._attribute_templates.items():
             try:
-                attrs[key] = value.async_render()
+                attrs[key] = render(value)
             except TemplateError as err:
                 _LOGGER.error("Error rendering attribute %s: %s", key, err)
 
@@ -257,7 +287,7 @@ class SensorTemplate(Entity):
                 continue
 
             try:
-                value = template.async_render()
+                value = render(template)
                 if property_name == "_available":
                     value = value.lower() == "true"
                 setattr(self, property_name, value)
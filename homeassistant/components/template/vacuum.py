@@ -35,7 +35,6 @@ from homeassistant.const import (
     CONF_FRIENDLY_NAME,
     CONF_VALUE_TEMPLATE,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
     STATE_UNKNOWN,
 )
 from homeassistant.core import callback
@@ -44,7 +43,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
 from homeassistant.helpers.script import Script
 
-from . import extract_entities, initialise_templates
+from . import async_track_template_entities, initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -118,7 +117,6 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates)
-        entity_ids = extract_entities(device, "vacuum", None, templates)
 
         vacuums.append(
             TemplateVacuum(
@@ -137,7 +135,6 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
                 locate_action,
                 set_fan_speed_action,
                 fan_speed_list,
-                entity_ids,
             )
         )
 
@@ -164,7 +161,6 @@ class TemplateVacuum(StateVacuumDevice):
         locate_action,
         set_fan_speed_action,
         fan_speed_list,
-        entity_ids,
     ):
         """Initialize the vacuum."""
         self.hass = hass
@@ -221,7 +217,6 @@ class TemplateVacuum(StateVacuumDevice):
         if self._battery_level_template:
             self._supported_features |= SUPPORT_BATTERY
 
-        self._entities = entity_ids
         # List of valid fan speeds
         self._fan_speed_list = fan_speed_list
 
@@ -332,11 +327,17 @@ class TemplateVacuum(StateVacuumDevice):
         @callback
         def template_vacuum_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state changes only for valid templates
-                self.hass.helpers.event.async_track_state_change(
-                    self._entities, template_vacuum_state_listener
-                )
+            async_track_template_entities(
+                self.hass,
+                None,
+                (
+                    self._template,
+                    self._battery_level_template,
+                    self._fan_speed_template,
+                    self._availability_template,
+                ),
+                template_vacuum_state_listener,
+            )
 
             self.async_schedule_update_ha_state(True)
 
@@ -18,12 +18,14 @@ from . import const, decorators, messages
 def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_unsubscribe_events)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_ping)
+    async_reg(hass, handle_supported_features)
     async_reg(hass, handle_render_template)
 
 
@@ -58,12 +60,15 @@ def handle_subscribe_events(hass, connection, msg):
         @callback
         def forward_events(event):
             """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
-                event.data["entity_id"], POLICY_READ
+            entity_id = event.data["entity_id"]
+            permissions = connection.user.permissions
+            if not (
+                permissions.access_all_entities(POLICY_READ)
+                or entity_id in permissions.allowed_entity_ids(POLICY_READ)
             ):
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event))
+            connection.send_message(messages.cached_event_message(msg["id"], event))
 
     else:
 
@@ -73,7 +78,7 @@ def handle_subscribe_events(hass, connection, msg):
             if event.event_type == EVENT_TIME_CHANGED:
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event.as_dict()))
+            connection.send_message(messages.cached_event_message(msg["id"], event))
 
     connection.subscriptions[msg["id"]] = hass.bus.async_listen(
         event_type, forward_events
@@ -82,6 +87,100 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the current states, then the changes to them. Changes that happen
+    within ENTITIES_BATCH_WINDOW are sent in one message, as differences to
+    the last sent states.
+
+    Async friendly.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+    entity_perm = connection.user.permissions.check_entity
+    # Entity id -> (last sent state, newest state)
+    pending = {}
+    send_handle = None
+
+    @callback
+    def send_pending():
+        """Send the states that changed since the last message."""
+        nonlocal send_handle
+        send_handle = None
+        added = {}
+        changed = {}
+        removed = []
+
+        for entity_id, (old_state, new_state) in pending.items():
+            if new_state is None:
+                if old_state is not None:
+                    removed.append(entity_id)
+            elif old_state is None:
+                added[entity_id] = messages.compressed_state(new_state)
+            else:
+                diff = messages.compressed_state_diff(old_state, new_state)
+                if diff:
+                    changed[entity_id] = diff
+        pending.clear()
+
+        if added or changed or removed:
+            connection.send_message(
+                messages.entities_message(msg["id"], added, changed, removed)
+            )
+
+    @callback
+    def forward_state_changes(event):
+        """Queue a state change to be sent."""
+        nonlocal send_handle
+        entity_id = event.data["entity_id"]
+
+        if entity_ids and entity_id not in entity_ids:
+            return
+        if not entity_perm(entity_id, POLICY_READ):
+            return
+
+        if entity_id in pending:
+            pending[entity_id] = (pending[entity_id][0], event.data["new_state"])
+        else:
+            pending[entity_id] = (event.data["old_state"], event.data["new_state"])
+
+        if send_handle is None:
+            send_handle = hass.loop.call_later(
+                const.ENTITIES_BATCH_WINDOW, send_pending
+            )
+
+    remove_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, forward_state_changes)
+
+    @callback
+    def unsubscribe():
+        """Stop forwarding state changes."""
+        remove_listener()
+        if send_handle is not None:
+            send_handle.cancel()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_message(messages.result_message(msg["id"]))
+
+    connection.send_message(
+        messages.entities_message(
+            msg["id"],
+            added={
+                state.entity_id: messages.compressed_state(state)
+                for state in hass.states.async_all()
+                if (not entity_ids or state.entity_id in entity_ids)
+                and entity_perm(state.entity_id, POLICY_READ)
+            },
+        )
+    )
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -171,14 +270,12 @@ def handle_get_states(hass, connection, msg):
     if connection.user.permissions.access_all_entities("read"):
         states = hass.states.async_all()
     else:
-        entity_perm = connection.user.permissions.check_entity
+        allowed = connection.user.permissions.allowed_entity_ids(POLICY_READ)
         states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
+            state for state in hass.states.async_all() if state.entity_id in allowed
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.cached_states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -212,6 +309,19 @@ def handle_ping(hass, connection, msg):
     connection.send_message(pong_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {vol.Required("type"): "supported_features", vol.Required("features"): {str: int}}
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting supported features.
+
+    Async friendly.
+    """
+    connection.supported_features = msg["features"]
+    connection.send_message(messages.result_message(msg["id"]))
+
+
 @callback
 @decorators.websocket_command(
     {
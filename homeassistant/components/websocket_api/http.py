@@ -16,6 +16,7 @@ from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
     ERR_UNKNOWN_ERROR,
+    FEATURE_COALESCE_MESSAGES,
     JSON_DUMP,
     MAX_PENDING_MSG,
     SIGNAL_WEBSOCKET_CONNECTED,
@@ -51,37 +52,64 @@ class WebSocketHandler:
         self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
         self._handle_task = None
         self._writer_task = None
+        self._connection = None
         self._logger = logging.getLogger("{}.connection.{}".format(__name__, id(self)))
 
     async def _writer(self):
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        Messages that are already pending when the writer wakes up are sent
+        together as one JSON array if the client enabled coalescing.
+        """
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
-            while not self.wsock.closed:
+            closing = False
+
+            while not closing and not self.wsock.closed:
                 message = await self._to_write.get()
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
+                pending = [self._serialize_message(message)]
 
-                if isinstance(message, str):
-                    await self.wsock.send_str(message)
-                    continue
+                while not self._to_write.empty():
+                    message = self._to_write.get_nowait()
+                    if message is None:
+                        closing = True
+                        break
+                    pending.append(self._serialize_message(message))
 
-                try:
-                    dumped = JSON_DUMP(message)
-                except (ValueError, TypeError) as err:
-                    self._logger.error(
-                        "Unable to serialize to JSON: %s\n%s", err, message
-                    )
-                    await self.wsock.send_json(
-                        error_message(
-                            message["id"], ERR_UNKNOWN_ERROR, "Invalid JSON in response"
-                        )
-                    )
+                if len(pending) > 1 and self._can_coalesce():
+                    self._logger.debug("Sending %d coalesced messages", len(pending))
+                    await self.wsock.send_str(f"[{','.join(pending)}]")
                     continue
 
-                await self.wsock.send_str(dumped)
+                for dumped in pending:
+                    self._logger.debug("Sending %s", dumped)
+                    await self.wsock.send_str(dumped)
+
+    def _serialize_message(self, message):
+        """Return a message serialized to JSON."""
+        if isinstance(message, str):
+            return message
+
+        try:
+            return JSON_DUMP(message)
+        except (ValueError, TypeError) as err:
+            self._logger.error("Unable to serialize to JSON: %s\n%s", err, message)
+            return JSON_DUMP(
+                error_message(
+                    message["id"], ERR_UNKNOWN_ERROR, "Invalid JSON in response"
+                )
+            )
+
+    def _can_coalesce(self):
+        """Return if the client accepts several messages in one frame."""
+        connection = self._connection
+        return (
+            connection is not None
+            and connection.supported_features.get(FEATURE_COALESCE_MESSAGES) == 1
+        )
 
     @callback
     def _send_message(self, message):
@@ -159,7 +187,7 @@ class WebSocketHandler:
                 raise Disconnect
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
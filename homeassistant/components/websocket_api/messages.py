@@ -17,6 +17,17 @@ MINIMAL_MESSAGE_SCHEMA = vol.Schema(
 # Base schema to extend by message handlers
 BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 
+# Short keys of the compressed states sent by subscribe_entities
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_EVENT_CHANGE = "c"
+
 
 def result_message(iden, result=None):
     """Return a success result message."""
@@ -36,3 +47,103 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def cached_event_message(iden, event):
+    """Return an event message with the cached JSON of the event spliced in.
+
+    Events without cached JSON, because they contain invalid floats, are
+    returned as a plain message.
+    """
+    try:
+        event_json = event.as_json()
+    except ValueError:
+        return event_message(iden, event)
+    return f'{{"id":{iden},"type":"event","event":{event_json}}}'
+
+
+def cached_states_result_message(iden, states):
+    """Return a success result message with the cached JSON of states.
+
+    States without cached JSON, because they contain invalid floats, are
+    returned as a plain message.
+    """
+    try:
+        states_json = ",".join(state.as_json() for state in states)
+    except ValueError:
+        return result_message(iden, states)
+    return (
+        f'{{"id":{iden},"type":"{const.TYPE_RESULT}","success":true,'
+        f'"result":[{states_json}]}}'
+    )
+
+
+def entities_message(iden, added=None, changed=None, removed=None):
+    """Return an entities event message, leaving out empty parts."""
+    event = {}
+    if added:
+        event[ENTITY_EVENT_ADD] = added
+    if changed:
+        event[ENTITY_EVENT_CHANGE] = changed
+    if removed:
+        event[ENTITY_EVENT_REMOVE] = removed
+    return event_message(iden, event)
+
+
+def compressed_state(state):
+    """Return a state with short keys.
+
+    The last updated time is left out when it equals the last changed time.
+    """
+    compressed = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: state.context.id,
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        compressed[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def compressed_state_diff(old_state, new_state):
+    """Return the changes between two states with short keys.
+
+    Changed values are under "+", attributes only when they changed. Removed
+    attribute names are under "-". Like in compressed_state, the last updated
+    time is left out when it equals the last changed time. Returns None if
+    nothing changed.
+    """
+    additions = {}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.context.id != new_state.context.id:
+        additions[COMPRESSED_STATE_CONTEXT] = new_state.context.id
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    if (
+        old_state.last_updated != new_state.last_updated
+        and new_state.last_updated != new_state.last_changed
+    ):
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+
+    diff = {}
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes != new_attributes:
+        changed_attributes = {
+            key: value
+            for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value
+        }
+        if changed_attributes:
+            additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+        removed_attributes = [
+            key for key in old_attributes if key not in new_attributes
+        ]
+        if removed_attributes:
+            diff["-"] = {COMPRESSED_STATE_ATTRIBUTES: removed_attributes}
+
+    if additions:
+        diff["+"] = additions
+    return diff or None
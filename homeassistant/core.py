@@ -120,6 +120,19 @@ def valid_state(state: str) -> bool:
     return len(state) < 256
 
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize obj to compact JSON the way it is sent to API clients.
+
+    Raises ValueError for invalid floats, callers fall back to their own
+    serialization for those.
+    """
+    # Circular dep
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.json import json_dumps
+
+    return json_dumps(obj, allow_nan=False, compact=True)
+
+
 def callback(func: CALLABLE_T) -> CALLABLE_T:
     """Annotation to mark method as safe to call from within the event loop."""
     setattr(func, "_hass_callback", True)
@@ -466,7 +479,15 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = [
+        "event_type",
+        "data",
+        "origin",
+        "time_fired",
+        "context",
+        "_as_json",
+        "_data_as_json",
+    ]
 
     def __init__(
         self,
@@ -482,6 +503,8 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        self._as_json: Optional[str] = None
+        self._data_as_json: Optional[str] = None
 
     def as_dict(self) -> Dict:
         """Create a dict representation of this Event.
@@ -496,6 +519,48 @@ class Event:
             "context": self.context.as_dict(),
         }
 
+    def as_json(self) -> str:
+        """Return the JSON representation of this Event.
+
+        The result is cached and shared by everything that forwards the event,
+        the event must not be changed once it is fired.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            self._as_json = (
+                f'{{"event_type":{_json_dumps(self.event_type)},'
+                f'"data":{self.data_as_json()},'
+                f'"origin":{_json_dumps(str(self.origin))},'
+                f'"time_fired":{_json_dumps(self.time_fired)},'
+                f'"context":{_json_dumps(self.context.as_dict())}}}'
+            )
+        return self._as_json
+
+    def data_as_json(self) -> str:
+        """Return the cached JSON representation of the event data.
+
+        States in the data reuse their own cached JSON.
+
+        Async friendly.
+        """
+        if self._data_as_json is None:
+            if all(isinstance(key, str) for key in self.data) and any(
+                isinstance(value, State) for value in self.data.values()
+            ):
+                self._data_as_json = "{%s}" % ",".join(
+                    f"{_json_dumps(key)}:"
+                    + (
+                        value.as_json()
+                        if isinstance(value, State)
+                        else _json_dumps(value)
+                    )
+                    for key, value in self.data.items()
+                )
+            else:
+                self._data_as_json = _json_dumps(dict(self.data))
+        return self._data_as_json
+
     def __repr__(self) -> str:
         """Return the representation."""
         # pylint: disable=maybe-no-member
@@ -701,6 +766,7 @@ class State:
         "last_changed",
         "last_updated",
         "context",
+        "_as_json",
     ]
 
     def __init__(
@@ -736,6 +802,7 @@ class State:
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
+        self._as_json: Optional[str] = None
 
     @property
     def domain(self) -> str:
@@ -771,6 +838,18 @@ class State:
             "context": self.context.as_dict(),
         }
 
+    def as_json(self) -> str:
+        """Return the cached JSON representation of the State.
+
+        States are never changed, so the JSON is computed once and reused by
+        every API client the state is sent to.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            self._as_json = _json_dumps(self.as_dict())
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -830,11 +909,18 @@ class State:
 
 
 class StateMachine:
-    """Helper class that tracks the state of different entities."""
+    """Helper class that tracks the state of different entities.
+
+    Next to all states, the states are indexed per domain. The entity ids
+    ordered by entity id are cached per domain until an entity of that domain
+    is added or removed.
+    """
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
+        self._domain_index: Dict[str, Dict[str, State]] = {}
+        self._sorted_entity_ids: Dict[Optional[str], List[str]] = {}
         self._bus = bus
         self._loop = loop
 
@@ -854,27 +940,53 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states.keys())
 
-        domain_filter = domain_filter.lower()
+        return list(self._domain_index.get(domain_filter.lower(), ()))
+
+    @callback
+    def async_entity_ids_count(self, domain_filter: Optional[str] = None) -> int:
+        """Count the entity ids that are being tracked.
+
+        This method must be run in the event loop.
+        """
+        if domain_filter is None:
+            return len(self._states)
 
-        return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain == domain_filter
-        ]
+        return len(self._domain_index.get(domain_filter.lower(), ()))
 
-    def all(self) -> List[State]:
+    def all(self, domain_filter: Optional[str] = None) -> List[State]:
         """Create a list of all states."""
         return run_callback_threadsafe(  # type: ignore
-            self._loop, self.async_all
+            self._loop, self.async_all, domain_filter
         ).result()
 
     @callback
-    def async_all(self) -> List[State]:
+    def async_all(self, domain_filter: Optional[str] = None) -> List[State]:
         """Create a list of all states.
 
         This method must be run in the event loop.
         """
-        return list(self._states.values())
+        if domain_filter is None:
+            return list(self._states.values())
+
+        return list(self._domain_index.get(domain_filter.lower(), {}).values())
+
+    @callback
+    def async_sorted_states(self, domain_filter: Optional[str] = None) -> List[State]:
+        """Create a list of all states ordered by entity id.
+
+        This method must be run in the event loop.
+        """
+        if domain_filter is not None:
+            domain_filter = domain_filter.lower()
+
+        entity_ids = self._sorted_entity_ids.get(domain_filter)
+        if entity_ids is None:
+            entity_ids = self._sorted_entity_ids[domain_filter] = sorted(
+                self.async_entity_ids(domain_filter)
+            )
+
+        states = self._states
+        return [states[entity_id] for entity_id in entity_ids]
 
     def get(self, entity_id: str) -> Optional[State]:
         """Retrieve state of entity_id or None if not found.
@@ -914,6 +1026,12 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+        self._async_entities_changed(old_state.domain)
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -984,6 +1102,9 @@ class StateMachine:
 
         state = State(entity_id, new_state, attributes, last_changed, None, context)
         self._states[entity_id] = state
+        self._domain_index.setdefault(state.domain, {})[entity_id] = state
+        if old_state is None:
+            self._async_entities_changed(state.domain)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -991,6 +1112,12 @@ class StateMachine:
             context,
         )
 
+    @callback
+    def _async_entities_changed(self, domain: str) -> None:
+        """Drop the cached orders after an entity got added or removed."""
+        self._sorted_entity_ids.pop(domain, None)
+        self._sorted_entity_ids.pop(None, None)
+
 
 class Service:
     """Representation of a callable service."""
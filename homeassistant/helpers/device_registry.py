@@ -1,8 +1,8 @@
 """Provide a way to connect entities belonging to one device."""
 from asyncio import Event
-from collections import OrderedDict
+from collections import UserDict
 import logging
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 import uuid
 
 import attr
@@ -67,10 +67,103 @@ def format_mac(mac: str) -> str:
     return mac
 
 
+class DeviceRegistryItems(UserDict):
+    """Devices by id, indexed by identifier, connection, config entry and area.
+
+    The indexes are kept up to date on every change, so devices must be
+    added, replaced and removed through the mapping interface.
+    """
+
+    def __init__(self, devices: Optional[Dict[str, DeviceEntry]] = None) -> None:
+        """Initialize the container."""
+        self._identifiers: Dict[Tuple[str, str], str] = {}
+        self._connections: Dict[Tuple[str, str], str] = {}
+        self._config_entry_ids: Dict[str, Dict[str, DeviceEntry]] = {}
+        self._area_ids: Dict[str, Dict[str, DeviceEntry]] = {}
+        super().__init__(devices)
+
+    def __setitem__(self, device_id: str, device: DeviceEntry) -> None:
+        """Add or replace a device."""
+        if device_id in self.data:
+            self._unindex(device_id, self.data[device_id], device)
+        self.data[device_id] = device
+        for identifier in device.identifiers:
+            self._identifiers[identifier] = device_id
+        for connection in device.connections:
+            self._connections[connection] = device_id
+        for config_entry_id in device.config_entries:
+            self._config_entry_ids.setdefault(config_entry_id, {})[device_id] = device
+        if device.area_id is not None:
+            self._area_ids.setdefault(device.area_id, {})[device_id] = device
+
+    def __delitem__(self, device_id: str) -> None:
+        """Remove a device."""
+        self._unindex(device_id, self.data.pop(device_id))
+
+    def _unindex(
+        self,
+        device_id: str,
+        device: DeviceEntry,
+        new_device: Optional[DeviceEntry] = None,
+    ) -> None:
+        """Remove a device from the indexes.
+
+        Config entries and areas that the device replacing it still has are
+        kept, so the device keeps its position in the registry order there.
+        """
+        for index, keys in (
+            (self._identifiers, device.identifiers),
+            (self._connections, device.connections),
+        ):
+            for key in keys:
+                if index.get(key) == device_id:
+                    del index[key]
+
+        for index, keys, new_keys in (
+            (
+                self._config_entry_ids,
+                device.config_entries,
+                new_device.config_entries if new_device else (),
+            ),
+            (
+                self._area_ids,
+                () if device.area_id is None else (device.area_id,),
+                (new_device.area_id,) if new_device else (),
+            ),
+        ):
+            for key in keys:
+                if key in new_keys:
+                    continue
+                devices = index[key]
+                del devices[device_id]
+                if not devices:
+                    del index[key]
+
+    def get_device_id(self, identifiers: set, connections: set) -> Optional[str]:
+        """Return the id of the device with any of the identifiers or connections."""
+        for identifier in identifiers:
+            if identifier in self._identifiers:
+                return self._identifiers[identifier]
+        for connection in connections:
+            if connection in self._connections:
+                return self._connections[connection]
+        return None
+
+    def get_devices_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> List[DeviceEntry]:
+        """Return the devices of a config entry."""
+        return list(self._config_entry_ids.get(config_entry_id, {}).values())
+
+    def get_devices_for_area_id(self, area_id: str) -> List[DeviceEntry]:
+        """Return the devices in an area."""
+        return list(self._area_ids.get(area_id, {}).values())
+
+
 class DeviceRegistry:
     """Class to hold a registry of devices."""
 
-    devices: Dict[str, DeviceEntry]
+    devices: DeviceRegistryItems
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -87,12 +180,10 @@ class DeviceRegistry:
         self, identifiers: set, connections: set
     ) -> Optional[DeviceEntry]:
         """Check if device is registered."""
-        for device in self.devices.values():
-            if any(iden in device.identifiers for iden in identifiers) or any(
-                conn in device.connections for conn in connections
-            ):
-                return device
-        return None
+        device_id = self.devices.get_device_id(identifiers, connections)
+        if device_id is None:
+            return None
+        return self.devices[device_id]
 
     @callback
     def async_get_or_create(
@@ -275,7 +366,7 @@ class DeviceRegistry:
         """Load the device registry."""
         data = await self._store.async_load()
 
-        devices = OrderedDict()
+        devices = DeviceRegistryItems()
 
         if data is not None:
             for device in data["devices"]:
@@ -333,12 +424,12 @@ class DeviceRegistry:
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
         remove = []
-        for dev_id, device in self.devices.items():
+        for device in self.devices.get_devices_for_config_entry_id(config_entry_id):
             if device.config_entries == {config_entry_id}:
-                remove.append(dev_id)
+                remove.append(device.id)
             else:
                 self._async_update_device(
-                    dev_id, remove_config_entry_id=config_entry_id
+                    device.id, remove_config_entry_id=config_entry_id
                 )
         for dev_id in remove:
             self.async_remove_device(dev_id)
@@ -346,9 +437,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for device in self.devices.get_devices_for_area_id(area_id):
+            self._async_update_device(device.id, area_id=None)
 
 
 @bind_hass
@@ -377,7 +467,7 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    return registry.devices.get_devices_for_area_id(area_id)
 
 
 @callback
@@ -385,8 +475,4 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> List[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    return registry.devices.get_devices_for_config_entry_id(config_entry_id)
@@ -2,9 +2,14 @@
 import asyncio
 from contextvars import ContextVar
 from datetime import datetime, timedelta
+import heapq
 from logging import Logger
+from time import monotonic
 from types import ModuleType
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, cast
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple, cast
+import zlib
+
+import attr
 
 from homeassistant.const import DEVICE_DEFAULT_NAME
 from homeassistant.core import CALLBACK_TYPE, callback, split_entity_id, valid_entity_id
@@ -12,9 +17,10 @@ from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.helpers import config_validation as cv, service
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.util.async_ import run_callback_threadsafe
+import homeassistant.util.dt as dt_util
 
 from .entity_registry import DISABLED_INTEGRATION
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later, async_track_point_in_utc_time
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -24,6 +30,32 @@ if TYPE_CHECKING:
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
 PLATFORM_NOT_READY_RETRIES = 10
+# Spreads the polls of consecutive entities evenly over the scan interval
+POLL_PHASE_STEP = 0.6180339887498949
+
+
+@attr.s(slots=True)
+class PollStatistics:
+    """Statistics of the polls of the entities of a platform, in seconds."""
+
+    polls = attr.ib(type=int, default=0)
+    skipped = attr.ib(type=int, default=0)
+    lateness_total = attr.ib(type=float, default=0.0)
+    lateness_max = attr.ib(type=float, default=0.0)
+    duration_total = attr.ib(type=float, default=0.0)
+    duration_max = attr.ib(type=float, default=0.0)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the statistics with averages."""
+        polls = self.polls or 1
+        return {
+            "polls": self.polls,
+            "skipped": self.skipped,
+            "lateness_average": self.lateness_total / polls,
+            "lateness_max": self.lateness_max,
+            "duration_average": self.duration_total / polls,
+            "duration_max": self.duration_max,
+        }
 
 
 class EntityPlatform:
@@ -51,11 +83,19 @@ class EntityPlatform:
         self.config_entry = None
         self.entities: Dict[str, Entity] = {}  # pylint: disable=used-before-assignment
         self._tasks: List[asyncio.Future] = []
-        # Method to cancel the state change listener
+        # Method to cancel the next poll
         self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
+        self._next_poll: Optional[datetime] = None
+        # Entity id -> (when it is polled next, phase in the scan interval)
+        self._poll_schedule: Dict[str, List] = {}
+        # Heap of (when it is polled next, entity id), entries that no longer
+        # match the schedule are dropped when they are popped
+        self._poll_queue: List[Tuple[datetime, str]] = []
+        self._polls_running: Set[str] = set()
+        self._polled_entities_added = 0
+        self.poll_statistics = PollStatistics()
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
-        self._process_updates: Optional[asyncio.Lock] = None
 
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
@@ -293,16 +333,11 @@ class EntityPlatform:
 
         await asyncio.wait(tasks)
 
-        if self._async_unsub_polling is not None or not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            return
+        for entity_id, entity in self.entities.items():
+            if entity.should_poll and entity_id not in self._poll_schedule:
+                self._async_schedule_entity_polls(entity_id)
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,  # type: ignore
-            self.scan_interval,
-        )
+        self._async_schedule_next_poll()
 
     async def _async_add_entity(
         self, entity, update_before_add, entity_registry, device_registry
@@ -437,7 +472,7 @@ class EntityPlatform:
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        entity.async_on_remove(lambda: self._async_forget_entity(entity_id))
 
         await entity.async_internal_added_to_hass()
         await entity.async_added_to_hass()
@@ -460,20 +495,21 @@ class EntityPlatform:
 
         await asyncio.wait(tasks)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_remove_entity(self, entity_id: str) -> None:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if self._async_unsub_polling is not None and not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
+    @callback
+    def _async_forget_entity(self, entity_id: str) -> None:
+        """Forget a removed entity and stop polling when none are left."""
+        self.entities.pop(entity_id)
+        self._poll_schedule.pop(entity_id, None)
+
+        if self._async_unsub_polling is not None and not self._poll_schedule:
             self._async_unsub_polling()
             self._async_unsub_polling = None
+            self._next_poll = None
+            self._poll_queue.clear()
 
     async def async_extract_from_service(self, service_call, expand_group=True):
         """Extract all known and available entities from a service call.
@@ -502,34 +538,110 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
+    @callback
+    def _async_schedule_entity_polls(self, entity_id: str) -> None:
+        """Give an entity its own phase in the scan interval.
+
+        Phases of consecutive entities are spread evenly, the phase of the
+        first entity is a deterministic jitter per platform. So are platforms
+        with the same scan interval polled at different times.
+        """
+        jitter = zlib.crc32(f"{self.domain}.{self.platform_name}".encode()) / 2 ** 32
+        phase = (jitter + self._polled_entities_added * POLL_PHASE_STEP) % 1
+        self._polled_entities_added += 1
+        phase *= self.scan_interval.total_seconds()
+        poll_time = self._next_poll_time(phase)
+        self._poll_schedule[entity_id] = [poll_time, phase]
+        heapq.heappush(self._poll_queue, (poll_time, entity_id))
+
+    def _next_poll_time(self, phase: float) -> datetime:
+        """Return the first time after now at phase in the scan interval."""
+        interval = self.scan_interval.total_seconds()
+        timestamp = dt_util.utcnow().timestamp()
+        return dt_util.utc_from_timestamp(
+            timestamp - (timestamp - phase) % interval + interval
+        )
+
+    @callback
+    def _async_schedule_next_poll(self) -> None:
+        """Schedule the poll of the entity that is polled first."""
+        if not self._poll_queue:
+            return
+
+        next_poll = self._poll_queue[0][0]
+        if self._next_poll is not None and self._next_poll <= next_poll:
+            return
+
+        if self._async_unsub_polling is not None:
+            self._async_unsub_polling()
+        self._next_poll = next_poll
+        self._async_unsub_polling = async_track_point_in_utc_time(
+            self.hass, self._update_entity_states, next_poll
+        )
+
+    @callback
+    def _update_entity_states(self, now: datetime) -> None:
+        """Update the states of the polling entities that are due.
 
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+        An entity is skipped while its previous update is still running.
+        To protect from flooding the executor, the parallel updates of sync
+        entities are limited by the entities themselves.
 
         This method must be run in the event loop.
         """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
+        self._async_unsub_polling = None
+        self._next_poll = None
+
+        due = []
+        while self._poll_queue and self._poll_queue[0][0] <= now:
+            poll_time, entity_id = heapq.heappop(self._poll_queue)
+            schedule = self._poll_schedule.get(entity_id)
+            if schedule is None or schedule[0] != poll_time:
+                continue
+            schedule[0] = self._next_poll_time(schedule[1])
+            due.append((poll_time, entity_id))
+
+        for poll_time, entity_id in due:
+            heapq.heappush(
+                self._poll_queue, (self._poll_schedule[entity_id][0], entity_id)
             )
-            return
 
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))  # type: ignore
+            entity = self.entities[entity_id]
+            if not entity.should_poll:
+                continue
+
+            if entity_id in self._polls_running:
+                self.poll_statistics.skipped += 1
+                self.logger.warning(
+                    "Updating %s took longer than the scheduled update interval %s",
+                    entity_id,
+                    self.scan_interval,
+                )
+                continue
+
+            lateness = (now - poll_time).total_seconds()
+            self.poll_statistics.lateness_total += lateness
+            self.poll_statistics.lateness_max = max(
+                self.poll_statistics.lateness_max, lateness
+            )
+            self._polls_running.add(entity_id)
+            self.hass.async_create_task(self._async_poll_entity(entity_id, entity))
 
-            if tasks:
-                await asyncio.wait(tasks)
+        self._async_schedule_next_poll()
+
+    async def _async_poll_entity(self, entity_id: str, entity: "Entity") -> None:
+        """Update the state of a polling entity and time it."""
+        start = monotonic()
+        try:
+            await entity.async_update_ha_state(True)
+        finally:
+            self._polls_running.discard(entity_id)
+            duration = monotonic() - start
+            self.poll_statistics.polls += 1
+            self.poll_statistics.duration_total += duration
+            self.poll_statistics.duration_max = max(
+                self.poll_statistics.duration_max, duration
+            )
 
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
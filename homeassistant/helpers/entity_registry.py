@@ -8,10 +8,20 @@ registered. Registering a new entity while a timer is in progress resets the
 timer.
 """
 import asyncio
-from collections import OrderedDict
+from collections import UserDict
 from itertools import chain
 import logging
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 import attr
 
@@ -98,13 +108,85 @@ class RegistryEntry:
         return self.disabled_by is not None
 
 
+class EntityRegistryItems(UserDict):
+    """Registry entries by entity_id, indexed by unique id, device and entry.
+
+    The indexes are kept up to date on every change, so entries must be
+    added, replaced and removed through the mapping interface.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, RegistryEntry]] = None) -> None:
+        """Initialize the container."""
+        self._entity_ids: Dict[Tuple[str, str, str], str] = {}
+        self._device_ids: Dict[str, Dict[str, RegistryEntry]] = {}
+        self._config_entry_ids: Dict[str, Dict[str, RegistryEntry]] = {}
+        super().__init__(entries)
+
+    def __setitem__(self, entity_id: str, entry: RegistryEntry) -> None:
+        """Add or replace an entry."""
+        if entity_id in self.data:
+            self._unindex(entity_id, self.data[entity_id], entry)
+        self.data[entity_id] = entry
+        self._entity_ids[(entry.domain, entry.platform, entry.unique_id)] = entity_id
+        if entry.device_id is not None:
+            self._device_ids.setdefault(entry.device_id, {})[entity_id] = entry
+        if entry.config_entry_id is not None:
+            self._config_entry_ids.setdefault(entry.config_entry_id, {})[
+                entity_id
+            ] = entry
+
+    def __delitem__(self, entity_id: str) -> None:
+        """Remove an entry."""
+        self._unindex(entity_id, self.data.pop(entity_id))
+
+    def _unindex(
+        self,
+        entity_id: str,
+        entry: RegistryEntry,
+        new_entry: Optional[RegistryEntry] = None,
+    ) -> None:
+        """Remove an entry from the indexes.
+
+        Keys that the entry replacing it still has are kept, so the entry
+        keeps its position in the registry order there.
+        """
+        unique_key = (entry.domain, entry.platform, entry.unique_id)
+        if self._entity_ids.get(unique_key) == entity_id:
+            del self._entity_ids[unique_key]
+        for index, attribute in (
+            (self._device_ids, "device_id"),
+            (self._config_entry_ids, "config_entry_id"),
+        ):
+            key = getattr(entry, attribute)
+            if key is None or getattr(new_entry, attribute, None) == key:
+                continue
+            entries = index[key]
+            del entries[entity_id]
+            if not entries:
+                del index[key]
+
+    def get_entity_id(self, key: Tuple[str, str, str]) -> Optional[str]:
+        """Return the entity_id registered for a domain, platform and unique id."""
+        return self._entity_ids.get(key)
+
+    def get_entries_for_device_id(self, device_id: str) -> List[RegistryEntry]:
+        """Return the entries of a device."""
+        return list(self._device_ids.get(device_id, {}).values())
+
+    def get_entries_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> List[RegistryEntry]:
+        """Return the entries of a config entry."""
+        return list(self._config_entry_ids.get(config_entry_id, {}).values())
+
+
 class EntityRegistry:
     """Class to hold a registry of entities."""
 
     def __init__(self, hass: HomeAssistantType):
         """Initialize the registry."""
         self.hass = hass
-        self.entities: Dict[str, RegistryEntry]
+        self.entities: EntityRegistryItems
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
@@ -125,14 +207,7 @@ class EntityRegistry:
         self, domain: str, platform: str, unique_id: str
     ) -> Optional[str]:
         """Check if an entity_id is currently registered."""
-        for entity in self.entities.values():
-            if (
-                entity.domain == domain
-                and entity.platform == platform
-                and entity.unique_id == unique_id
-            ):
-                return entity.entity_id
-        return None
+        return self.entities.get_entity_id((domain, platform, unique_id))
 
     @callback
     def async_generate_entity_id(
@@ -338,20 +413,13 @@ class EntityRegistry:
             entity_id = changes["entity_id"] = new_entity_id
 
         if new_unique_id is not _UNDEF:
-            conflict = next(
-                (
-                    entity
-                    for entity in self.entities.values()
-                    if entity.unique_id == new_unique_id
-                    and entity.domain == old.domain
-                    and entity.platform == old.platform
-                ),
-                None,
+            conflict_entity_id = self.async_get_entity_id(
+                old.domain, old.platform, new_unique_id
             )
-            if conflict:
+            if conflict_entity_id:
                 raise ValueError(
                     f"Unique id '{new_unique_id}' is already in use by "
-                    f"'{conflict.entity_id}'"
+                    f"'{conflict_entity_id}'"
                 )
             changes["unique_id"] = new_unique_id
 
@@ -381,7 +449,7 @@ class EntityRegistry:
             old_conf_load_func=load_yaml,
             old_conf_migrate_func=_async_migrate,
         )
-        entities: Dict[str, RegistryEntry] = OrderedDict()
+        entities = EntityRegistryItems()
 
         if data is not None:
             for entity in data["entities"]:
@@ -439,12 +507,8 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
-            self.async_remove(entity_id)
+        for entry in self.entities.get_entries_for_config_entry_id(config_entry):
+            self.async_remove(entry.entity_id)
 
 
 @bind_hass
@@ -475,9 +539,7 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry for entry in registry.entities.values() if entry.device_id == device_id
-    ]
+    return registry.entities.get_entries_for_device_id(device_id)
 
 
 @callback
@@ -485,11 +547,7 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    return registry.entities.get_entries_for_config_entry_id(config_entry_id)
 
 
 async def _async_migrate(entities: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
@@ -570,10 +628,7 @@ async def async_migrate_entries(
     """Migrator of unique IDs."""
     ent_reg = await async_get_registry(hass)
 
-    for entry in ent_reg.entities.values():
-        if entry.config_entry_id != config_entry_id:
-            continue
-
+    for entry in ent_reg.entities.get_entries_for_config_entry_id(config_entry_id):
         updates = entry_callback(entry)
 
         if updates is not None:
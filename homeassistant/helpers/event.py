@@ -1,7 +1,10 @@
 """Helpers for listening to events."""
 from datetime import datetime, timedelta
 import functools as ft
-from typing import Any, Callable, Dict, Iterable, Optional, Union, cast
+import heapq
+from itertools import chain, count
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
 
 import attr
 
@@ -14,13 +17,27 @@ from homeassistant.const import (
     SUN_EVENT_SUNRISE,
     SUN_EVENT_SUNSET,
 )
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.sun import get_astral_event_next
-from homeassistant.helpers.template import Template
+from homeassistant.helpers.template import RenderInfo, Template
+from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+DATA_POINT_IN_TIME_SCHEDULER = "event_point_in_time_scheduler"
+DATA_STATE_CHANGE_DISPATCHER = "event_state_change_dispatcher"
+
+_LOGGER = logging.getLogger(__name__)
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -49,6 +66,110 @@ def threaded_listener_factory(async_factory: Callable[..., Any]) -> CALLBACK_TYP
     return factory
 
 
+class _StateChangeDispatcher:
+    """Dispatch state changed events to listeners of a specific entity.
+
+    A single state changed listener looks up the listeners of the changed
+    entity and its domain, so a state write only runs the listeners
+    interested in it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._listeners: Dict[str, List[Callable[[Event], None]]] = {}
+        self._domain_listeners: Dict[str, List[Callable[[Event], None]]] = {}
+        self._unsub_state: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_add(
+        self,
+        entity_ids: Iterable[str],
+        listener: Callable[[Event], None],
+        domains: Iterable[str] = (),
+    ) -> CALLBACK_TYPE:
+        """Add a listener for state changes of entity_ids and domains."""
+        entity_ids = tuple(dict.fromkeys(entity_ids))
+        domains = tuple(dict.fromkeys(domains))
+
+        for entity_id in entity_ids:
+            self._listeners.setdefault(entity_id, []).append(listener)
+
+        for domain in domains:
+            self._domain_listeners.setdefault(domain, []).append(listener)
+
+        if self._unsub_state is None:
+            self._unsub_state = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed
+            )
+
+        removed = False
+
+        @callback
+        def async_remove() -> None:
+            """Remove the listener."""
+            nonlocal removed
+            if removed:
+                return
+            removed = True
+
+            for index, keys in (
+                (self._listeners, entity_ids),
+                (self._domain_listeners, domains),
+            ):
+                for key in keys:
+                    listeners = index[key]
+                    listeners.remove(listener)
+                    if not listeners:
+                        del index[key]
+
+            if (
+                not self._listeners
+                and not self._domain_listeners
+                and self._unsub_state is not None
+            ):
+                self._unsub_state()
+                self._unsub_state = None
+
+        return async_remove
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Run the listeners of the changed entity."""
+        entity_id = event.data.get("entity_id")
+        listeners = self._listeners.get(entity_id)
+
+        if self._domain_listeners:
+            domain_listeners = self._domain_listeners.get(split_entity_id(entity_id)[0])
+            if domain_listeners:
+                # A listener can be interested in both the entity and domain
+                listeners = list(
+                    dict.fromkeys(chain(listeners or (), domain_listeners))
+                )
+
+        if not listeners:
+            return
+
+        for listener in list(listeners):
+            try:
+                listener(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running state change listener %s", listener)
+
+
+@callback
+def _async_get_state_change_dispatcher(hass: HomeAssistant) -> _StateChangeDispatcher:
+    """Return the state change dispatcher for this instance."""
+    dispatcher: Optional[_StateChangeDispatcher] = hass.data.get(
+        DATA_STATE_CHANGE_DISPATCHER
+    )
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_STATE_CHANGE_DISPATCHER] = _StateChangeDispatcher(
+            hass
+        )
+    return dispatcher
+
+
 @callback
 @bind_hass
 def async_track_state_change(
@@ -70,23 +191,9 @@ def async_track_state_change(
     match_from_state = _process_state_match(from_state)
     match_to_state = _process_state_match(to_state)
 
-    # Ensure it is a lowercase list with entity ids we want to match on
-    if entity_ids == MATCH_ALL:
-        pass
-    elif isinstance(entity_ids, str):
-        entity_ids = (entity_ids.lower(),)
-    else:
-        entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
-
     @callback
     def state_change_listener(event: Event) -> None:
         """Handle specific state changes."""
-        if (
-            entity_ids != MATCH_ALL
-            and cast(str, event.data.get("entity_id")) not in entity_ids
-        ):
-            return
-
         old_state = event.data.get("old_state")
         if old_state is not None:
             old_state = old_state.state
@@ -103,7 +210,18 @@ def async_track_state_change(
                 event.data.get("new_state"),
             )
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+
+    # Ensure it is a lowercase list with entity ids we want to match on
+    if isinstance(entity_ids, str):
+        entity_ids = (entity_ids.lower(),)
+    else:
+        entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
+
+    return _async_get_state_change_dispatcher(hass).async_add(
+        entity_ids, state_change_listener
+    )
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
@@ -118,16 +236,20 @@ def async_track_template(
     variables: Optional[Dict[str, Any]] = None,
 ) -> CALLBACK_TYPE:
     """Add a listener that track state changes with template condition."""
-    from . import condition
-
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
 
     @callback
-    def template_condition_listener(entity_id: str, from_s: State, to_s: State) -> None:
+    def template_condition_listener(
+        entity_id: str, from_s: State, to_s: State, render_infos: List[RenderInfo]
+    ) -> None:
         """Check if condition is correct and run action."""
         nonlocal already_triggered
-        template_result = condition.async_template(hass, template, variables)
+        try:
+            template_result = render_infos[0].result.lower() == "true"
+        except TemplateError as ex:
+            _LOGGER.error("Error during template condition: %s", ex)
+            template_result = False
 
         # Check to see if template returns true
         if template_result and not already_triggered:
@@ -136,14 +258,125 @@ def async_track_template(
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(
-        hass, template.extract_entities(variables), template_condition_listener
+    return async_track_template_renders(
+        hass, [template], template_condition_listener, variables
     )
 
 
 track_template = threaded_listener_factory(async_track_template)
 
 
+def _render_info_dependencies(render_info: RenderInfo) -> Any:
+    """Return MATCH_ALL or the entity_ids and domains a render depends on."""
+    if render_info.all_states:
+        return MATCH_ALL
+
+    if render_info.entities or render_info.domains:
+        return render_info.entities, render_info.domains
+
+    # Templates without Jinja code always render the same
+    if not render_info.template.extract_entities():
+        return frozenset(), frozenset()
+
+    # Renders that read no state, use the time or failed early are rendered
+    # again on every state change, like before any state was tracked.
+    return MATCH_ALL
+
+
+@callback
+@bind_hass
+def async_track_template_renders(
+    hass: HomeAssistant,
+    templates: Iterable[Template],
+    action: Callable[[str, State, State, List[RenderInfo]], None],
+    variables: TemplateVarsType = None,
+) -> CALLBACK_TYPE:
+    """Track the entities and domains the templates read while rendering.
+
+    The templates are rendered right away to find what they depend on. A
+    change of one of those entities renders the templates again, moves the
+    listeners to what was read this time and runs action. The action gets
+    the renders of the templates, in order, so it does not have to render
+    them again.
+    """
+    templates = list(templates)
+    dispatcher = _async_get_state_change_dispatcher(hass)
+    dependencies = None
+    unsub: Optional[CALLBACK_TYPE] = None
+    removed = False
+
+    @callback
+    def state_changed_listener(event: Event) -> None:
+        """Render the templates again and run action."""
+        if removed:
+            return
+        render_infos = async_refresh_dependencies()
+        hass.async_run_job(
+            action,
+            event.data.get("entity_id"),
+            event.data.get("old_state"),
+            event.data.get("new_state"),
+            render_infos,
+        )
+
+    @callback
+    def async_refresh_dependencies() -> List[RenderInfo]:
+        """Render the templates and listen to what they read."""
+        nonlocal dependencies, unsub
+        render_infos = [
+            template.async_render_to_info(variables) for template in templates
+        ]
+        entity_ids: Set[str] = set()
+        domains: Set[str] = set()
+        new_dependencies = None
+
+        for render_info in render_infos:
+            template_dependencies = _render_info_dependencies(render_info)
+            if template_dependencies == MATCH_ALL:
+                new_dependencies = MATCH_ALL
+                break
+            entity_ids.update(template_dependencies[0])
+            domains.update(template_dependencies[1])
+        else:
+            new_dependencies = (
+                frozenset(entity_id.lower() for entity_id in entity_ids),
+                frozenset(domains),
+            )
+
+        if new_dependencies == dependencies:
+            return render_infos
+
+        if unsub is not None:
+            unsub()  # pylint: disable=not-callable
+            unsub = None
+
+        dependencies = new_dependencies
+
+        if dependencies == MATCH_ALL:
+            unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed_listener)
+        elif dependencies[0] or dependencies[1]:
+            unsub = dispatcher.async_add(
+                dependencies[0], state_changed_listener, dependencies[1]
+            )
+
+        return render_infos
+
+    async_refresh_dependencies()
+
+    @callback
+    def async_remove() -> None:
+        """Remove the listener."""
+        nonlocal removed
+        removed = True
+        if unsub is not None:
+            unsub()  # pylint: disable=not-callable
+
+    return async_remove
+
+
+track_template_renders = threaded_listener_factory(async_track_template_renders)
+
+
 @callback
 @bind_hass
 def async_track_same_state(
@@ -222,6 +455,107 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class _PointInTimeScheduler:
+    """Central scheduler for point in time listeners.
+
+    Pending deadlines are kept in a heap and a single time changed listener
+    pops the ones that are due, so the cost of a tick does not depend on the
+    number of pending timers.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap: List[List[Any]] = []
+        self._counter = count()
+        self._cancelled = 0
+        self._unsub_time: Optional[CALLBACK_TYPE] = None
+
+    def __len__(self) -> int:
+        """Return the number of pending listeners."""
+        return len(self._heap) - self._cancelled
+
+    @callback
+    def async_schedule(
+        self, point_in_time: datetime, action: Callable[..., Any]
+    ) -> CALLBACK_TYPE:
+        """Schedule action to run at point_in_time (UTC)."""
+        # The last item tells if the entry is still in the heap
+        entry = [point_in_time, next(self._counter), action, True]
+        heapq.heappush(self._heap, entry)
+
+        if self._unsub_time is None:
+            self._unsub_time = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        @callback
+        def async_cancel() -> None:
+            """Cancel the scheduled action."""
+            if entry[2] is None:
+                return
+            entry[2] = None
+            if entry[3]:
+                self._cancelled += 1
+                self._async_compact()
+
+        return async_cancel
+
+    @callback
+    def _async_compact(self) -> None:
+        """Drop cancelled entries once they make up most of the heap."""
+        if self._cancelled < 64 or self._cancelled * 2 < len(self._heap):
+            return
+        self._heap = [entry for entry in self._heap if entry[2] is not None]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Run all actions that are due."""
+        now = event.data[ATTR_NOW]
+        heap = self._heap
+        due = []
+
+        # Collect first so listeners scheduled by the actions wait for the
+        # next tick, like a freshly added bus listener would.
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            entry[3] = False
+            if entry[2] is None:
+                self._cancelled -= 1
+            else:
+                due.append(entry)
+
+        if not heap and self._unsub_time is not None:
+            self._unsub_time()
+            self._unsub_time = None
+
+        for entry in due:
+            action = entry[2]
+            # Cancelled by an action that ran earlier in this tick
+            if action is None:
+                continue
+            entry[2] = None
+            try:
+                self.hass.async_run_job(action, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running point in time listener %s", action)
+
+
+@callback
+def _async_get_scheduler(hass: HomeAssistant) -> _PointInTimeScheduler:
+    """Return the point in time scheduler for this instance."""
+    scheduler: Optional[_PointInTimeScheduler] = hass.data.get(
+        DATA_POINT_IN_TIME_SCHEDULER
+    )
+    if scheduler is None:
+        scheduler = hass.data[DATA_POINT_IN_TIME_SCHEDULER] = _PointInTimeScheduler(
+            hass
+        )
+    return scheduler
+
+
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
@@ -231,27 +565,7 @@ def async_track_point_in_utc_time(
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
-    @callback
-    def point_in_time_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, "run"):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        setattr(point_in_time_listener, "run", True)
-        async_unsub()
-
-        hass.async_run_job(action, now)
-
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, point_in_time_listener)
-
-    return async_unsub
+    return _async_get_scheduler(hass).async_schedule(point_in_time, action)
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -4,9 +4,26 @@ import json
 import logging
 from typing import Any
 
+from homeassistant.util.json import json_dumps as util_json_dumps
+
 _LOGGER = logging.getLogger(__name__)
 
 
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Raise TypeError for other objects.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
 
@@ -14,13 +31,25 @@ class JSONEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
         """Convert Home Assistant objects.
 
-        Hand other objects to the original method.
+        Raise TypeError for other objects.
         """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
-
-        return json.JSONEncoder.default(self, o)
+        return json_encoder_default(o)
+
+
+def json_dumps(
+    data: Any,
+    *,
+    sort_keys: bool = False,
+    pretty: bool = False,
+    allow_nan: bool = True,
+    compact: bool = False,
+) -> str:
+    """Serialize data that can contain Home Assistant objects to JSON."""
+    return util_json_dumps(
+        data,
+        default=json_encoder_default,
+        sort_keys=sort_keys,
+        pretty=pretty,
+        allow_nan=allow_nan,
+        compact=compact,
+    )
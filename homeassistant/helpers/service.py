@@ -324,54 +324,40 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     else:
         data = call
 
-    # Check the permissions
-
     # A list with entities to call the service on.
     entity_candidates = []
 
-    if entity_perms is None:
-        for platform in platforms:
-            if target_all_entities:
-                entity_candidates.extend(platform.entities.values())
-            else:
-                entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
-                    ]
-                )
-
-    elif target_all_entities:
-        # If we target all entities, we will select all entities the user
-        # is allowed to control.
-        for platform in platforms:
+    for platform in platforms:
+        platform_entities = platform.entities
+        if target_all_entities:
+            entity_candidates.extend(platform_entities.values())
+        else:
+            # Platforms store their entities by entity_id, so look the targeted
+            # entities up instead of walking every entity of the domain.
             entity_candidates.extend(
-                [
-                    entity
-                    for entity in platform.entities.values()
-                    if entity_perms(entity.entity_id, POLICY_CONTROL)
-                ]
+                platform_entities[entity_id]
+                for entity_id in entity_ids
+                if entity_id in platform_entities
             )
 
-    else:
-        for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in entity_ids:
-                    continue
-
-                if not entity_perms(entity.entity_id, POLICY_CONTROL):
-                    raise Unauthorized(
-                        context=call.context,
-                        entity_id=entity.entity_id,
-                        permission=POLICY_CONTROL,
-                    )
-
-                platform_entities.append(entity)
+    # Check the permissions
+    if entity_perms is not None and target_all_entities:
+        # If we target all entities, we will select all entities the user
+        # is allowed to control.
+        entity_candidates = [
+            entity
+            for entity in entity_candidates
+            if entity_perms(entity.entity_id, POLICY_CONTROL)
+        ]
 
-            entity_candidates.extend(platform_entities)
+    elif entity_perms is not None:
+        for entity in entity_candidates:
+            if not entity_perms(entity.entity_id, POLICY_CONTROL):
+                raise Unauthorized(
+                    context=call.context,
+                    entity_id=entity.entity_id,
+                    permission=POLICY_CONTROL,
+                )
 
     if not target_all_entities:
         for entity in entity_candidates:
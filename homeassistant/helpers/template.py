@@ -7,7 +7,7 @@ import logging
 import math
 import random
 import re
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 import jinja2
 from jinja2 import contextfilter, contextfunction
@@ -39,6 +39,8 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
+# Attributes Jinja looks up on every callable it calls
+_RESERVED_NAMES = {"contextfunction", "evalcontextfunction", "environmentfunction"}
 
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
@@ -127,6 +129,15 @@ class RenderInfo:
         self._all_states = False
         self._domains = []
         self._entities = []
+        # The states looked up during the render, None if it did not exist
+        self._states = {}
+        # Set if the result depends on more than states, like the time
+        self._volatile = False
+        self.cacheable = False
+        # What the render depends on, set once frozen
+        self.all_states = False
+        self.entities: FrozenSet[str] = frozenset()
+        self.domains: FrozenSet[str] = frozenset()
 
     def filter(self, entity_id: str) -> bool:
         """Template should re-render if the state changes."""
@@ -146,7 +157,24 @@ class RenderInfo:
             raise self._exception
         return self._result
 
+    def is_current(self) -> bool:
+        """Return if none of the states read during the render changed."""
+        get_state = self.template.hass.states.get
+        return all(
+            get_state(entity_id) is state for entity_id, state in self._states.items()
+        )
+
     def _freeze(self) -> None:
+        # Renders that iterate over states can be affected by any new entity
+        self.cacheable = (
+            self._exception is None
+            and not self._volatile
+            and not self._all_states
+            and not self._domains
+        )
+        self.all_states = self._all_states
+        self.entities = frozenset(self._entities).union(self._states)
+        self.domains = frozenset(self._domains)
         self._entities = frozenset(self._entities)
         if self._all_states:
             # Leave lifecycle_filter as True
@@ -160,7 +188,12 @@ class RenderInfo:
 
 
 class Template:
-    """Class to hold a template and manage caching and rendering."""
+    """Class to hold a template and manage caching and rendering.
+
+    The last render is remembered together with the variables and the states
+    it read. Rendering again with the same variables returns the remembered
+    result as long as none of those states changed.
+    """
 
     def __init__(self, template, hass=None):
         """Instantiate a template."""
@@ -170,7 +203,10 @@ class Template:
         self.template: str = template
         self._compiled_code = None
         self._compiled = None
+        self._last_render: Optional[Tuple[Dict[str, Any], RenderInfo]] = None
         self.hass = hass
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     @property
     def _env(self):
@@ -212,13 +248,20 @@ class Template:
 
         This method must be run in the event loop.
         """
-        compiled = self._compiled or self._ensure_compiled()
-
         if variables is not None:
             kwargs.update(variables)
 
+        # Nested in the render of another template, which collects the states
+        if self.hass is None or _RENDER_INFO in self.hass.data:
+            return self._async_render(kwargs)
+
+        return self.async_render_to_info(kwargs).result
+
+    def _async_render(self, variables: Dict[str, Any]) -> str:
+        compiled = self._compiled or self._ensure_compiled()
+
         try:
-            return compiled.render(kwargs).strip()
+            return compiled.render(variables).strip()
         except jinja2.TemplateError as err:
             raise TemplateError(err)
 
@@ -228,15 +271,31 @@ class Template:
     ) -> RenderInfo:
         """Render the template and collect an entity filter."""
         assert self.hass and _RENDER_INFO not in self.hass.data
+
+        if variables is not None:
+            kwargs.update(variables)
+
+        last_render = self._last_render
+        if (
+            last_render is not None
+            and last_render[0] == kwargs
+            and last_render[1].is_current()
+        ):
+            self.cache_hits += 1
+            return last_render[1]
+        self.cache_misses += 1
+
         render_info = self.hass.data[_RENDER_INFO] = RenderInfo(self)
         # pylint: disable=protected-access
         try:
-            render_info._result = self.async_render(variables, **kwargs)
+            render_info._result = self._async_render(kwargs)
         except TemplateError as ex:
             render_info._exception = ex
         finally:
             del self.hass.data[_RENDER_INFO]
             render_info._freeze()
+
+        self._last_render = (kwargs, render_info) if render_info.cacheable else None
         return render_info
 
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
@@ -328,6 +387,8 @@ class AllStates:
             if not valid_entity_id(name):
                 raise TemplateError(f"Invalid entity ID '{name}'")
             return _get_state(self._hass, name)
+        if name in _RESERVED_NAMES:
+            return None
         if not valid_entity_id(f"{name}.entity"):
             raise TemplateError(f"Invalid domain name '{name}'")
         return DomainStates(self._hass, name)
@@ -343,15 +404,13 @@ class AllStates:
         self._collect_all()
         return iter(
             _wrap_state(self._hass, state)
-            for state in sorted(
-                self._hass.states.async_all(), key=lambda state: state.entity_id
-            )
+            for state in self._hass.states.async_sorted_states()
         )
 
     def __len__(self):
         """Return number of states."""
         self._collect_all()
-        return len(self._hass.states.async_entity_ids())
+        return self._hass.states.async_entity_ids_count()
 
     def __call__(self, entity_id):
         """Return the states."""
@@ -388,20 +447,14 @@ class DomainStates:
         """Return the iteration over all the states."""
         self._collect_domain()
         return iter(
-            sorted(
-                (
-                    _wrap_state(self._hass, state)
-                    for state in self._hass.states.async_all()
-                    if state.domain == self._domain
-                ),
-                key=lambda state: state.entity_id,
-            )
+            _wrap_state(self._hass, state)
+            for state in self._hass.states.async_sorted_states(self._domain)
         )
 
     def __len__(self) -> int:
         """Return number of states."""
         self._collect_domain()
-        return len(self._hass.states.async_entity_ids(self._domain))
+        return self._hass.states.async_entity_ids_count(self._domain)
 
     def __repr__(self) -> str:
         """Representation of Domain States."""
@@ -468,6 +521,10 @@ def _wrap_state(hass, state):
 
 def _get_state(hass, entity_id):
     state = hass.states.get(entity_id)
+    render_info = hass.data.get(_RENDER_INFO)
+    if render_info is not None:
+        # pylint: disable=protected-access
+        render_info._states[entity_id] = state
     if state is None:
         # Only need to collect if none, if not none collect first actual
         # access to the state properties in the state wrapper.
@@ -984,11 +1041,29 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
             return contextfunction(wrapper)
 
+        def volatile(func):
+            """Wrap function whose result can change without a state change."""
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                render_info = hass.data.get(_RENDER_INFO)
+                if render_info is not None:
+                    # pylint: disable=protected-access
+                    render_info._volatile = True
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        self.globals["now"] = volatile(dt_util.now)
+        self.globals["utcnow"] = volatile(dt_util.utcnow)
+        self.globals["relative_time"] = volatile(dt_util.get_age)
+        self.filters["random"] = volatile(random_every_time)
         self.globals["expand"] = hassfunction(expand)
         self.filters["expand"] = contextfilter(self.globals["expand"])
-        self.globals["closest"] = hassfunction(closest)
-        self.filters["closest"] = contextfilter(hassfunction(closest_filter))
-        self.globals["distance"] = hassfunction(distance)
+        # The home location is part of the result
+        self.globals["closest"] = volatile(hassfunction(closest))
+        self.filters["closest"] = volatile(contextfilter(hassfunction(closest_filter)))
+        self.globals["distance"] = volatile(hassfunction(distance))
         self.globals["is_state"] = hassfunction(is_state)
         self.globals["is_state_attr"] = hassfunction(is_state_attr)
         self.globals["state_attr"] = hassfunction(state_attr)
@@ -2,15 +2,27 @@
 import argparse
 import asyncio
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+import tempfile
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+)
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import (
+    JSON_BACKEND_JSON,
+    JSON_BACKEND_ORJSON,
+    set_json_backend,
+)
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -28,9 +40,15 @@ def run(args):
     parser = argparse.ArgumentParser(description=("Run a Home Assistant benchmark."))
     parser.add_argument("name", choices=BENCHMARKS)
     parser.add_argument("--script", choices=["benchmark"])
+    parser.add_argument(
+        "--json-backend", choices=[JSON_BACKEND_JSON, JSON_BACKEND_ORJSON]
+    )
 
     args = parser.parse_args()
 
+    if args.json_backend:
+        set_json_backend(args.json_backend)
+
     bench = BENCHMARKS[args.name]
 
     print("Using event loop:", asyncio.get_event_loop_policy().__module__)
@@ -108,6 +126,30 @@ async def time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def point_in_time_tick(hass):
+    """Run a thousand time ticks with 10k pending point in time listeners."""
+    now = dt_util.utcnow()
+    event_data = {ATTR_NOW: now}
+
+    @core.callback
+    def listener(_):
+        """Handle point in time."""
+
+    for _ in range(10 ** 4):
+        hass.helpers.event.async_track_point_in_utc_time(
+            listener, now + timedelta(days=1)
+        )
+
+    start = timer()
+
+    for _ in range(10 ** 3):
+        hass.bus.async_fire(EVENT_TIME_CHANGED, event_data)
+        await hass.async_block_till_done()
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper."""
@@ -168,9 +210,11 @@ async def _logbook_filtering(hass, last_changed, last_updated):
         "last_changed": last_changed,
     }
 
-    event = core.Event(
-        EVENT_STATE_CHANGED,
-        {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+    event = logbook.LazyEventPartialState.from_event(
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+        )
     )
 
     def yield_events(event):
@@ -187,6 +231,158 @@ async def _logbook_filtering(hass, last_changed, last_updated):
     return timer() - start
 
 
+@benchmark
+async def recorder_sqlite_file(hass):
+    """Record 100k state changes to a SQLite database file."""
+    return await _recorder_write_states(hass, "sqlite:///{config_dir}/benchmark.db")
+
+
+@benchmark
+async def recorder_sqlite_memory(hass):
+    """Record 100k state changes to an in memory SQLite database."""
+    return await _recorder_write_states(hass, "sqlite://")
+
+
+async def _recorder_write_states(hass, db_url):
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        return await _recorder_write_states_db(
+            hass, db_url.format(config_dir=config_dir)
+        )
+
+
+async def _recorder_write_states_db(hass, db_url):
+    from homeassistant.components import recorder
+    from homeassistant.setup import async_setup_component
+
+    await async_setup_component(
+        hass,
+        recorder.DOMAIN,
+        {
+            recorder.DOMAIN: {
+                recorder.CONF_DB_URL: db_url,
+                # Record every state change instead of coalescing a full queue
+                recorder.CONF_MAX_QUEUE_SIZE: 0,
+            }
+        },
+    )
+    instance = hass.data[recorder.DATA_INSTANCE]
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    start = timer()
+
+    for idx in range(10 ** 5):
+        hass.states.async_set(
+            f"sensor.benchmark_{idx % 100}", idx, {"unit_of_measurement": "W"}
+        )
+        # The recorder commits on the timer tick
+        if idx % 1000 == 0:
+            hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: dt_util.utcnow()})
+
+    hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: dt_util.utcnow()})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    runtime = timer() - start
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_add_executor_job(instance.join)
+
+    return runtime
+
+
+@benchmark
+async def logbook_query_filtered(hass):
+    """Query a day of the logbook from a database with a million rows."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        return await _logbook_query_filtered(hass, f"sqlite:///{config_dir}/logbook.db")
+
+
+async def _logbook_query_filtered(hass, db_url):
+    from homeassistant.components import logbook, recorder
+    from homeassistant.setup import async_setup_component
+
+    # Half a million state changes plus their events, a week worth of data
+    await hass.async_add_executor_job(_fill_recorder_db, db_url, 5 * 10 ** 5)
+    await async_setup_component(
+        hass, recorder.DOMAIN, {recorder.DOMAIN: {recorder.CONF_DB_URL: db_url}}
+    )
+    instance = hass.data[recorder.DATA_INSTANCE]
+
+    config = logbook.CONFIG_SCHEMA(
+        {logbook.DOMAIN: {logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ["sensor"]}}}
+    )[logbook.DOMAIN]
+    end_day = dt_util.utcnow()
+
+    start = timer()
+
+    # pylint: disable=protected-access
+    await hass.async_add_executor_job(
+        logbook._get_events, hass, config, end_day - timedelta(days=1), end_day
+    )
+
+    runtime = timer() - start
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_add_executor_job(instance.join)
+
+    return runtime
+
+
+def _fill_recorder_db(db_url, count):
+    """Write count state changes spread over the last week to the database."""
+    from sqlalchemy import create_engine
+
+    from homeassistant.components.recorder.models import Base, Events, States
+
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    now = dt_util.utcnow()
+    interval = timedelta(weeks=1) / count
+
+    for batch_start in range(0, count, 10 ** 4):
+        events = []
+        states = []
+        for idx in range(batch_start, min(batch_start + 10 ** 4, count)):
+            domain = "sensor" if idx % 2 else "light"
+            entity_id = f"{domain}.benchmark_{idx % 1000}"
+            time_fired = now - (count - idx) * interval
+            old_state = {"entity_id": entity_id, "state": str(idx - 1)}
+            new_state = {"entity_id": entity_id, "state": str(idx)}
+            events.append(
+                {
+                    "event_id": idx + 1,
+                    "event_type": EVENT_STATE_CHANGED,
+                    "event_data": JSON_DUMP(
+                        {
+                            "entity_id": entity_id,
+                            "old_state": old_state,
+                            "new_state": new_state,
+                        }
+                    ),
+                    "origin": "LOCAL",
+                    "time_fired": time_fired,
+                }
+            )
+            states.append(
+                {
+                    "event_id": idx + 1,
+                    "domain": domain,
+                    "entity_id": entity_id,
+                    "state": str(idx),
+                    "attributes": "{}",
+                    "last_changed": time_fired,
+                    "last_updated": time_fired,
+                }
+            )
+        engine.execute(Events.__table__.insert(), events)
+        engine.execute(States.__table__.insert(), states)
+
+    engine.dispose()
+
+
 @benchmark
 async def valid_entity_id(hass):
     """Run valid entity ID a million times."""
@@ -207,3 +403,45 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def json_serialize_states_cached(hass):
+    """Serialize million states for two websocket clients with cached JSON."""
+    from homeassistant.components.websocket_api import messages
+
+    states = [
+        core.State("light.kitchen", "on", {"friendly_name": "Kitchen Lights"})
+        for _ in range(10 ** 6)
+    ]
+
+    start = timer()
+    # The second client reuses the JSON cached for the first one
+    for iden in range(2):
+        messages.cached_states_result_message(iden, states)
+    return timer() - start
+
+
+@benchmark
+async def websocket_fan_out(hass):
+    """Send 10k state changes to 20 websocket subscribers."""
+    from homeassistant.components.websocket_api import messages
+
+    attributes = {"friendly_name": "Kitchen Lights", "brightness": 255}
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "light.kitchen",
+                "old_state": core.State("light.kitchen", "off", attributes),
+                "new_state": core.State("light.kitchen", "on", attributes),
+            },
+        )
+        for _ in range(10 ** 4)
+    ]
+
+    start = timer()
+    for event in events:
+        for iden in range(20):
+            messages.cached_event_message(iden, event)
+    return timer() - start
@@ -1,15 +1,43 @@
-"""JSON utility functions."""
+"""JSON utility functions.
+
+All JSON written by Home Assistant goes through json_dumps. By default it
+writes the same JSON as json.dumps of the standard library.
+
+Compact JSON has to be asked for. It has no spaces after separators, keeps
+non ASCII characters and writes NaN and infinite floats as null. It uses
+orjson when it is installed and the standard library otherwise, both
+produce the same output. Data that orjson rejects, like integers that do
+not fit in 64 bits or non string keys, is encoded by the standard library.
+"""
 from collections import deque
+from enum import Enum
 import json
 import logging
+import math
 import os
+import re
 import tempfile
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+from uuid import UUID
 
 from homeassistant.exceptions import HomeAssistantError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 _LOGGER = logging.getLogger(__name__)
 
+JSON_BACKEND_JSON = "json"
+JSON_BACKEND_ORJSON = "orjson"
+
+# orjson only indents by 2 spaces, JSON strings never contain a raw newline
+_INDENT_RE = re.compile("^( +)", re.MULTILINE)
+# orjson writes exponents as "1e-7" and "1e16" where the stdlib writes
+# "1e-07" and "1e+16". A match inside a string only costs a stdlib encode.
+_EXPONENT_FLOAT_RE = re.compile(r"(?:^|[\s:,\[])-?\d+(?:\.\d+)?e")
+
 
 class SerializationError(HomeAssistantError):
     """Error serializing the data to JSON."""
@@ -19,6 +47,179 @@ class WriteError(HomeAssistantError):
     """Error writing the data."""
 
 
+def _json_dumps_json(
+    data: Any,
+    default: Optional[Callable[[Any], Any]],
+    sort_keys: bool,
+    pretty: bool,
+    allow_nan: bool,
+) -> str:
+    """Serialize data to compact JSON with the standard library."""
+    kwargs = {"indent": 4} if pretty else {"separators": (",", ":")}
+    default = _orjson_native_default(default)
+    try:
+        return json.dumps(
+            data,
+            default=default,
+            sort_keys=sort_keys,
+            ensure_ascii=False,
+            allow_nan=False,
+            **kwargs,
+        )
+    except ValueError as err:
+        if not allow_nan or not str(err).startswith("Out of range float"):
+            raise
+    # Write invalid floats as null, like orjson does
+    return json.dumps(
+        _replace_invalid_floats(data, default),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        allow_nan=False,
+        **kwargs,
+    )
+
+
+def _orjson_native_default(
+    default: Optional[Callable[[Any], Any]]
+) -> Callable[[Any], Any]:
+    """Return default extended with the types orjson always serializes."""
+
+    def orjson_native_default(obj: Any) -> Any:
+        """Convert UUIDs and enums like orjson, pass other objects on."""
+        if isinstance(obj, UUID):
+            return str(obj)
+        if isinstance(obj, Enum):
+            return obj.value
+        if default is None:
+            raise TypeError(
+                f"Object of type {type(obj).__name__} is not JSON serializable"
+            )
+        return default(obj)
+
+    return orjson_native_default
+
+
+def _replace_invalid_floats(data: Any, default: Callable[[Any], Any]) -> Any:
+    """Return data with NaN and infinite floats replaced by None."""
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, (str, int)) or data is None:
+        return data
+    if isinstance(data, dict):
+        return {
+            key: _replace_invalid_floats(value, default) for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [_replace_invalid_floats(value, default) for value in data]
+    return _replace_invalid_floats(default(data), default)
+
+
+def _has_invalid_floats(data: Any, default: Callable[[Any], Any]) -> bool:
+    """Return if data contains NaN or infinite floats."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, (str, int)) or data is None:
+        return False
+    if isinstance(data, dict):
+        return any(_has_invalid_floats(value, default) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_invalid_floats(value, default) for value in data)
+    return _has_invalid_floats(default(data), default)
+
+
+def _json_dumps_orjson(
+    data: Any,
+    default: Optional[Callable[[Any], Any]],
+    sort_keys: bool,
+    pretty: bool,
+    allow_nan: bool,
+) -> str:
+    """Serialize data to compact JSON with orjson."""
+    # Leave dates, times and dataclasses to default, like the stdlib
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    try:
+        dumped = orjson.dumps(data, default=default, option=option).decode()
+    except orjson.JSONEncodeError:
+        return _json_dumps_json(data, default, sort_keys, pretty, allow_nan)
+    if _EXPONENT_FLOAT_RE.search(dumped):
+        return _json_dumps_json(data, default, sort_keys, pretty, allow_nan)
+    if (
+        not allow_nan
+        and "null" in dumped
+        and _has_invalid_floats(data, _orjson_native_default(default))
+    ):
+        raise ValueError("Out of range float values are not JSON compliant")
+    if pretty:
+        return _INDENT_RE.sub(lambda match: match.group(1) * 2, dumped)
+    return dumped
+
+
+def _json_loads_orjson(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # The standard library also accepts NaN and huge integers
+        return json.loads(data)
+
+
+_JSON_BACKENDS = {
+    JSON_BACKEND_JSON: (_json_dumps_json, json.loads),
+    JSON_BACKEND_ORJSON: (_json_dumps_orjson, _json_loads_orjson),
+}
+_json_dumps, _json_loads = _JSON_BACKENDS[
+    JSON_BACKEND_JSON if orjson is None else JSON_BACKEND_ORJSON
+]
+
+
+def set_json_backend(backend: str) -> None:
+    """Select the backend for compact JSON, used to compare them."""
+    global _json_dumps, _json_loads  # pylint: disable=global-statement
+
+    if backend == JSON_BACKEND_ORJSON and orjson is None:
+        raise HomeAssistantError("orjson is not installed")
+    _json_dumps, _json_loads = _JSON_BACKENDS[backend]
+
+
+def json_dumps(
+    data: Any,
+    *,
+    default: Optional[Callable[[Any], Any]] = None,
+    sort_keys: bool = False,
+    pretty: bool = False,
+    allow_nan: bool = True,
+    compact: bool = False,
+) -> str:
+    """Serialize data to a JSON string.
+
+    Objects that can not be serialized are passed to default, which returns
+    a serializable replacement or raises TypeError. Invalid floats raise
+    ValueError if allow_nan is False. Pretty output is indented by 4 spaces.
+
+    Without compact the JSON is the one json.dumps writes, invalid floats
+    are written as NaN and Infinity. Compact JSON writes them as null, and
+    UUIDs and enums as their string and value.
+    """
+    if not compact:
+        return json.dumps(
+            data,
+            default=default,
+            sort_keys=sort_keys,
+            indent=4 if pretty else None,
+            allow_nan=allow_nan,
+        )
+    return _json_dumps(data, default, sort_keys, pretty, allow_nan)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON string."""
+    return _json_loads(data)
+
+
 def load_json(
     filename: str, default: Union[List, Dict, None] = None
 ) -> Union[List, Dict]:
@@ -28,7 +229,7 @@ def load_json(
     """
     try:
         with open(filename, encoding="utf-8") as fdesc:
-            return json.loads(fdesc.read())  # type: ignore
+            return json_loads(fdesc.read())  # type: ignore
     except FileNotFoundError:
         # This is not a fatal error
         _LOGGER.debug("JSON file not found: %s", filename)
@@ -53,7 +254,12 @@ def save_json(
     Returns True on success.
     """
     try:
-        json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
+        json_data = json_dumps(
+            data,
+            default=encoder().default if encoder else None,
+            sort_keys=True,
+            pretty=True,
+        )
     except TypeError:
         # pylint: disable=no-member
         msg = f"Failed to serialize to JSON: {filename}. Bad data found at {', '.join(find_paths_unserializable_data(data))}"
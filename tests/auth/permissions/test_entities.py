@@ -215,3 +215,57 @@ def test_entities_areas_area_true(hass):
     assert compiled("light.kitchen", "control") is True
     assert compiled("light.kitchen", "edit") is False
     assert compiled("switch.kitchen", "read") is False
+
+
+def test_entities_device_id_cache_invalidation(hass):
+    """Test cached device results are recomputed when an entity changes."""
+    entity_registry = mock_registry(
+        hass,
+        {
+            "test_domain.allowed": RegistryEntry(
+                entity_id="test_domain.allowed",
+                unique_id="1234",
+                platform="test_platform",
+                device_id="mock-allowed-dev-id",
+            )
+        },
+    )
+    device_registry = mock_device_registry(hass)
+    perm_lookup = PermissionLookup(entity_registry, device_registry)
+
+    policy = {"device_ids": {"mock-allowed-dev-id": {"read": True}}}
+    ENTITY_POLICY_SCHEMA(policy)
+    compiled = compile_entities(policy, perm_lookup)
+    assert compiled("test_domain.allowed", "read") is True
+
+    entity_registry.entities["test_domain.allowed"] = RegistryEntry(
+        entity_id="test_domain.allowed",
+        unique_id="1234",
+        platform="test_platform",
+        device_id="mock-other-dev-id",
+    )
+    assert compiled("test_domain.allowed", "read") is True
+
+    perm_lookup.mark_entity_changed("test_domain.allowed")
+    assert compiled("test_domain.allowed", "read") is False
+
+
+def test_changed_since(hass):
+    """Test only the entities changed after a revision are returned."""
+    perm_lookup = PermissionLookup(mock_registry(hass), mock_device_registry(hass))
+
+    perm_lookup.mark_entity_changed("light.kitchen")
+    perm_lookup.mark_entity_changed("light.living_room")
+    revision = perm_lookup.revision
+    assert perm_lookup.changed_since(revision) == []
+
+    perm_lookup.mark_entity_changed("light.hallway")
+    perm_lookup.mark_entity_changed("light.kitchen")
+    assert perm_lookup.changed_since(revision) == ["light.kitchen", "light.hallway"]
+    assert perm_lookup.changed_since(0) == [
+        "light.kitchen",
+        "light.hallway",
+        "light.living_room",
+    ]
+    assert perm_lookup.is_current("light.living_room", revision)
+    assert not perm_lookup.is_current("light.kitchen", revision)
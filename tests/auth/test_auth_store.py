@@ -4,6 +4,12 @@ import asyncio
 import asynctest
 
 from homeassistant.auth import auth_store
+from homeassistant.auth.permissions import PolicyPermissions
+from homeassistant.auth.permissions.entities import compile_entities
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.entity_registry import RegistryEntry
+
+from tests.common import mock_device_registry, mock_registry
 
 
 async def test_loading_no_group_data_format(hass, hass_storage):
@@ -95,6 +101,12 @@ async def test_loading_no_group_data_format(hass, hass_storage):
     system_token = list(system.refresh_tokens.values())[0]
     assert system_token.id == "system-token-id"
 
+    assert await store.async_get_refresh_token("user-token-id") is owner_token
+    assert (
+        await store.async_get_refresh_token_by_token(owner_token.token) is owner_token
+    )
+    assert await store.async_get_refresh_token_by_token("unknown-token") is None
+
 
 async def test_loading_all_access_group_data_format(hass, hass_storage):
     """Test we correctly load old data with single group."""
@@ -242,3 +254,97 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_refresh_token_indexes(hass, hass_storage):
+    """Test refresh tokens can be found until they are removed."""
+    store = auth_store.AuthStore(hass)
+    user = await store.async_create_user("Paulus")
+    token_1 = await store.async_create_refresh_token(user, "http://localhost/")
+    token_2 = await store.async_create_refresh_token(user, "http://localhost/")
+
+    assert await store.async_get_refresh_token(token_1.id) is token_1
+    assert await store.async_get_refresh_token_by_token(token_2.token) is token_2
+
+    await store.async_remove_refresh_token(token_1)
+    assert token_1.id not in user.refresh_tokens
+    assert await store.async_get_refresh_token(token_1.id) is None
+    assert await store.async_get_refresh_token_by_token(token_1.token) is None
+    assert await store.async_get_refresh_token(token_2.id) is token_2
+
+    await store.async_remove_user(user)
+    assert await store.async_get_refresh_token(token_2.id) is None
+    assert await store.async_get_refresh_token_by_token(token_2.token) is None
+
+
+async def test_registry_changes_invalidate_entity_permissions(hass, hass_storage):
+    """Test registry changes are picked up by compiled entity permissions."""
+    mock_registry(
+        hass,
+        {
+            "light.kitchen": RegistryEntry(
+                entity_id="light.kitchen",
+                unique_id="1234",
+                platform="test_platform",
+                device_id="mock-dev-id",
+            )
+        },
+    )
+    device_registry = mock_device_registry(
+        hass, {"mock-dev-id": DeviceEntry(id="mock-dev-id", area_id="kitchen")}
+    )
+    store = auth_store.AuthStore(hass)
+    await store.async_get_users()
+
+    compiled = compile_entities(
+        {"area_ids": {"kitchen": {"read": True}}}, store._perm_lookup
+    )
+    assert compiled("light.kitchen", "read") is True
+
+    device_registry.async_update_device("mock-dev-id", area_id="living_room")
+    await hass.async_block_till_done()
+
+    assert compiled("light.kitchen", "read") is False
+
+
+async def test_allowed_entity_ids_follow_entity_changes(hass, hass_storage):
+    """Test the allowed entity ids follow added entities and registry changes."""
+    mock_registry(hass)
+    device_registry = mock_device_registry(
+        hass, {"mock-dev-id": DeviceEntry(id="mock-dev-id", area_id="kitchen")}
+    )
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.hallway", "on")
+    store = auth_store.AuthStore(hass)
+    await store.async_get_users()
+
+    permissions = PolicyPermissions(
+        {
+            "entities": {
+                "entity_ids": {"light.kitchen": True},
+                "area_ids": {"kitchen": {"read": True}},
+            }
+        },
+        store._perm_lookup,
+    )
+    assert permissions.allowed_entity_ids("read") == {"light.kitchen"}
+
+    entity_registry = await hass.helpers.entity_registry.async_get_registry()
+    entity_registry.async_get_or_create("switch", "test_platform", "5678")
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("switch.test_platform_5678", "on")
+    await hass.async_block_till_done()
+    assert permissions.allowed_entity_ids("read") == {"light.kitchen"}
+
+    entity_registry.async_get_or_create(
+        "switch", "test_platform", "5678", device_id="mock-dev-id"
+    )
+    await hass.async_block_till_done()
+    assert permissions.allowed_entity_ids("read") == {
+        "light.kitchen",
+        "switch.test_platform_5678",
+    }
+
+    device_registry.async_update_device("mock-dev-id", area_id="living_room")
+    await hass.async_block_till_done()
+    assert permissions.allowed_entity_ids("read") == {"light.kitchen"}
@@ -474,6 +474,54 @@ async def test_remove_refresh_token(mock_hass):
     assert await manager.async_validate_access_token(access_token) is None
 
 
+async def test_validated_access_tokens_are_cached(mock_hass):
+    """Test validated access tokens are cached until revoked or expired."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+
+    assert await manager.async_validate_access_token(access_token) is refresh_token
+
+    with patch("jwt.decode") as mock_decode:
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+    assert not mock_decode.called
+
+    # Cache entries expire
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=dt_util.utcnow() + auth_const.ACCESS_TOKEN_CACHE_TTL,
+    ), patch("jwt.decode", side_effect=jwt.InvalidTokenError) as mock_decode:
+        assert await manager.async_validate_access_token(access_token) is None
+    assert mock_decode.called
+
+    # Deactivated users are rejected even when cached
+    assert await manager.async_validate_access_token(access_token) is refresh_token
+    user.is_active = False
+    assert await manager.async_validate_access_token(access_token) is None
+    user.is_active = True
+
+    # Removing the refresh token revokes the cached access token
+    await manager.async_remove_refresh_token(refresh_token)
+    assert await manager.async_validate_access_token(access_token) is None
+
+
+async def test_removing_user_revokes_cached_access_tokens(mock_hass):
+    """Test cached access tokens of a removed user are no longer valid."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+
+    assert await manager.async_validate_access_token(access_token) is refresh_token
+
+    await manager.async_remove_user(user)
+
+    assert await manager.async_get_refresh_token(refresh_token.id) is None
+    assert await manager.async_get_refresh_token_by_token(refresh_token.token) is None
+    assert await manager.async_validate_access_token(access_token) is None
+
+
 async def test_create_access_token(mock_hass):
     """Test normal refresh_token's jwt_key keep same after used."""
     manager = await auth.auth_manager_from_config(mock_hass, [], [])
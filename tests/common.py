@@ -359,7 +359,7 @@ def mock_component(hass, component):
 def mock_registry(hass, mock_entries=None):
     """Mock the Entity Registry."""
     registry = entity_registry.EntityRegistry(hass)
-    registry.entities = mock_entries or OrderedDict()
+    registry.entities = entity_registry.EntityRegistryItems(mock_entries)
 
     hass.data[entity_registry.DATA_REGISTRY] = registry
     return registry
@@ -377,7 +377,7 @@ def mock_area_registry(hass, mock_entries=None):
 def mock_device_registry(hass, mock_entries=None):
     """Mock the Device Registry."""
     registry = device_registry.DeviceRegistry(hass)
-    registry.devices = mock_entries or OrderedDict()
+    registry.devices = device_registry.DeviceRegistryItems(mock_entries)
 
     hass.data[device_registry.DATA_REGISTRY] = registry
     return registry
@@ -438,6 +438,8 @@ class MockUser(auth_models.User):
         """Test helper to add entry to hass."""
         ensure_auth_manager_loaded(auth_mgr)
         auth_mgr._store._users[self.id] = self
+        if self.perm_lookup is None:
+            self.perm_lookup = auth_mgr._store._perm_lookup
         return self
 
     def mock_policy(self, policy):
@@ -467,6 +469,12 @@ def ensure_auth_manager_loaded(auth_mgr):
     store = auth_mgr._store
     if store._users is None:
         store._set_defaults()
+    if store._perm_lookup is None:
+        # The registries are only loaded by the tests that need them
+        store._perm_lookup = auth_permissions.PermissionLookup(
+            None, None, store.hass.states
+        )
+        store._async_track_registry_changes(store._perm_lookup)
 
 
 class MockModule:
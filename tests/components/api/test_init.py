@@ -1,6 +1,7 @@
 """The tests for the Home Assistant API component."""
 # pylint: disable=protected-access
 import json
+import math
 from unittest.mock import patch
 
 from aiohttp import web
@@ -327,6 +328,19 @@ async def test_stream(hass, mock_api_client):
     assert data["event_type"] == "test_event"
 
 
+async def test_stream_invalid_floats(hass, mock_api_client):
+    """Test the stream forwards events with NaN floats."""
+    resp = await mock_api_client.get(const.URL_API_STREAM)
+    assert resp.status == 200
+
+    hass.bus.async_fire("test_event", {"hello": float("NaN")})
+
+    data = await _stream_next_event(resp.content)
+
+    assert data["event_type"] == "test_event"
+    assert math.isnan(data["data"]["hello"])
+
+
 async def test_stream_with_restricted(hass, mock_api_client):
     """Test the stream with restrictions."""
     listen_count = _listen_count(hass)
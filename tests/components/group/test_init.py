@@ -15,12 +15,18 @@ from homeassistant.const import (
     STATE_ON,
     STATE_UNKNOWN,
 )
+from homeassistant.helpers.event import DATA_STATE_CHANGE_DISPATCHER
 from homeassistant.setup import async_setup_component, setup_component
 
 from tests.common import assert_setup_component, get_test_home_assistant
 from tests.components.group import common
 
 
+def _tracked_entity_ids(hass):
+    """Return the entity ids with state change listeners."""
+    return sorted(hass.data[DATA_STATE_CHANGE_DISPATCHER]._listeners)
+
+
 class TestComponentsGroup(unittest.TestCase):
     """Test Group component."""
 
@@ -394,7 +400,13 @@ class TestComponentsGroup(unittest.TestCase):
             "group.second_group",
             "group.test_group",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 3
+        assert _tracked_entity_ids(self.hass) == [
+            "hello.world",
+            "light.bowl",
+            "sensor.happy",
+            "test.one",
+            "test.two",
+        ]
 
         with patch(
             "homeassistant.config.load_yaml_config_file",
@@ -409,7 +421,7 @@ class TestComponentsGroup(unittest.TestCase):
             "group.all_tests",
             "group.hello",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 2
+        assert _tracked_entity_ids(self.hass) == ["light.bowl", "test.one", "test.two"]
 
     def test_modify_group(self):
         """Test modifying a group."""
@@ -1,6 +1,7 @@
 """The tests the History component."""
 # pylint: disable=protected-access,invalid-name
 from datetime import timedelta
+from functools import partial
 import unittest
 from unittest.mock import patch, sentinel
 
@@ -14,7 +15,7 @@ from tests.common import (
     init_recorder_component,
     mock_state_change_event,
 )
-from tests.components.recorder.common import wait_recording_done
+from tests.components.recorder.common import trigger_db_commit, wait_recording_done
 
 
 class TestComponentHistory(unittest.TestCase):
@@ -192,6 +193,53 @@ class TestComponentHistory(unittest.TestCase):
         )
         assert states == hist
 
+    def test_get_significant_states_minimal_response(self):
+        """Test only the first and last state of an entity carry attributes."""
+        zero, four, states = self.record_states()
+        hist = history.get_significant_states(
+            self.hass, zero, four, filters=history.Filters(), minimal_response=True
+        )
+
+        for entity_id, entity_states in states.items():
+            if len(entity_states) > 2:
+                entity_states[1:-1] = [
+                    {"state": state.state, "last_changed": state.last_changed}
+                    for state in entity_states[1:-1]
+                ]
+        assert states == hist
+        assert isinstance(hist["thermostat.test"][1], dict)
+
+    def test_get_significant_states_minimal_response_hidden(self):
+        """Test hidden states in between are dropped like in the full response."""
+        self.init_recorder()
+        zero = dt_util.utcnow()
+        for state, attributes in (
+            ("1", {}),
+            ("2", {"hidden": True}),
+            ("3", {"hidden": False}),
+            ("4", {"hidden": True}),
+            ("5", {}),
+        ):
+            self.hass.states.set("sensor.test", state, attributes)
+            wait_recording_done(self.hass)
+        four = dt_util.utcnow() + timedelta(seconds=1)
+
+        hist = history.get_significant_states(
+            self.hass, zero, four, filters=history.Filters(), minimal_response=True
+        )
+        full = history.get_significant_states(
+            self.hass, zero, four, filters=history.Filters()
+        )
+
+        assert [state.state for state in full["sensor.test"]] == ["1", "3", "5"]
+        assert hist["sensor.test"][0] == full["sensor.test"][0]
+        assert hist["sensor.test"][1] == {
+            "state": "3",
+            "last_changed": full["sensor.test"][1].last_changed,
+        }
+        assert hist["sensor.test"][2] == full["sensor.test"][2]
+        assert len(hist["sensor.test"]) == 3
+
     def test_get_significant_states_with_initial(self):
         """Test that only significant states are returned.
 
@@ -537,6 +585,39 @@ class TestComponentHistory(unittest.TestCase):
         hist = history.get_significant_states(self.hass, zero, four, filters=filters)
         assert states == hist
 
+    def test_stream_significant_states_with_initial(self):
+        """Test streamed states are in entity id order, with their start states."""
+        zero, four, _ = self.record_states()
+        one_and_half = zero + timedelta(seconds=1.5)
+        hist = history.get_significant_states(
+            self.hass, one_and_half, four, filters=history.Filters()
+        )
+        streamed = [
+            list(entity_states)
+            for entity_states in history.stream_significant_states(
+                self.hass, one_and_half, four, filters=history.Filters()
+            )
+        ]
+
+        assert "media_player.test2" in hist
+        assert streamed == [hist[entity_id] for entity_id in sorted(hist)]
+
+    def test_stream_significant_states_batches(self):
+        """Test streamed states read in batches are the same states."""
+        zero, four, _ = self.record_states()
+        hist = history.get_significant_states(
+            self.hass, zero, four, filters=history.Filters()
+        )
+        with patch.object(history, "STREAM_BATCH_SIZE", 2):
+            streamed = [
+                list(entity_states)
+                for entity_states in history.stream_significant_states(
+                    self.hass, zero, four, filters=history.Filters()
+                )
+            ]
+
+        assert streamed == [hist[entity_id] for entity_id in sorted(hist)]
+
     def record_states(self):
         """Record some test states.
 
@@ -647,3 +728,135 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def test_fetch_period_api_from_cache(hass, hass_client):
+    """Test the fetch period view serves recent history from memory."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("zone.home", "zoning")
+    await hass.async_block_till_done()
+    cache = hass.data[history.DATA_CACHE]
+    client = await hass_client()
+
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()),
+        params={"skip_initial_state": ""},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert [[state["state"] for state in states] for states in result] == [
+        ["on", "off"]
+    ]
+    assert cache.hits == 1
+    assert cache.misses == 0
+
+    with patch.object(history, "get_significant_states", return_value={}):
+        response = await client.get(
+            "/api/history/period/{}".format((start - timedelta(days=1)).isoformat())
+        )
+    assert response.status == 200
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+async def test_history_cache_evicts_oldest():
+    """Test the history cache stays within its size."""
+    cache = history.HistoryCache(timedelta(days=1), 10, lambda state: True)
+    start = dt_util.utcnow()
+    cache.async_start(start, [])
+
+    for idx in range(15):
+        point = start + timedelta(seconds=idx)
+        cache.async_add(
+            "sensor.test", ha.State("sensor.test", str(idx), {}, point, point), point
+        )
+
+    assert cache.size <= 10
+    assert (
+        await cache.async_significant_states(start, None, None, lambda _: True, False)
+        is None
+    )
+
+    result = await cache.async_significant_states(
+        start + timedelta(seconds=12), None, None, lambda _: True, True
+    )
+    assert [state.state for state in result["sensor.test"]] == ["11", "13", "14"]
+
+
+async def test_history_cache_evicts_cold_entities():
+    """Test entities down to one state make room for the others."""
+    cache = history.HistoryCache(timedelta(days=1), 10, lambda state: True)
+    start = dt_util.utcnow()
+    cache.async_start(start, [])
+
+    for idx in range(30):
+        point = start + timedelta(seconds=idx + 1)
+        entity_id = f"sensor.test_{idx}"
+        cache.async_add(entity_id, ha.State(entity_id, "on", {}, point, point), point)
+    point = start + timedelta(seconds=31)
+    cache.async_add(
+        "sensor.test_0", ha.State("sensor.test_0", "off", {}, point, point), point
+    )
+
+    assert cache.size <= 10
+    result = await cache.async_significant_states(
+        start, None, None, lambda _: True, False
+    )
+    assert len(result) == 30
+    assert [state.state for state in result["sensor.test_0"]] == ["on", "off"]
+
+
+async def test_history_cache_start_states_ignore_domains():
+    """Test start states of ignored domains are skipped like in the database."""
+    cache = history.HistoryCache(
+        timedelta(days=1), 100, lambda state: True, history.IGNORE_DOMAINS
+    )
+    start = dt_util.utcnow()
+    cache.async_start(
+        start,
+        [
+            ha.State("zone.home", "zoning", {}, start, start),
+            ha.State("light.kitchen", "on", {}, start, start),
+        ],
+    )
+    later = start + timedelta(seconds=1)
+
+    result = await cache.async_significant_states(
+        later, None, ["zone.home", "light.kitchen"], None, True
+    )
+    assert list(result) == ["light.kitchen"]
+
+    result = await cache.async_significant_states(
+        later, None, ["zone.home"], None, True
+    )
+    assert list(result) == ["zone.home"]
+
+
+async def test_fetch_period_api_streamed(hass, hass_client):
+    """Test the fetch period view streams long periods."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {"cache_max_states": 0}})
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hall", "on")
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    start = dt_util.utcnow() - timedelta(days=3)
+
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()),
+        params={"end_time": dt_util.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert [[state["state"] for state in states] for states in result] == [
+        ["on"],
+        ["on", "off"],
+    ]
@@ -0,0 +1,142 @@
+"""Test static file handling for the HTTP component."""
+import asyncio
+import os
+from unittest.mock import patch
+
+from aiohttp import hdrs, web
+import pytest
+
+from homeassistant.components.http.static import (
+    CachingStaticResource,
+    StaticFileCache,
+    _load_file,
+)
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """Create a directory with a static file."""
+    (tmp_path / "app.js").write_text("console.log('hello');\n" * 100)
+    return tmp_path
+
+
+@pytest.fixture
+def file_cache():
+    """Create a static file cache."""
+    return StaticFileCache()
+
+
+async def _async_get(file_cache, filepath):
+    """Get a file from the cache like the static resource does."""
+    return await file_cache.async_get(filepath, filepath.stat())
+
+
+@pytest.fixture
+def mock_static_client(loop, aiohttp_client, static_dir, file_cache):
+    """Client serving the static directory from the file cache."""
+    app = web.Application()
+    app.router.register_resource(
+        CachingStaticResource("/static", str(static_dir), file_cache=file_cache)
+    )
+    return loop.run_until_complete(aiohttp_client(app))
+
+
+async def test_serving_from_cache(mock_static_client, static_dir, file_cache):
+    """Test files are compressed and served from memory."""
+    resp = await mock_static_client.get("/static/app.js")
+    assert resp.status == 200
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "gzip"
+    assert resp.headers[hdrs.CACHE_CONTROL].startswith("public")
+    assert await resp.text() == (static_dir / "app.js").read_text()
+    assert file_cache.size > 0
+
+    etag = resp.headers[hdrs.ETAG]
+    resp = await mock_static_client.get(
+        "/static/app.js", headers={hdrs.IF_NONE_MATCH: etag}
+    )
+    assert resp.status == 304
+
+    resp = await mock_static_client.get(
+        "/static/app.js", headers={hdrs.ACCEPT_ENCODING: "identity"}
+    )
+    assert resp.status == 200
+    assert hdrs.CONTENT_ENCODING not in resp.headers
+    assert resp.headers[hdrs.ETAG] == etag
+
+
+async def test_cache_reloads_changed_files(mock_static_client, static_dir):
+    """Test a changed file is picked up."""
+    resp = await mock_static_client.get("/static/app.js")
+    etag = resp.headers[hdrs.ETAG]
+
+    path = static_dir / "app.js"
+    path.write_text("console.log('changed');\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    resp = await mock_static_client.get(
+        "/static/app.js", headers={hdrs.IF_NONE_MATCH: etag}
+    )
+    assert resp.status == 200
+    assert resp.headers[hdrs.ETAG] != etag
+    assert await resp.text() == "console.log('changed');\n"
+
+
+async def test_cache_memory_budget(static_dir):
+    """Test the least recently used files are evicted."""
+    file_cache = StaticFileCache(max_size=3000)
+    for name in ("one", "two", "three"):
+        (static_dir / name).write_bytes(os.urandom(1000))
+
+    for name in ("one", "two", "three"):
+        assert await _async_get(file_cache, static_dir / name) is not None
+    assert file_cache.size <= 3000
+
+    await _async_get(file_cache, static_dir / "two")
+    (static_dir / "four").write_bytes(os.urandom(1000))
+    await _async_get(file_cache, static_dir / "four")
+
+    assert list(file_cache._files) == [
+        static_dir / "three",
+        static_dir / "two",
+        static_dir / "four",
+    ]
+
+
+async def test_cache_loads_file_once(static_dir, file_cache):
+    """Test concurrent requests for a file share one load."""
+    with patch(
+        "homeassistant.components.http.static._load_file", wraps=_load_file
+    ) as mock_load:
+        first, second = await asyncio.gather(
+            _async_get(file_cache, static_dir / "app.js"),
+            _async_get(file_cache, static_dir / "app.js"),
+        )
+
+    assert first is second
+    assert mock_load.call_count == 1
+    assert file_cache.size == first.memory_size
+
+
+async def test_gzip_not_acceptable(mock_static_client):
+    """Test gzip is not sent when the client gives it a zero q-value."""
+    for accept_encoding in ("gzip;q=0, identity", "*;q=0, identity", "br"):
+        resp = await mock_static_client.get(
+            "/static/app.js", headers={hdrs.ACCEPT_ENCODING: accept_encoding}
+        )
+        assert resp.status == 200
+        assert hdrs.CONTENT_ENCODING not in resp.headers
+
+    resp = await mock_static_client.get(
+        "/static/app.js", headers={hdrs.ACCEPT_ENCODING: "br;q=1.0, *;q=0.5"}
+    )
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "gzip"
+
+
+async def test_range_served_from_disk(mock_static_client, static_dir):
+    """Test range requests get the requested part of the file."""
+    resp = await mock_static_client.get(
+        "/static/app.js", headers={hdrs.RANGE: "bytes=0-6"}
+    )
+    assert resp.status == 206
+    assert await resp.text() == "console"
@@ -1,6 +1,7 @@
 """Tests for Home Assistant View."""
 from unittest.mock import Mock
 
+from aiohttp import ClientPayloadError
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
@@ -14,6 +15,7 @@ from homeassistant.components.http.view import (
     request_handler_factory,
 )
 from homeassistant.exceptions import ServiceNotFound, Unauthorized
+from homeassistant.setup import async_setup_component
 
 from tests.common import mock_coro_func
 
@@ -34,6 +36,87 @@ async def test_invalid_json(caplog):
     assert str(float("NaN")) in caplog.text
 
 
+async def test_json_stream(hass, hass_client):
+    """Test streaming a nested JSON list."""
+
+    class StreamView(HomeAssistantView):
+        url = "/api/test_stream"
+        name = "api:test-stream"
+
+        async def get(self, request):
+            return await self.json_stream(
+                request, ((num for num in range(idx)) for idx in range(3)), 4
+            )
+
+    assert await async_setup_component(hass, "http", {})
+    hass.http.register_view(StreamView)
+    client = await hass_client()
+
+    response = await client.get("/api/test_stream")
+    assert response.status == 200
+    assert response.content_type == "application/json"
+    assert await response.json() == [[], [0], [0, 1]]
+
+
+async def test_json_stream_error(hass, hass_client, caplog):
+    """Test the connection is closed when streaming fails halfway."""
+
+    def items():
+        yield 1
+        raise ValueError("Database went away")
+
+    class StreamView(HomeAssistantView):
+        url = "/api/test_stream"
+        name = "api:test-stream"
+
+        async def get(self, request):
+            return await self.json_stream(request, items(), 1)
+
+    assert await async_setup_component(hass, "http", {})
+    hass.http.register_view(StreamView)
+    client = await hass_client()
+
+    response = await client.get("/api/test_stream")
+    assert response.status == 200
+    with pytest.raises(ClientPayloadError):
+        await response.read()
+    assert "Error streaming JSON response" in caplog.text
+
+
+async def test_json_stream_error_closes_items(hass, hass_client):
+    """Test the items are released before the response is returned."""
+    released = []
+    released_on_return = []
+
+    def rows():
+        yield 1
+        raise ValueError("Database went away")
+
+    def items():
+        try:
+            yield rows()
+        finally:
+            released.append(True)
+
+    class StreamView(HomeAssistantView):
+        url = "/api/test_stream"
+        name = "api:test-stream"
+
+        async def get(self, request):
+            response = await self.json_stream(request, items(), 1)
+            released_on_return.extend(released)
+            return response
+
+    assert await async_setup_component(hass, "http", {})
+    hass.http.register_view(StreamView)
+    client = await hass_client()
+
+    response = await client.get("/api/test_stream")
+    with pytest.raises(ClientPayloadError):
+        await response.read()
+    assert released_on_return == [True]
+
+
 async def test_handling_unauthorized(mock_request):
     """Test handling unauth exceptions."""
     with pytest.raises(HTTPUnauthorized):
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access,invalid-name
 from datetime import datetime, timedelta
 from functools import partial
+import json
 import logging
 import unittest
 
@@ -17,6 +18,7 @@ from homeassistant.components.homekit.const import (
     DOMAIN as DOMAIN_HOMEKIT,
     EVENT_HOMEKIT_CHANGED,
 )
+from homeassistant.components.recorder.models import States
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_HIDDEN,
@@ -34,9 +36,10 @@ from homeassistant.const import (
 import homeassistant.core as ha
 from homeassistant.setup import async_setup_component, setup_component
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads as ha_json_loads
 
 from tests.common import get_test_home_assistant, init_recorder_component
-from tests.components.recorder.common import trigger_db_commit
+from tests.components.recorder.common import trigger_db_commit, wait_recording_done
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -582,23 +585,27 @@ class TestComponentLogbook(unittest.TestCase):
             "light.kitchen", "on", {"brightness": 200}, pointB, pointC
         ).as_dict()
 
-        eventA = ha.Event(
-            EVENT_STATE_CHANGED,
-            {
-                "entity_id": "light.kitchen",
-                "old_state": state_off,
-                "new_state": state_100,
-            },
-            time_fired=pointB,
+        eventA = logbook.LazyEventPartialState.from_event(
+            ha.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "light.kitchen",
+                    "old_state": state_off,
+                    "new_state": state_100,
+                },
+                time_fired=pointB,
+            )
         )
-        eventB = ha.Event(
-            EVENT_STATE_CHANGED,
-            {
-                "entity_id": "light.kitchen",
-                "old_state": state_100,
-                "new_state": state_200,
-            },
-            time_fired=pointC,
+        eventB = logbook.LazyEventPartialState.from_event(
+            ha.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "light.kitchen",
+                    "old_state": state_100,
+                    "new_state": state_200,
+                },
+                time_fired=pointC,
+            )
         )
 
         entities_filter = logbook._generate_filter_from_config({})
@@ -614,6 +621,213 @@ class TestComponentLogbook(unittest.TestCase):
             entries[0], pointB, "kitchen", domain="light", entity_id="light.kitchen"
         )
 
+    def test_states_filter_matches_entity_filter(self):
+        """Test the SQL entity filter passes the same entities."""
+        entity_ids = [
+            "light.kitchen",
+            "light.hall",
+            "sensor.power",
+            "sensor.energy",
+            "switch.fan",
+        ]
+        with recorder.session_scope(hass=self.hass) as session:
+            for entity_id in entity_ids:
+                session.add(
+                    States(
+                        entity_id=entity_id,
+                        domain=ha.split_entity_id(entity_id)[0],
+                        state="on",
+                        attributes="{}",
+                    )
+                )
+
+        for config in (
+            {},
+            {logbook.CONF_INCLUDE: {logbook.CONF_DOMAINS: ["light"]}},
+            {logbook.CONF_EXCLUDE: {logbook.CONF_ENTITIES: ["sensor.power"]}},
+            {
+                logbook.CONF_INCLUDE: {
+                    logbook.CONF_DOMAINS: ["light"],
+                    logbook.CONF_ENTITIES: ["sensor.power"],
+                },
+                logbook.CONF_EXCLUDE: {logbook.CONF_ENTITIES: ["light.hall"]},
+            },
+            {
+                logbook.CONF_INCLUDE: {logbook.CONF_ENTITIES: ["sensor.power"]},
+                logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ["sensor"]},
+            },
+            {
+                logbook.CONF_INCLUDE: {logbook.CONF_ENTITIES: ["switch.fan"]},
+                logbook.CONF_EXCLUDE: {logbook.CONF_ENTITIES: ["light.hall"]},
+            },
+        ):
+            config = logbook.CONFIG_SCHEMA({logbook.DOMAIN: config})[logbook.DOMAIN]
+            entities_filter = logbook._generate_filter_from_config(config)
+            states_filter = logbook._generate_states_filter_from_config(config)
+
+            with recorder.session_scope(hass=self.hass) as session:
+                query = session.query(States.entity_id).filter(
+                    States.entity_id.in_(entity_ids)
+                )
+                if states_filter is not None:
+                    query = query.filter(states_filter)
+                assert {row.entity_id for row in query} == {
+                    entity_id for entity_id in entity_ids if entities_filter(entity_id)
+                }
+
+    def test_get_events_decodes_recorded_states(self):
+        """Test recorded state changes are filtered and humanified lazily."""
+        self.hass.start()
+        start = dt_util.utcnow()
+        self.hass.states.set("light.kitchen", "off", {"friendly_name": "Kitchen"})
+        self.hass.states.set("light.kitchen", "on", {"friendly_name": "Kitchen"})
+        self.hass.states.set(
+            "light.kitchen", "on", {"friendly_name": "Kitchen", "brightness": 100}
+        )
+        self.hass.states.set("light.hidden", "off")
+        self.hass.states.set("light.hidden", "on", {ATTR_HIDDEN: True})
+        self.hass.states.set("light.kitchen", "off", {"friendly_name": "Kitchen"})
+        self.hass.states.remove("light.kitchen")
+        wait_recording_done(self.hass)
+
+        events = logbook._get_events(
+            self.hass,
+            self.EMPTY_CONFIG[logbook.DOMAIN],
+            start,
+            dt_util.utcnow() + timedelta(seconds=1),
+        )
+        entries = [entry for entry in events if entry.get("domain") == "light"]
+
+        assert [entry["entity_id"] for entry in entries] == [
+            "light.kitchen",
+            "light.kitchen",
+        ]
+        assert [entry["message"] for entry in entries] == [
+            "turned on",
+            "turned off",
+        ]
+        assert entries[0]["name"] == "Kitchen"
+
+    def test_get_events_batches(self):
+        """Test events read in batches are the same events."""
+        self.hass.start()
+        start = dt_util.utcnow()
+        for state in ("off", "on", "off", "on", "off"):
+            self.hass.states.set("light.kitchen", state)
+            self.hass.states.set("switch.pump", state)
+        wait_recording_done(self.hass)
+        end = dt_util.utcnow() + timedelta(seconds=1)
+
+        events = logbook._get_events(
+            self.hass, self.EMPTY_CONFIG[logbook.DOMAIN], start, end
+        )
+        with patch.object(logbook, "EVENTS_BATCH_SIZE", 2):
+            batched = logbook._get_events(
+                self.hass, self.EMPTY_CONFIG[logbook.DOMAIN], start, end
+            )
+
+        assert len(events) == 8
+        assert batched == events
+
+    def test_get_events_decodes_shown_states_only(self):
+        """Test state changes are skipped from their state rows."""
+        self.hass.start()
+        start = dt_util.utcnow()
+        for state in ("off", "on", "on", "off"):
+            self.hass.states.set("light.kitchen", state)
+        for state in ("1", "2", "3"):
+            self.hass.states.set("sensor.temp", state, {"unit_of_measurement": "C"})
+        wait_recording_done(self.hass)
+
+        decoded = []
+
+        def json_loads(data):
+            """Record which entities got their event data decoded."""
+            result = ha_json_loads(data)
+            if "new_state" in result:
+                decoded.append((result["entity_id"], result["new_state"]["state"]))
+            return result
+
+        with patch(
+            "homeassistant.components.logbook.json_loads", side_effect=json_loads
+        ):
+            events = logbook._get_events(
+                self.hass,
+                self.EMPTY_CONFIG[logbook.DOMAIN],
+                start,
+                dt_util.utcnow() + timedelta(seconds=1),
+            )
+
+        assert [entry["message"] for entry in events] == ["turned on", "turned off"]
+        # The first row of an entity and the shown states are decoded
+        assert sorted(decoded) == [
+            ("light.kitchen", "off"),
+            ("light.kitchen", "off"),
+            ("light.kitchen", "on"),
+            ("sensor.temp", "1"),
+            ("sensor.temp", "3"),
+        ]
+
+    def test_keep_event_old_state_from_previous_row(self):
+        """Test the old state is taken from the previous row of the entity."""
+        entities_filter = logbook._generate_filter_from_config({})
+        time_fired = dt_util.utcnow()
+
+        def lazy_event(event_type, state=None, old_state=None):
+            """Return a lazy event for a row."""
+            if event_type != EVENT_STATE_CHANGED:
+                return logbook.LazyEventPartialState(
+                    logbook._LazyEventRow(
+                        None, event_type, "{}", time_fired, None, None, None, None, None
+                    )
+                )
+            data = {
+                "entity_id": "light.kitchen",
+                "old_state": old_state and {"state": old_state},
+                "new_state": {"state": state} if state else None,
+            }
+            return logbook.LazyEventPartialState(
+                logbook._LazyEventRow(
+                    None,
+                    event_type,
+                    json.dumps(data),
+                    time_fired,
+                    None,
+                    None,
+                    "light.kitchen",
+                    "light",
+                    state or "",
+                )
+            )
+
+        last_states = {}
+        events = [
+            lazy_event(EVENT_STATE_CHANGED, "off"),
+            lazy_event(EVENT_STATE_CHANGED, "on", "off"),
+            lazy_event(EVENT_STATE_CHANGED, None, "on"),
+            lazy_event(EVENT_STATE_CHANGED, "off"),
+            lazy_event(EVENT_STATE_CHANGED, "on", "off"),
+        ]
+        assert [
+            logbook._keep_event(self.hass, event, entities_filter, last_states)
+            for event in events
+        ] == [False, True, False, False, True]
+        # Only the first row was decoded
+        assert [event._data is not None for event in events] == [
+            True,
+            False,
+            False,
+            False,
+            False,
+        ]
+
+        stop = lazy_event(EVENT_HOMEASSISTANT_STOP)
+        assert logbook._keep_event(self.hass, stop, entities_filter, last_states)
+        assert last_states == {}
+        event = lazy_event(EVENT_STATE_CHANGED, "off")
+        assert not logbook._keep_event(self.hass, event, entities_filter, last_states)
+        assert event._data is not None
+
     def test_home_assistant_start_stop_grouped(self):
         """Test if HA start and stop events are grouped.
 
@@ -1261,10 +1475,16 @@ class TestComponentLogbook(unittest.TestCase):
             entity_id, state, attributes, last_changed, last_updated
         ).as_dict()
 
-        return ha.Event(
-            EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
-            time_fired=event_time_fired,
+        return logbook.LazyEventPartialState.from_event(
+            ha.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": old_state,
+                    "new_state": new_state,
+                },
+                time_fired=event_time_fired,
+            )
         )
 
 
@@ -509,6 +509,42 @@ class TestMQTTCallbacks(unittest.TestCase):
         assert self.calls[0][0].topic == topic
         assert self.calls[0][0].payload == payload
 
+    def test_subscribe_overlapping_wildcards_and_unsubscribe(self):
+        """Test overlapping wildcard subscriptions and removing them."""
+        calls_plus = []
+        calls_hash = []
+        unsub_plus = mqtt.subscribe(
+            self.hass, "test-topic/+/on", lambda msg: calls_plus.append(msg)
+        )
+        mqtt.subscribe(self.hass, "test-topic/#", lambda msg: calls_hash.append(msg))
+
+        fire_mqtt_message(self.hass, "test-topic/bier/on", "test-payload")
+        self.hass.block_till_done()
+        assert len(calls_plus) == 1
+        assert len(calls_hash) == 1
+
+        unsub_plus()
+        fire_mqtt_message(self.hass, "test-topic/bier/on", "test-payload")
+        self.hass.block_till_done()
+        assert len(calls_plus) == 1
+        assert len(calls_hash) == 2
+
+    def test_payload_decoded_once_per_encoding(self):
+        """Test the payload is decoded once for subscriptions sharing encoding."""
+        calls_raw = []
+        mqtt.subscribe(self.hass, "test-topic", self.record_calls)
+        mqtt.subscribe(self.hass, "test-topic/#", self.record_calls)
+        mqtt.subscribe(
+            self.hass, "test-topic", lambda msg: calls_raw.append(msg), encoding=None
+        )
+
+        fire_mqtt_message(self.hass, "test-topic", "test-payload")
+        self.hass.block_till_done()
+
+        assert len(self.calls) == 2
+        assert self.calls[0][0].payload is self.calls[1][0].payload
+        assert calls_raw[0].payload == b"test-payload"
+
     def test_mqtt_failed_connection_results_in_disconnect(self):
         """Test if connection failure leads to disconnect."""
         for result_code in range(1, 6):
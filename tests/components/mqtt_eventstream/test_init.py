@@ -113,6 +113,21 @@ class TestMqttEventStream:
         result["event_data"]["new_state"].pop("context")
         assert result == event
 
+    @patch("homeassistant.components.mqtt.async_publish")
+    def test_event_with_invalid_floats_sends_message(self, mock_pub):
+        """Test events with NaN floats are sent."""
+        assert self.add_eventstream(pub_topic="bar")
+        self.hass.block_till_done()
+
+        mock_pub.reset_mock()
+
+        self.hass.bus.fire("test_event", {"hello": float("NaN")})
+        self.hass.block_till_done()
+
+        assert mock_pub.call_args[0][2] == (
+            '{"event_type": "test_event", "event_data": {"hello": NaN}}'
+        )
+
     @patch("homeassistant.components.mqtt.async_publish")
     def test_time_event_does_not_send_message(self, mock_pub):
         """Test the sending of a new message if time event."""
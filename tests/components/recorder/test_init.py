@@ -1,16 +1,20 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
+import json
+import time
 import unittest
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.exc import OperationalError
 
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import Events, StateAttributes, States
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import MATCH_ALL
-from homeassistant.core import callback
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.core import Event, callback
 from homeassistant.setup import async_setup_component
 
 from .common import wait_recording_done
@@ -188,6 +192,189 @@ def test_saving_state_include_domain_exclude_entity(hass_recorder):
     assert hass.states.get("test.ok").state == "state2"
 
 
+def test_saving_states_in_one_batch(hass_recorder):
+    """Test states written in one batch reference their own events."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(instance, "_write_pending_events_or_rollback"):
+        for idx in range(5):
+            hass.states.set("test.recorder", f"state{idx}")
+        hass.block_till_done()
+        instance.block_till_done()
+        assert len(instance._pending_events) == 5
+
+    inserts = []
+
+    def before_cursor_execute(conn, cursor, statement, params, context, many):
+        """Record the inserts into the events and states tables."""
+        if statement.startswith("INSERT INTO events"):
+            inserts.append(("events", many, len(params) if many else 1))
+        elif statement.startswith("INSERT INTO states"):
+            inserts.append(("states", many, len(params) if many else 1))
+
+    sqlalchemy_event.listen(
+        instance.engine, "before_cursor_execute", before_cursor_execute
+    )
+    wait_recording_done(hass)
+    sqlalchemy_event.remove(
+        instance.engine, "before_cursor_execute", before_cursor_execute
+    )
+    assert instance._pending_events == []
+    assert inserts == [("events", True, 5), ("states", True, 5)]
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.state for db_state in db_states] == [
+            f"state{idx}" for idx in range(5)
+        ]
+        for db_state in db_states:
+            db_event = session.query(Events).get(db_state.event_id)
+            assert db_event.event_type == "state_changed"
+            assert db_state.state in db_event.event_data
+
+
+def test_insert_rows_skips_rows_inserted_meanwhile(hass_recorder):
+    """Test the event ids read back skip rows of other writers."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    wait_recording_done(hass)
+    dbevents = [
+        Events(event_type="test", event_data="{}", context_id=f"context{idx}")
+        for idx in range(3)
+    ]
+    execute = instance.event_session.execute
+
+    def execute_after_other_writer(statement, params):
+        """Insert a row of another writer before the batch."""
+        execute(statement, [{**params[0], "context_id": "other"}])
+        return execute(statement, params)
+
+    with patch.object(
+        instance.event_session, "execute", side_effect=execute_after_other_writer
+    ):
+        instance._insert_rows(dbevents, (Events.event_type, Events.context_id))
+    instance.event_session.commit()
+
+    with session_scope(hass=hass) as session:
+        for dbevent in dbevents:
+            db_event = session.query(Events).get(dbevent.event_id)
+            assert db_event.context_id == dbevent.context_id
+
+
+def test_saving_states_after_operational_error(hass_recorder):
+    """Test states written before a connectivity error are written again."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    flush = instance.event_session.flush
+    failed = []
+
+    def flush_failing_once(*args, **kwargs):
+        """Fail the first flush that happens after a state got written."""
+        if len(failed) == 0 and instance._uncommitted_events:
+            failed.append(True)
+            raise OperationalError("INSERT", {}, None)
+        return flush(*args, **kwargs)
+
+    with patch.object(
+        instance.event_session, "flush", side_effect=flush_failing_once
+    ), patch("homeassistant.components.recorder.time.sleep"):
+        hass.states.set("test.recorder", "state1")
+        hass.block_till_done()
+        instance.block_till_done()
+        hass.states.set("test.recorder", "state2")
+        wait_recording_done(hass)
+
+    assert failed
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.state for db_state in db_states] == ["state1", "state2"]
+        for db_state in db_states:
+            db_event = session.query(Events).get(db_state.event_id)
+            assert db_state.state in db_event.event_data
+
+
+def test_saving_state_shares_attributes(hass_recorder):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder()
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    for idx in range(3):
+        hass.states.set("test.recorder", f"state{idx}", attributes)
+    hass.states.set("test.recorder", "state3", {"test_attr": 6})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert len({db_state.attributes_id for db_state in db_states[:3]}) == 1
+        assert [db_state.to_native().attributes for db_state in db_states] == [
+            attributes,
+            attributes,
+            attributes,
+            {"test_attr": 6},
+        ]
+
+
+def test_attributes_cache_evicts_least_recent(hass_recorder):
+    """Test the attribute ids cache keeps the most recently written sets."""
+    hass = hass_recorder({"attributes_cache_size": 2})
+    instance = hass.data[DATA_INSTANCE]
+
+    for idx in range(3):
+        hass.states.set("test.recorder", "on", {"idx": idx})
+        wait_recording_done(hass)
+    hass.states.set("test.recorder", "on", {"idx": 1})
+    wait_recording_done(hass)
+
+    assert [json.loads(attrs)["idx"] for attrs in instance._attributes_ids] == [2, 1]
+
+    # An evicted set is looked up instead of inserted again
+    with patch.object(
+        instance, "_find_attributes_id", wraps=instance._find_attributes_id
+    ) as find_attributes_id:
+        hass.states.set("test.recorder", "on", {"idx": 0})
+        wait_recording_done(hass)
+    assert find_attributes_id.call_count == 1
+    assert [json.loads(attrs)["idx"] for attrs in instance._attributes_ids] == [1, 0]
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 3
+
+
+def test_new_attributes_inserted_in_one_executemany(hass_recorder):
+    """Test new attribute sets of a batch are inserted together."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    inserts = []
+
+    def before_cursor_execute(conn, cursor, statement, params, context, many):
+        """Record the inserts into the state attributes table."""
+        if statement.startswith("INSERT INTO state_attributes"):
+            inserts.append((many, len(params) if many else 1))
+
+    with patch.object(instance, "_write_pending_events_or_rollback"):
+        for idx in range(3):
+            hass.states.set("test.recorder", "on", {"idx": idx})
+        hass.block_till_done()
+        instance.block_till_done()
+
+    sqlalchemy_event.listen(
+        instance.engine, "before_cursor_execute", before_cursor_execute
+    )
+    wait_recording_done(hass)
+    sqlalchemy_event.remove(
+        instance.engine, "before_cursor_execute", before_cursor_execute
+    )
+    assert inserts == [(True, 3)]
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.to_native().attributes for db_state in db_states] == [
+            {"idx": idx} for idx in range(3)
+        ]
+
+
 def test_recorder_setup_failure():
     """Test some exceptions."""
     hass = get_test_home_assistant()
@@ -204,6 +391,8 @@ def test_recorder_setup_failure():
             uri="sqlite://",
             db_max_retries=10,
             db_retry_wait=3,
+            max_queue_size=0,
+            attributes_cache_size=0,
             include={},
             exclude={},
         )
@@ -213,6 +402,105 @@ def test_recorder_setup_failure():
     hass.stop()
 
 
+def test_recorder_queue_overflow():
+    """Test state changes are coalesced and other events dropped when full."""
+    hass = get_test_home_assistant()
+    rec = Recorder(
+        hass,
+        keep_days=7,
+        purge_interval=2,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=10,
+        db_retry_wait=3,
+        max_queue_size=2,
+        attributes_cache_size=0,
+        include={},
+        exclude={},
+    )
+
+    def state_changed(entity_id, state):
+        return Event(EVENT_STATE_CHANGED, {"entity_id": entity_id, "new_state": state})
+
+    rec.event_listener(Event("test_event"))
+    rec.event_listener(state_changed("test.one", "1"))
+    rec.event_listener(Event("test_event"))
+    rec.event_listener(state_changed("test.one", "2"))
+    rec.event_listener(state_changed("test.two", "1"))
+    rec.event_listener(state_changed("test.one", "3"))
+
+    assert rec.queue.qsize() == 2
+    assert list(rec.coalesced_states) == ["test.one", "test.two"]
+    assert rec.coalesced_states["test.one"].data["new_state"] == "3"
+    assert rec.dropped_events == 2
+
+    rec.queue.get_nowait()
+    rec.queue.get_nowait()
+    rec.event_listener(Event("test_event"))
+
+    assert [rec.queue.get_nowait().data["entity_id"] for _ in range(2)] == [
+        "test.one",
+        "test.two",
+    ]
+    assert rec.coalesced_states == {}
+    assert rec.dropped_events == 3
+
+    hass.stop()
+
+
+def test_recorder_flushes_coalesced_states_on_stop():
+    """Test coalesced state changes are written when stopping."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass, {"max_queue_size": 1})
+    hass.start()
+    wait_recording_done(hass)
+    rec = hass.data[DATA_INSTANCE]
+
+    def blocked_purge(*args):
+        """Keep the recorder busy until the stop put the sentinel in the queue."""
+        for _ in range(500):
+            if None in rec.queue.queue:
+                break
+            time.sleep(0.01)
+        return True
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data",
+        side_effect=blocked_purge,
+    ), patch.object(Recorder, "_close_connection"):
+        rec.do_adhoc_purge()
+        hass.states.set("test.one", "1")
+        hass.states.set("test.one", "2")
+        hass.states.set("test.two", "1")
+        hass.block_till_done()
+        assert list(rec.coalesced_states) == ["test.one", "test.two"]
+
+        hass.stop()
+
+    assert rec.coalesced_states == {}
+    with session_scope(hass=hass) as session:
+        states = [
+            (state.entity_id, state.state)
+            for state in session.query(States).order_by(States.state_id)
+        ]
+    assert states[-2:] == [("test.one", "2"), ("test.two", "1")]
+    rec.engine.dispose()
+
+
+async def test_recorder_info(hass, hass_ws_client):
+    """Test the recorder reports how far it is behind."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 5, "type": "recorder/info"})
+    response = await client.receive_json()
+
+    assert response["success"]
+    assert response["result"]["max_queue_size"] == 30000
+    assert response["result"]["dropped_events"] == 0
+    assert response["result"]["purge_remaining"] == {}
+
+
 async def test_defaults_set(hass):
     """Test the config defaults are set."""
     recorder_config = None
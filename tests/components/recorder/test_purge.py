@@ -6,7 +6,7 @@ from unittest.mock import patch
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import Events, StateAttributes, States
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 
@@ -102,7 +102,8 @@ class TestRecorderPurge(unittest.TestCase):
             assert states.count() == 6
 
             # run purge_old_data()
-            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            while not purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False):
+                pass
 
             # we should only have 2 states left after purging
             assert states.count() == 2
@@ -116,11 +117,76 @@ class TestRecorderPurge(unittest.TestCase):
             assert events.count() == 6
 
             # run purge_old_data()
-            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            while not purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False):
+                pass
 
             # we should only have 2 events left
             assert events.count() == 2
 
+    def test_purge_old_states_in_batches(self):
+        """Test old states are deleted a batch at a time."""
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        with patch(
+            "homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 1
+        ), session_scope(hass=self.hass) as session:
+            states = session.query(States)
+
+            assert not purge_old_data(instance, 4, repack=False)
+            assert states.count() == 5
+            assert instance.purge_remaining == {"states": 3, "events": 0}
+
+            runs = 1
+            while not purge_old_data(instance, 4, repack=False):
+                runs += 1
+
+            assert states.count() == 2
+            assert runs == 4
+            assert instance.purge_remaining == {}
+
+    def test_purge_unused_attributes(self):
+        """Test shared attributes are deleted with the last state using them."""
+        now = datetime.now()
+        eleven_days_ago = now - timedelta(days=11)
+
+        self.hass.block_till_done()
+        self.hass.data[DATA_INSTANCE].block_till_done()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            purged = StateAttributes.from_shared_attrs('{"test_attr": 1}')
+            shared = StateAttributes.from_shared_attrs('{"test_attr": 2}')
+            unrelated = StateAttributes.from_shared_attrs('{"test_attr": 3}')
+            session.add_all([purged, shared, unrelated])
+            session.flush()
+            for timestamp, attributes in (
+                (eleven_days_ago, purged),
+                (eleven_days_ago, shared),
+                (now, shared),
+            ):
+                session.add(
+                    States(
+                        entity_id="test.recorder2",
+                        domain="sensor",
+                        state="on",
+                        attributes_id=attributes.attributes_id,
+                        last_changed=timestamp,
+                        last_updated=timestamp,
+                        created=timestamp,
+                    )
+                )
+
+        with session_scope(hass=self.hass) as session:
+            while not purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False):
+                pass
+
+            assert [
+                row.shared_attrs
+                for row in session.query(StateAttributes).order_by(
+                    StateAttributes.attributes_id
+                )
+            ] == ['{"test_attr": 2}', '{"test_attr": 3}']
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {"keep_days": 4}
@@ -173,7 +239,6 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.services.call("recorder", "purge", service_data=service_data)
                 self.hass.block_till_done()
                 self.hass.data[DATA_INSTANCE].block_till_done()
-                assert (
-                    mock_logger.debug.mock_calls[3][1][0]
-                    == "Vacuuming SQL DB to free space"
+                assert "Vacuuming SQL DB to free space" in (
+                    call[1][0] for call in mock_logger.debug.mock_calls
                 )
@@ -574,3 +574,37 @@ async def test_disarm_action(hass):
     await hass.async_block_till_done()
 
     assert len(service_calls) == 1
+
+
+async def test_track_rendered_entities(hass):
+    """Test the panel follows the entities its template reads."""
+    await setup.async_setup_component(
+        hass,
+        "alarm_control_panel",
+        {
+            "alarm_control_panel": {
+                "platform": "template",
+                "panels": {
+                    "test_template_panel": {
+                        "value_template": "{% set entity = 'alarm_control_panel.test' %}"
+                        "{{ states(entity) }}",
+                    }
+                },
+            }
+        },
+    )
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    hass.states.async_set("alarm_control_panel.test", STATE_ALARM_ARMED_HOME)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("alarm_control_panel.test_template_panel")
+    assert state.state == STATE_ALARM_ARMED_HOME
+
+    hass.states.async_set("alarm_control_panel.test", STATE_ALARM_DISARMED)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("alarm_control_panel.test_template_panel")
+    assert state.state == STATE_ALARM_DISARMED
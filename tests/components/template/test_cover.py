@@ -1011,3 +1011,44 @@ async def test_invalid_device_class(hass, calls):
 
     state = hass.states.get("cover.test_template_cover")
     assert not state
+
+
+async def test_track_rendered_entities(hass, calls):
+    """Test the cover follows the entities its template reads."""
+    with assert_setup_component(1, "cover"):
+        assert await setup.async_setup_component(
+            hass,
+            "cover",
+            {
+                "cover": {
+                    "platform": "template",
+                    "covers": {
+                        "test_template_cover": {
+                            "value_template": "{% set entity = 'cover.test_state' %}"
+                            "{{ states(entity) }}",
+                            "open_cover": {
+                                "service": "cover.open_cover",
+                                "entity_id": "cover.test_state",
+                            },
+                            "close_cover": {
+                                "service": "cover.close_cover",
+                                "entity_id": "cover.test_state",
+                            },
+                        }
+                    },
+                }
+            },
+        )
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    hass.states.async_set("cover.test_state", STATE_OPEN)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("cover.test_template_cover").state == STATE_OPEN
+
+    hass.states.async_set("cover.test_state", STATE_CLOSED)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("cover.test_template_cover").state == STATE_CLOSED
@@ -689,3 +689,38 @@ async def _register_components(hass, speed_list=None):
 
     await hass.async_start()
     await hass.async_block_till_done()
+
+
+async def test_track_rendered_entities(hass, calls):
+    """Test the fan follows the entities its template reads."""
+    with assert_setup_component(1, "fan"):
+        assert await setup.async_setup_component(
+            hass,
+            "fan",
+            {
+                "fan": {
+                    "platform": "template",
+                    "fans": {
+                        "test_fan": {
+                            "value_template": "{% set entity = 'input_boolean.state' %}"
+                            "{{ states(entity) }}",
+                            "turn_on": {"service": "script.fan_on"},
+                            "turn_off": {"service": "script.fan_off"},
+                        }
+                    },
+                }
+            },
+        )
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    hass.states.async_set(_STATE_INPUT_BOOLEAN, STATE_ON)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(_TEST_FAN).state == STATE_ON
+
+    hass.states.async_set(_STATE_INPUT_BOOLEAN, STATE_OFF)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(_TEST_FAN).state == STATE_OFF
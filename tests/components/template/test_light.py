@@ -1025,3 +1025,43 @@ async def test_invalid_availability_template_keeps_component_available(hass, cap
 
     assert hass.states.get("light.test_template_light").state != STATE_UNAVAILABLE
     assert ("UndefinedError: 'x' is undefined") in caplog.text
+
+
+async def test_track_rendered_entities(hass):
+    """Test the light follows the entities its template reads."""
+    await setup.async_setup_component(
+        hass,
+        "light",
+        {
+            "light": {
+                "platform": "template",
+                "lights": {
+                    "test_template_light": {
+                        "value_template": "{% set entity = 'light.test_state' %}"
+                        "{{ states(entity) }}",
+                        "turn_on": {
+                            "service": "light.turn_on",
+                            "entity_id": "light.test_state",
+                        },
+                        "turn_off": {
+                            "service": "light.turn_off",
+                            "entity_id": "light.test_state",
+                        },
+                    }
+                },
+            }
+        },
+    )
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    hass.states.async_set("light.test_state", STATE_ON)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.test_template_light").state == STATE_ON
+
+    hass.states.async_set("light.test_state", STATE_OFF)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.test_template_light").state == STATE_OFF
@@ -534,3 +534,37 @@ async def _register_components(hass):
 
     await hass.async_start()
     await hass.async_block_till_done()
+
+
+async def test_track_rendered_entities(hass, calls):
+    """Test the vacuum follows the entities its template reads."""
+    with assert_setup_component(1, "vacuum"):
+        assert await setup.async_setup_component(
+            hass,
+            "vacuum",
+            {
+                "vacuum": {
+                    "platform": "template",
+                    "vacuums": {
+                        "test_vacuum": {
+                            "value_template": "{% set entity = 'input_select.state' %}"
+                            "{{ states(entity) }}",
+                            "start": {"service": "script.vacuum_start"},
+                        }
+                    },
+                }
+            },
+        )
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    hass.states.async_set(_STATE_INPUT_SELECT, STATE_CLEANING)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(_TEST_VACUUM).state == STATE_CLEANING
+
+    hass.states.async_set(_STATE_INPUT_SELECT, STATE_DOCKED)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(_TEST_VACUUM).state == STATE_DOCKED
@@ -1,4 +1,6 @@
 """Tests for WebSocket API commands."""
+from unittest.mock import ANY
+
 from async_timeout import timeout
 
 from homeassistant.components.websocket_api import const
@@ -185,6 +187,93 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_invalid_floats(hass, websocket_client):
+    """Test events with NaN floats are answered with an error."""
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "test_event"}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.bus.async_fire("test_event", {"hello": float("NaN")})
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
+
+
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe entities sends a snapshot and then batched changes."""
+    hass.states.async_set("light.kitchen", "off", {"color": "red"})
+    hass.states.async_set("light.ignored", "off")
+    hass.states.async_set("light.removed", "on")
+    state = hass.states.get("light.kitchen")
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen", "light.removed", "light.added"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {
+            "light.kitchen": {
+                "s": "off",
+                "a": {"color": "red"},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            },
+            "light.removed": ANY,
+        }
+    }
+
+    hass.states.async_set("light.kitchen", "on", {"color": "red", "effect": "x"})
+    hass.states.async_set("light.kitchen", "on", {"color": "blue"})
+    hass.states.async_set("light.ignored", "on")
+    hass.states.async_set("light.added", "on")
+    hass.states.async_remove("light.removed")
+    state = hass.states.get("light.kitchen")
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+
+    assert msg["event"] == {
+        "a": {"light.added": ANY},
+        "c": {
+            "light.kitchen": {
+                "+": {
+                    "s": "on",
+                    "a": {"color": "blue"},
+                    "c": state.context.id,
+                    "lc": state.last_changed.timestamp(),
+                    "lu": state.last_updated.timestamp(),
+                }
+            }
+        },
+        "r": ["light.removed"],
+    }
+
+    hass.states.async_set("light.kitchen", "on", {})
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+
+    assert msg["event"]["c"]["light.kitchen"]["-"] == {"a": ["color"]}
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
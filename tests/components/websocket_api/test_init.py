@@ -97,3 +97,30 @@ async def test_invalid_vol(hass, websocket_client):
     assert not msg["success"]
     assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
     assert "expected str for dictionary value" in msg["error"]["message"]
+
+
+async def test_coalesce_messages(hass, websocket_client):
+    """Test pending messages are sent in one frame once the client opts in."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    msg = await websocket_client.receive_json()
+    assert [event["event"]["data"]["idx"] for event in msg] == [0, 1, 2]
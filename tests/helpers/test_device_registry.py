@@ -498,3 +498,51 @@ async def test_update_sw_version(registry):
     assert mock_save.call_count == 1
     assert updated_entry != entry
     assert updated_entry.sw_version == sw_version
+
+
+async def test_indexes_follow_updates_and_removals(registry):
+    """Test lookups by identifier, connection, entry and area stay consistent."""
+    entry = registry.async_get_or_create(
+        config_entry_id="1234",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+        identifiers={("hue", "456")},
+    )
+    entry = registry.async_update_device(
+        entry.id, area_id="kitchen", new_identifiers={("hue", "654")}
+    )
+
+    assert registry.async_get_device({("hue", "456")}, set()) is None
+    assert registry.async_get_device({("hue", "654")}, set()) == entry
+    assert (
+        registry.async_get_device(
+            set(), {(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:ab:cd:ef")}
+        )
+        == entry
+    )
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [entry]
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == [entry]
+
+    registry.async_clear_area_id("kitchen")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+
+    registry.async_remove_device(entry.id)
+
+    assert registry.async_get_device({("hue", "654")}, set()) is None
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == []
+
+
+async def test_indexes_keep_registry_order(registry):
+    """Test updated devices keep their position in lookups by config entry."""
+    first = registry.async_get_or_create(
+        config_entry_id="1234", identifiers={("hue", "456")}
+    )
+    second = registry.async_get_or_create(
+        config_entry_id="1234", identifiers={("hue", "654")}
+    )
+
+    first = registry.async_update_device(first.id, name_by_user="First")
+
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == [
+        first,
+        second,
+    ]
@@ -1,9 +1,10 @@
 """The tests for the Entity component helper."""
 # pylint: disable=protected-access
 from collections import OrderedDict
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 from unittest.mock import Mock, patch
+import zlib
 
 import asynctest
 import pytest
@@ -105,25 +106,33 @@ async def test_setup_does_discovery(mock_setup_component, mock_setup, hass):
     assert ("platform_test", {}, {"msg": "discovery_info"}) == mock_setup.call_args[0]
 
 
-@asynctest.patch("homeassistant.helpers.entity_platform.async_track_time_interval")
+@asynctest.patch("homeassistant.helpers.entity_platform.async_track_point_in_utc_time")
 async def test_set_scan_interval_via_config(mock_track, hass):
     """Test the setting of the scan interval via configuration."""
 
     def platform_setup(hass, config, add_entities, discovery_info=None):
         """Test the platform setup."""
-        add_entities([MockEntity(should_poll=True)])
+        add_entities([entity])
 
+    entity = MockEntity(should_poll=True)
     mock_entity_platform(hass, "test_domain.platform", MockPlatform(platform_setup))
 
     component = EntityComponent(_LOGGER, DOMAIN, hass)
+    now = datetime(2020, 1, 1, tzinfo=dt_util.UTC)
 
-    component.setup(
-        {DOMAIN: {"platform": "platform", "scan_interval": timedelta(seconds=30)}}
-    )
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        component.setup(
+            {DOMAIN: {"platform": "platform", "scan_interval": timedelta(seconds=30)}}
+        )
+        await hass.async_block_till_done()
 
-    await hass.async_block_till_done()
+    # The first entity is polled at the jitter of the platform
+    phase = zlib.crc32(b"test_domain.platform") / 2 ** 32 * 30
+    assert timedelta(seconds=30) == entity.platform.scan_interval
     assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    assert mock_track.call_args[0][2] == dt_util.utc_from_timestamp(
+        now.timestamp() + phase
+    )
 
 
 async def test_set_entity_namespace_via_config(hass):
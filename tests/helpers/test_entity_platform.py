@@ -90,6 +90,98 @@ async def test_polling_updates_entities_with_exception(hass):
     assert len(update_err) == 1
 
 
+async def test_polling_spreads_entities_over_scan_interval(hass):
+    """Test polls of entities are spread over the scan interval."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=30))
+    updates = []
+    entities = []
+    for idx in range(10):
+        entity = MockEntity(should_poll=True, name=f"poll {idx}")
+        entity.update = lambda idx=idx: updates.append(idx)
+        entities.append(entity)
+
+    now = dt_util.utcnow()
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        await component.async_add_entities(entities)
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=now + timedelta(seconds=15)
+    ):
+        async_fire_time_changed(hass, now + timedelta(seconds=15))
+        await hass.async_block_till_done()
+
+    assert 4 <= len(updates) <= 6
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=now + timedelta(seconds=30)
+    ):
+        async_fire_time_changed(hass, now + timedelta(seconds=30))
+        await hass.async_block_till_done()
+
+    assert sorted(updates) == list(range(10))
+    statistics = entities[0].platform.poll_statistics.as_dict()
+    assert statistics["polls"] == 10
+    assert statistics["skipped"] == 0
+
+
+async def test_polling_readded_entity_polled_once(hass):
+    """Test an entity that is removed and added again is polled once."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=30))
+    updates = []
+    entity = MockEntity(should_poll=True, entity_id="test_domain.poll")
+    entity.update = lambda: updates.append(None)
+
+    await component.async_add_entities([entity])
+    await entity.async_remove()
+    entity = MockEntity(should_poll=True, entity_id="test_domain.poll")
+    entity.update = lambda: updates.append(None)
+    await component.async_add_entities([entity])
+
+    for seconds in (30, 60):
+        now = dt_util.utcnow() + timedelta(seconds=seconds)
+        with patch("homeassistant.util.dt.utcnow", return_value=now):
+            async_fire_time_changed(hass, now)
+            await hass.async_block_till_done()
+
+    assert len(updates) == 2
+
+
+async def test_polling_skips_entities_still_updating(hass):
+    """Test an entity is not polled again while its update is running."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    release = asyncio.Event()
+    updated = asyncio.Event()
+    slow_updates = []
+    updates = []
+
+    async def slow_update():
+        slow_updates.append(None)
+        await release.wait()
+
+    async def update():
+        updates.append(None)
+        updated.set()
+
+    slow_ent = MockEntity(should_poll=True)
+    slow_ent.async_update = slow_update
+    ent = MockEntity(should_poll=True)
+    ent.async_update = update
+
+    await component.async_add_entities([slow_ent, ent])
+
+    for _ in range(2):
+        updated.clear()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+        await updated.wait()
+
+    release.set()
+    await hass.async_block_till_done()
+
+    assert len(slow_updates) == 1
+    assert len(updates) == 2
+    assert slow_ent.platform.poll_statistics.skipped == 1
+
+
 async def test_update_state_adds_entities(hass):
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
@@ -135,14 +227,15 @@ async def test_update_state_adds_entities_with_update_before_add_false(hass):
     assert not ent.update.called
 
 
-@asynctest.patch("homeassistant.helpers.entity_platform.async_track_time_interval")
+@asynctest.patch("homeassistant.helpers.entity_platform.async_track_point_in_utc_time")
 async def test_set_scan_interval_via_platform(mock_track, hass):
     """Test the setting of the scan interval via platform."""
 
     def platform_setup(hass, config, add_entities, discovery_info=None):
         """Test the platform setup."""
-        add_entities([MockEntity(should_poll=True)])
+        add_entities([entity])
 
+    entity = MockEntity(should_poll=True)
     platform = MockPlatform(platform_setup)
     platform.SCAN_INTERVAL = timedelta(seconds=30)
 
@@ -153,8 +246,9 @@ async def test_set_scan_interval_via_platform(mock_track, hass):
     component.setup({DOMAIN: {"platform": "platform"}})
 
     await hass.async_block_till_done()
+    assert timedelta(seconds=30) == entity.platform.scan_interval
     assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    assert mock_track.call_args[0][2] <= dt_util.utcnow() + timedelta(seconds=30)
 
 
 async def test_adding_entities_with_generator_and_thread_callback(hass):
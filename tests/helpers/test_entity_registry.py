@@ -561,3 +561,50 @@ async def test_restore_states(hass):
     assert hass.states.get("light.simple") is None
     assert hass.states.get("light.disabled") is None
     assert hass.states.get("light.all_info_set") is None
+
+
+async def test_indexes_follow_updates_and_removals(registry):
+    """Test lookups by unique id, device and config entry stay consistent."""
+    config_entry = MockConfigEntry(domain="light")
+    entry = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=config_entry, device_id="mock-dev-id"
+    )
+
+    updated = registry.async_update_entity(
+        entry.entity_id, new_entity_id="light.renamed", new_unique_id="5678"
+    )
+
+    assert registry.async_get_entity_id("light", "hue", "1234") is None
+    assert registry.async_get_entity_id("light", "hue", "5678") == "light.renamed"
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == [
+        updated
+    ]
+    assert entity_registry.async_entries_for_config_entry(
+        registry, config_entry.entry_id
+    ) == [updated]
+
+    registry.async_remove("light.renamed")
+
+    assert registry.async_get_entity_id("light", "hue", "5678") is None
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == []
+    assert (
+        entity_registry.async_entries_for_config_entry(registry, config_entry.entry_id)
+        == []
+    )
+
+
+async def test_indexes_keep_registry_order(registry):
+    """Test updated entries keep their position in lookups by device."""
+    first = registry.async_get_or_create(
+        "light", "hue", "1234", device_id="mock-dev-id"
+    )
+    second = registry.async_get_or_create(
+        "light", "hue", "5678", device_id="mock-dev-id"
+    )
+
+    first = registry.async_update_entity(first.entity_id, name="First")
+
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == [
+        first,
+        second,
+    ]
@@ -8,10 +8,11 @@ from astral import Astral
 import pytest
 
 from homeassistant.components import sun
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.helpers.event import (
+    DATA_POINT_IN_TIME_SCHEDULER,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -20,6 +21,7 @@ from homeassistant.helpers.event import (
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
+    async_track_template_renders,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
@@ -86,6 +88,80 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_order_and_listener(hass):
+    """Test point in time listeners share one time listener and fire in order."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    listeners_before = hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0)
+
+    for offset in (3, 1, 2):
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda x, offset=offset: runs.append(offset)),
+            birthday_paulus + timedelta(seconds=offset),
+        )
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(0)), birthday_paulus
+    )
+
+    assert hass.bus.async_listeners()[EVENT_TIME_CHANGED] == listeners_before + 1
+
+    unsub()
+    _send_time_changed(hass, birthday_paulus + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert runs == [1, 2]
+
+    _send_time_changed(hass, birthday_paulus + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert runs == [1, 2, 3]
+
+    # Listener is removed once nothing is pending
+    assert hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0) == listeners_before
+
+
+async def test_track_point_in_time_cancel_during_tick(hass):
+    """Test cancelling a listener from a listener due in the same tick."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    @callback
+    def cancel_other(now):
+        runs.append("first")
+        unsub_second()
+
+    async_track_point_in_utc_time(hass, cancel_other, birthday_paulus)
+    unsub_second = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("second")), birthday_paulus
+    )
+
+    _send_time_changed(hass, birthday_paulus)
+    await hass.async_block_till_done()
+    assert runs == ["first"]
+    assert len(hass.data[DATA_POINT_IN_TIME_SCHEDULER]) == 0
+
+
+async def test_track_point_in_time_reschedule_waits_for_next_tick(hass):
+    """Test a listener scheduled by a due listener does not run in same tick."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    @callback
+    def reschedule(now):
+        runs.append(now)
+        async_track_point_in_utc_time(hass, reschedule, birthday_paulus)
+
+    async_track_point_in_utc_time(hass, reschedule, birthday_paulus)
+
+    _send_time_changed(hass, birthday_paulus)
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+
+    _send_time_changed(hass, birthday_paulus)
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+
 async def test_track_state_change(hass):
     """Test track_state_change."""
     # 2 lists to track how often our callbacks get called
@@ -165,6 +241,67 @@ async def test_track_state_change(hass):
     assert len(wildercard_runs) == 6
 
 
+async def test_track_state_change_only_runs_interested_listeners(hass):
+    """Test state change listeners are dispatched by entity id."""
+    light_runs = []
+    switch_runs = []
+
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    unsub_light = async_track_state_change(
+        hass,
+        ["light.Bowl", "light.bowl"],
+        callback(lambda *args: light_runs.append(args)),
+    )
+    unsub_switch = async_track_state_change(
+        hass, "switch.kitchen", callback(lambda *args: switch_runs.append(args))
+    )
+
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 1
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(light_runs) == 1
+    assert len(switch_runs) == 0
+
+    hass.states.async_set("switch.kitchen", "on")
+    await hass.async_block_till_done()
+    assert len(light_runs) == 1
+    assert len(switch_runs) == 1
+
+    unsub_light()
+    unsub_light()
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+    assert len(light_runs) == 1
+
+    unsub_switch()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
+
+
+async def test_track_state_change_listener_removed_during_dispatch(hass):
+    """Test removing a listener of the same entity while dispatching."""
+    runs = []
+
+    @callback
+    def remove_other(entity_id, old_state, new_state):
+        runs.append("first")
+        unsub_second()
+
+    async_track_state_change(hass, "light.bowl", remove_other)
+    unsub_second = async_track_state_change(
+        hass, "light.bowl", callback(lambda *args: runs.append("second"))
+    )
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert runs == ["first", "second"]
+
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+    assert runs == ["first", "second", "first"]
+
+
 async def test_track_template(hass):
     """Test tracking template."""
     specific_runs = []
@@ -233,6 +370,48 @@ async def test_track_template(hass):
     assert len(wildercard_runs) == 2
 
 
+async def test_track_template_renders(hass):
+    """Test tracking follows the entities and domains read while rendering."""
+    runs = []
+    template = Template(
+        "{% if is_state('input_boolean.use_lights', 'on') %}"
+        "{{ states.light | selectattr('state', 'eq', 'on') | list | count }}"
+        "{% else %}{{ states('sensor.test') }}{% endif %}",
+        hass,
+    )
+
+    @ha.callback
+    def run_callback(entity_id, old_state, new_state, render_infos):
+        runs.append((entity_id, render_infos[0].result))
+
+    hass.states.async_set("input_boolean.use_lights", "off")
+    unsub = async_track_template_renders(hass, [template], run_callback)
+    assert template.cache_misses == 1
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("sensor.test", "1")
+    await hass.async_block_till_done()
+    assert runs == [("sensor.test", "1")]
+
+    hass.states.async_set("input_boolean.use_lights", "on")
+    hass.states.async_set("sensor.test", "2")
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_set("switch.other", "on")
+    await hass.async_block_till_done()
+    assert runs == [
+        ("sensor.test", "1"),
+        ("input_boolean.use_lights", "0"),
+        ("light.bowl", "0"),
+    ]
+    # Rendered once for each change that was tracked
+    assert template.cache_misses == 4
+
+    unsub()
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(runs) == 3
+
+
 async def test_track_same_state_simple_trigger(hass):
     """Test track_same_change with trigger simple."""
     thread_runs = []
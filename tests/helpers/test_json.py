@@ -1,8 +1,10 @@
 """Test Home Assistant remote methods and classes."""
+import json
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_dumps
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +21,19 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_dumps(hass):
+    """Test dumping Home Assistant objects matches the JSON Encoder."""
+    data = {
+        "state": core.State("test.test", "hello", {"list": {1, 2}}),
+        "time": dt_util.utcnow(),
+    }
+
+    assert json_dumps(data) == json.dumps(data, cls=JSONEncoder)
+    assert json_dumps(data, compact=True) == json.dumps(
+        data, cls=JSONEncoder, separators=(",", ":"), ensure_ascii=False
+    )
+
+    with pytest.raises(TypeError):
+        json_dumps(object())
@@ -491,6 +491,30 @@ async def test_call_no_context_target_specific(
     assert mock_handle_entity_call.mock_calls[0][1][1].entity_id == "light.kitchen"
 
 
+async def test_call_targets_entities_across_platforms(
+    hass, mock_handle_entity_call, mock_entities
+):
+    """Check targeted entities are looked up in every platform."""
+    platforms = [
+        Mock(entities={entity_id: entity})
+        for entity_id, entity in mock_entities.items()
+    ]
+    await service.entity_service_call(
+        hass,
+        platforms,
+        Mock(),
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.living_room", "light.kitchen"]},
+        ),
+    )
+
+    assert sorted(
+        call[1][1].entity_id for call in mock_handle_entity_call.mock_calls
+    ) == ["light.kitchen", "light.living_room"]
+
+
 async def test_call_with_match_all(
     hass, mock_handle_entity_call, mock_entities, caplog
 ):
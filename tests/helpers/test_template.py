@@ -1803,3 +1803,40 @@ def test_render_complex_handling_non_template_values(hass):
     assert template.render_complex(
         {True: 1, False: template.Template("{{ hello }}", hass)}, {"hello": 2}
     ) == {True: 1, False: "2"}
+
+
+def test_render_cache(hass):
+    """Test renders are reused until a state they read changes."""
+    hass.states.async_set("sensor.test", "23")
+    hass.states.async_set("sensor.other", "1")
+    tpl = template.Template("{{ states('sensor.test') }} {{ value }}", hass)
+
+    assert tpl.async_render(value=1) == "23 1"
+    assert tpl.async_render(value=1) == "23 1"
+    assert (tpl.cache_hits, tpl.cache_misses) == (1, 1)
+
+    hass.states.async_set("sensor.other", "2")
+    assert tpl.async_render(value=1) == "23 1"
+    assert (tpl.cache_hits, tpl.cache_misses) == (2, 1)
+
+    hass.states.async_set("sensor.test", "24")
+    assert tpl.async_render(value=1) == "24 1"
+    assert tpl.async_render(value=2) == "24 2"
+    assert (tpl.cache_hits, tpl.cache_misses) == (2, 3)
+
+
+def test_render_cache_skips_volatile_templates(hass):
+    """Test renders depending on time or all states are not reused."""
+    hass.states.async_set("sensor.test", "23")
+
+    for tmpl_str in (
+        "{{ utcnow() }}",
+        "{{ [1, 2] | random }}",
+        "{{ states | count }}",
+        "{{ states.sensor | count }}",
+    ):
+        tpl = template.Template(tmpl_str, hass)
+        tpl.async_render()
+        tpl.async_render()
+        assert tpl.cache_hits == 0
+        assert tpl.cache_misses == 2
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -31,6 +32,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -510,6 +512,42 @@ def test_state_dict_conversion():
     assert state == ha.State.from_dict(state.as_dict())
 
 
+def test_state_and_event_as_json():
+    """Test the cached JSON of states and events."""
+    old_state = ha.State("light.kitchen", "off")
+    new_state = ha.State("light.kitchen", "on", {"brightness": 100})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.kitchen", "old_state": old_state, "new_state": new_state},
+    )
+
+    def roundtrip(obj):
+        return json.loads(json.dumps(obj, cls=JSONEncoder))
+
+    assert json.loads(new_state.as_json()) == roundtrip(new_state)
+    assert new_state.as_json() is new_state.as_json()
+    assert json.loads(event.data_as_json()) == roundtrip(event.data)
+    assert json.loads(event.as_json()) == roundtrip(event)
+    assert new_state.as_json() in event.as_json()
+    assert event.as_json() is event.as_json()
+
+    other_event = ha.Event("some_type", {"some": "attr", 1: [1.5]})
+    assert json.loads(other_event.as_json()) == roundtrip(other_event)
+
+
+def test_state_and_event_as_json_invalid_floats():
+    """Test invalid floats raise ValueError instead of being cached."""
+    state = ha.State("sensor.temperature", "unknown", {"value": float("nan")})
+    event = ha.Event(
+        EVENT_STATE_CHANGED, {"entity_id": "sensor.temperature", "new_state": state},
+    )
+    other_event = ha.Event("some_type", {"value": float("inf")})
+
+    for obj in (state, event, other_event):
+        with pytest.raises(ValueError):
+            obj.as_json()
+
+
 def test_state_dict_conversion_with_wrong_data():
     """Test conversion with wrong data."""
     assert ha.State.from_dict(None) is None
@@ -1237,3 +1275,35 @@ def test_valid_entity_id():
         "light.something_yoo",
     ]:
         assert ha.valid_entity_id(valid), valid
+
+
+async def test_state_machine_domain_index(hass):
+    """Test states per domain follow adds, updates and removals."""
+    hass.states.async_set("light.Bowl", "on")
+    hass.states.async_set("switch.AC", "off")
+    hass.states.async_set("light.Kitchen", "off")
+    hass.states.async_set("light.Bowl", "off")
+
+    assert hass.states.async_entity_ids("Light") == ["light.bowl", "light.kitchen"]
+    assert [state.state for state in hass.states.async_all("light")] == ["off", "off"]
+    assert hass.states.async_entity_ids_count("light") == 2
+    assert [state.entity_id for state in hass.states.async_sorted_states()] == [
+        "light.bowl",
+        "light.kitchen",
+        "switch.ac",
+    ]
+
+    hass.states.async_set("light.Aisle", "on")
+    hass.states.async_remove("light.kitchen")
+
+    assert hass.states.async_entity_ids("light") == ["light.bowl", "light.aisle"]
+    assert [state.entity_id for state in hass.states.async_sorted_states("light")] == [
+        "light.aisle",
+        "light.bowl",
+    ]
+    assert hass.states.async_sorted_states("light")[1].state == "off"
+
+    hass.states.async_remove("switch.ac")
+    assert hass.states.async_entity_ids("switch") == []
+    assert hass.states.async_entity_ids_count("switch") == 0
+    assert hass.states.async_entity_ids_count() == 2
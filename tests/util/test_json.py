@@ -1,17 +1,25 @@
 """Test Home Assistant json utility functions."""
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from enum import Enum, IntEnum
+import json
 from json import JSONEncoder
 import os
 import sys
 from tempfile import mkdtemp
 import unittest
 from unittest.mock import Mock
+from uuid import UUID
 
 import pytest
 
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import json as json_util
 from homeassistant.util.json import (
     SerializationError,
     find_paths_unserializable_data,
+    json_dumps,
+    json_loads,
     load_json,
     save_json,
 )
@@ -21,6 +29,41 @@ TEST_JSON_A = {"a": 1, "B": "two"}
 TEST_JSON_B = {"a": "one", "B": 2}
 # Test data that can not be loaded as JSON
 TEST_BAD_SERIALIED = "THIS IS NOT JSON\n"
+
+
+class ExampleEnum(Enum):
+    """Enum without a JSON type."""
+
+    VALUE = "value"
+
+
+class ExampleIntEnum(IntEnum):
+    """Enum that is an int."""
+
+    VALUE = 2
+
+
+@dataclass
+class ExampleDataclass:
+    """Dataclass."""
+
+    value: int
+
+
+# Data both JSON backends have to write byte for byte the same
+TEST_JSON_COMPATIBILITY = [
+    {"a": 1, "B": [1, 2.5, -0.0, None, True, False], "c": {}, "d": []},
+    {"z": {"y": [{"x": ()}], "b": 0.1}, "é": 'ü\n\t"\\/ \x01\x7f'},
+    {"time": datetime(2020, 1, 2, 3, 4, 5, 123456), "set": {1}, 1: 2},
+    [2 ** 70, "string", 3.14159],
+    {"nan": float("nan"), "inf": [float("inf"), float("-inf")]},
+    [1e-07, 1e16, -2.5e-10, 1.5e300, {"e": 1e100}],
+    {"date": date(2020, 1, 2), "time": time(3, 4, 5)},
+    {"uuid": UUID("12345678-1234-5678-1234-567812345678")},
+    {"enum": [ExampleEnum.VALUE, ExampleIntEnum.VALUE]},
+    {"dataclass": ExampleDataclass(1)},
+    "",
+]
 TMP_DIR = None
 
 
@@ -122,3 +165,93 @@ def test_find_unserializable_data():
         "$[1].blub",
     ]
     assert find_paths_unserializable_data({("A",): 1}) == ["$<key: ('A',)>"]
+
+
+def _default(obj):
+    """Encode datetimes and sets."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError
+
+
+def _dumps_or_error(dumps, *args):
+    """Return the JSON written by dumps or the type of error it raised."""
+    try:
+        return dumps(*args)
+    except (TypeError, ValueError) as err:
+        return type(err)
+
+
+@pytest.mark.parametrize("data", TEST_JSON_COMPATIBILITY)
+@pytest.mark.parametrize("default", [None, _default])
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("pretty", [False, True])
+@pytest.mark.parametrize("allow_nan", [False, True])
+def test_json_backends_compatible(data, default, sort_keys, pretty, allow_nan):
+    """Test the JSON backends write the same JSON or raise the same error."""
+    pytest.importorskip("orjson")
+    if sort_keys and isinstance(data, dict) and 1 in data:
+        # Neither backend can sort mixed keys
+        return
+
+    args = (data, default, sort_keys, pretty, allow_nan)
+    # pylint: disable=protected-access
+    dumped = _dumps_or_error(json_util._json_dumps_json, *args)
+    assert _dumps_or_error(json_util._json_dumps_orjson, *args) == dumped
+
+
+def test_json_dumps_format():
+    """Test the JSON matches the stdlib format unless compact is asked for."""
+    data = {"b": [1, {"é": None}], "a": {}}
+
+    assert json_dumps(data) == json.dumps(data)
+    assert json_dumps(data, sort_keys=True, pretty=True) == json.dumps(
+        data, sort_keys=True, indent=4
+    )
+    assert json_dumps([float("nan"), 1.5]) == "[NaN, 1.5]"
+
+    with pytest.raises(ValueError):
+        json_dumps([None, float("nan")], allow_nan=False)
+
+    with pytest.raises(TypeError):
+        json_dumps({"hello": set()})
+
+
+def test_json_dumps_compact_format():
+    """Test the compact JSON format."""
+    data = {"b": [1, {"é": None}], "a": {}}
+
+    assert json_dumps(data, compact=True) == '{"b":[1,{"é":null}],"a":{}}'
+    assert json_dumps(data, sort_keys=True, pretty=True, compact=True) == json.dumps(
+        data, sort_keys=True, indent=4, ensure_ascii=False
+    )
+    assert json_dumps([float("nan"), 1.5], compact=True) == "[null,1.5]"
+    assert json_dumps([1e-07, 1e16], compact=True) == "[1e-07,1e+16]"
+
+    with pytest.raises(ValueError):
+        json_dumps([None, float("nan")], allow_nan=False, compact=True)
+
+    with pytest.raises(TypeError):
+        json_dumps({"hello": set()}, compact=True)
+
+
+@pytest.mark.parametrize(
+    "backend", [json_util.JSON_BACKEND_JSON, json_util.JSON_BACKEND_ORJSON]
+)
+def test_json_loads(backend):
+    """Test JSON the orjson backend rejects is parsed by the stdlib."""
+    if backend == json_util.JSON_BACKEND_ORJSON:
+        pytest.importorskip("orjson")
+    json_util.set_json_backend(backend)
+    try:
+        assert json_loads('{"a": [1, 2.5]}') == {"a": [1, 2.5]}
+        assert json_loads("[%d]" % 2 ** 70) == [2 ** 70]
+        assert json_loads("[NaN]")[0] != json_loads("[NaN]")[0]
+    finally:
+        json_util.set_json_backend(
+            json_util.JSON_BACKEND_JSON
+            if json_util.orjson is None
+            else json_util.JSON_BACKEND_ORJSON
+        )